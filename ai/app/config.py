@@ -1,62 +1,155 @@
-from pydantic import BaseModel, Field, create_model
-from typing import Optional, List, Dict, Any, Type, Union
-from enum import Enum
+"""
+AI service configuration.
 
-from typing import Any, Optional
+Values are read from the environment (or the ``.env`` file next to ``main.py``)
+so they can be tuned per container without code changes.
+"""
 
-from pydantic import BaseModel, Field, create_model
-from utils import create_model_from_schema
+import json
+import os
 
+import dotenv
 
-class ModelType(str, Enum):
-    LLM = "llm"
-    LLM_CHAT = "llm_chat"
-    LLM_CHAT_STREAM = "llm_chat_stream"
-    LLM_CHAT_STREAM_WITH_HISTORY = "llm_chat_stream_with_history"
-    LLM_CHAT_STREAM_WITH_HISTORY_AND_CONTEXT = (
-        "llm_chat_stream_with_history_and_context"
-    )
+dotenv.load_dotenv()
 
+# --- Models ---
+# Models loaded and warmed at startup (comma-separated: spacy, normalizer, gliner,
+# embedding, ...; "all" or "none"). Others load lazily on first use, so e.g. a
+# parser-only worker started with AI_PRELOAD_MODELS=none never loads GLiNER.
+# /health/ready waits for these; an unknown name stops the service at startup.
+AI_PRELOAD_MODELS = [
+    m.strip()
+    for m in os.getenv("AI_PRELOAD_MODELS", "all").split(",")
+    if m.strip() and m.strip() != "none"
+]
+GLINER_MODEL_NAME = os.getenv("GLINER_MODEL_NAME", "knowledgator/gliner-x-large")
 
-# Example usage
-class Model(BaseModel):
-    model_name: str
-    model_version: str
-    model_provider: str
-    model_type: ModelType
+# --- Skill NER chunking ---
+# GLiNER truncates inputs past its max length, so long texts are split into
+# overlapping windows of at most this many words/punctuation tokens.
+GLINER_CHUNK_MAX_TOKENS = int(os.getenv("GLINER_CHUNK_MAX_TOKENS", "300"))
+GLINER_CHUNK_OVERLAP_TOKENS = int(os.getenv("GLINER_CHUNK_OVERLAP_TOKENS", "32"))
 
+# Extracted skill lists remembered per text (keyed by a hash of the text).
+SKILL_EXTRACTION_CACHE_SIZE = int(os.getenv("SKILL_EXTRACTION_CACHE_SIZE", "20000"))
 
-class Config(BaseModel):
-    api_key: str
-    model: Model
-    system_prompt: str
+# --- Skill dictionary tier ---
+# gliner: every window goes through GLiNER; dictionary: trie matcher only;
+# hybrid: GLiNER only runs on windows where the dictionary finds too few skills.
+# Defaults to gliner until a curated dictionary ships.
+SKILL_EXTRACTION_POLICY = os.getenv("SKILL_EXTRACTION_POLICY", "gliner").lower()
+# JSON list of skill names or skillNer-style DB, written at image build time by
+# scripts/build_skill_dictionary.py. Kept out of static/, which deployments mount
+# a volume over; when missing, extraction falls back to GLiNER.
+SKILL_DICTIONARY_PATH = os.getenv("SKILL_DICTIONARY_PATH", "data/skill_dictionary.json")
+# Dictionary skills per 100 tokens at which a window is considered covered (hybrid).
+SKILL_DICTIONARY_MIN_DENSITY = float(os.getenv("SKILL_DICTIONARY_MIN_DENSITY", "2.0"))
 
+# --- Skill matching ---
+# Normalized skill phrases remembered before the least recently used is dropped.
+SKILL_NORMALIZE_MEMO_SIZE = int(os.getenv("SKILL_NORMALIZE_MEMO_SIZE", "50000"))
+# Token-sort string similarity (0-1) at which two skills match without comparing vectors.
+SKILL_LEXICAL_THRESHOLD = float(os.getenv("SKILL_LEXICAL_THRESHOLD", "0.9"))
+# Skill-phrase vectors kept in memory (300 float32 each, ~1.2KB) before LRU eviction.
+SKILL_VECTOR_CACHE_SIZE = int(os.getenv("SKILL_VECTOR_CACHE_SIZE", "100000"))
+# Optional .npz written on shutdown and loaded on start so a restarted worker is warm.
+SKILL_VECTOR_SNAPSHOT_PATH = os.getenv("SKILL_VECTOR_SNAPSHOT_PATH", "")
+# Precomputed skill vectors built by scripts.build_skill_table; used when present.
+SKILL_TABLE_DIR = os.getenv("SKILL_TABLE_DIR", "static/skill_table")
 
-import json
+# --- Inference backends ---
+# torch (fp32 eager), torch_int8 (dynamic int8 quantization at load), onnx or
+# onnx_int8 (ONNX Runtime; run `python -m scripts.convert_models` once first).
+INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "torch")
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", INFERENCE_BACKEND)
+GLINER_BACKEND = os.getenv("GLINER_BACKEND", INFERENCE_BACKEND)
+# Output of scripts.convert_models; under static/ so it survives container rebuilds.
+CONVERTED_MODELS_DIR = os.getenv("CONVERTED_MODELS_DIR", "static/converted_models")
+# Target instruction set for int8 ONNX quantization of the embedding model:
+# arm64, avx2, avx512 or avx512_vnni.
+ONNX_QUANTIZATION_CONFIG = os.getenv("ONNX_QUANTIZATION_CONFIG", "avx2")
+
+# --- Micro-batching ---
+# Concurrent single-text calls are grouped into one forward pass; a request waits at
+# most *_MAX_WAIT_MS for others to join its batch.
+GLINER_MAX_BATCH_SIZE = int(os.getenv("GLINER_MAX_BATCH_SIZE", "8"))
+GLINER_MAX_WAIT_MS = float(os.getenv("GLINER_MAX_WAIT_MS", "10"))
+EMBEDDING_MAX_WAIT_MS = float(os.getenv("EMBEDDING_MAX_WAIT_MS", "5"))
+
+# --- Matcher ---
+EMBEDDING_MODEL_NAME = os.getenv("EMBEDDING_MODEL_NAME", "TechWolf/JobBERT-v2")
+# Number of texts sent to SentenceTransformer.encode per forward pass (also the
+# embedding micro-batch size).
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
 
-instance = Config(
-    api_key="123",
-    model=Model(
-        model_name="test",
-        model_version="1.0",
-        model_provider="test",
-        model_type=ModelType.LLM,
-    ),
-    system_prompt="test",
+# --- Matcher worker pool ---
+# Threads running the CPU-bound matching stages off the event loop.
+MATCHER_WORKERS = int(os.getenv("MATCHER_WORKERS", "2"))
+# Torch intra-op threads (process-wide); 0 keeps torch's default.
+MATCHER_TORCH_THREADS = int(os.getenv("MATCHER_TORCH_THREADS", "0"))
+
+# --- Embedding cache ---
+# Persisted under static/, which docker-compose mounts as a volume.
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR", "static/embedding_cache")
+EMBEDDING_CACHE_MAX_BYTES = int(
+    os.getenv("EMBEDDING_CACHE_MAX_BYTES", str(256 * 1024 * 1024))
 )
-schema = instance.model_json_schema()
-print(f"schema:\n\n{json.dumps(schema, indent=2)}")
-DynamicModel = create_model_from_schema(schema, globals_dict=globals())
-print(f"DynamicModel:\n\n{json.dumps(DynamicModel.model_json_schema(), indent=2)}")
-
-# Force enums to their values (strings) when dumping for DynamicModel instantiation
-dumped_json_str = (
-    instance.model_dump_json()
-)  # instance.model_dump(mode='json') returns a string
-instance2 = DynamicModel(**json.loads(dumped_json_str))
-print(instance2.model_dump())
-# Verify equivalence
-import json
+# Dirty cache pages are written to disk at most this often (and at shutdown).
+EMBEDDING_CACHE_FLUSH_SECONDS = float(os.getenv("EMBEDDING_CACHE_FLUSH_SECONDS", "30"))
+
+# --- Job preprocessing cache ---
+JOB_CACHE_ENABLED = os.getenv("JOB_CACHE_ENABLED", "true").lower() == "true"
+JOB_CACHE_DIR = os.getenv("JOB_CACHE_DIR", "static/job_cache")
+# Prepared jobs kept in memory / on disk before the least recently used is dropped.
+JOB_CACHE_MAX_ITEMS = int(os.getenv("JOB_CACHE_MAX_ITEMS", "256"))
+JOB_CACHE_MAX_FILES = int(os.getenv("JOB_CACHE_MAX_FILES", "5000"))
 
-assert DynamicModel.model_json_schema() == schema
-# print(f"instance2:\n\n{json.dumps(instance2.model_dump_json(), indent=2)}\n\ninstance:\n\n{json.dumps(instance.model_dump_json(), indent=2)}")
+# --- Match analysis (LLM) ---
+# Maximum number of concurrent analyze_match calls per matcher process.
+MATCH_ANALYSIS_CONCURRENCY = int(os.getenv("MATCH_ANALYSIS_CONCURRENCY", "8"))
+MATCH_ANALYSIS_TIMEOUT_SECONDS = float(os.getenv("MATCH_ANALYSIS_TIMEOUT_SECONDS", "60"))
+# Default K for analysis_mode="top_k".
+MATCH_ANALYSIS_TOP_K = int(os.getenv("MATCH_ANALYSIS_TOP_K", "10"))
+
+# --- LLM agents ---
+# pydantic-ai Agents (one per model / output type / prompt / settings) kept per process.
+AGENT_POOL_MAX_ITEMS = int(os.getenv("AGENT_POOL_MAX_ITEMS", "128"))
+
+# --- LLM dispatcher ---
+# Default per-provider limits for every LLM call (parsing, match analysis).
+LLM_REQUESTS_PER_MINUTE = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "60"))
+# Estimated input tokens per minute (4 characters per token).
+LLM_TOKENS_PER_MINUTE = float(os.getenv("LLM_TOKENS_PER_MINUTE", "1000000"))
+# Upper bound of the adaptive (AIMD) concurrency limit.
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "5"))
+LLM_BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "1"))
+LLM_BACKOFF_MAX_SECONDS = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "60"))
+# Per-provider overrides, e.g. {"google-gla": {"requests_per_minute": 15, "max_concurrency": 4}}
+LLM_PROVIDER_LIMITS = json.loads(os.getenv("LLM_PROVIDER_LIMITS", "{}"))
+
+# --- Parser ---
+# Compiled request schemas (Pydantic models) kept before the least recently used is dropped.
+SCHEMA_CACHE_MAX_ITEMS = int(os.getenv("SCHEMA_CACHE_MAX_ITEMS", "64"))
+
+# --- PDF processing ---
+# Processes for PDF text extraction and page rendering (0 = one per CPU).
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", "0"))
+# Page scale when a PDF without a usable text layer is rendered to images.
+PDF_RENDER_ZOOM = float(os.getenv("PDF_RENDER_ZOOM", "2"))
+# Below this many extracted characters a PDF is treated as scanned and rendered instead.
+PDF_MIN_TEXT_LENGTH = int(os.getenv("PDF_MIN_TEXT_LENGTH", "100"))
+# Uploads up to this size stay in memory; larger ones are spooled to a temp file.
+UPLOAD_SPOOL_THRESHOLD_BYTES = int(
+    os.getenv("UPLOAD_SPOOL_THRESHOLD_BYTES", str(16 * 1024 * 1024))
+)
+
+# --- Parse result cache ---
+# Structured parse results keyed by input content, schema, system prompt and model.
+PARSE_CACHE_ENABLED = os.getenv("PARSE_CACHE_ENABLED", "true").lower() == "true"
+PARSE_CACHE_DIR = os.getenv("PARSE_CACHE_DIR", "static/parse_cache")
+PARSE_CACHE_MAX_ITEMS = int(os.getenv("PARSE_CACHE_MAX_ITEMS", "1024"))
+PARSE_CACHE_MAX_BYTES = int(
+    os.getenv("PARSE_CACHE_MAX_BYTES", str(256 * 1024 * 1024))
+)
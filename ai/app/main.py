@@ -1,18 +1,67 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from routers import parser_router, matcher_router, skills_router
+from routers.matcher_router import matcher_instance
+from services.inference import lazy
+from services.llm import pdf_worker
+from services.skills_module.ner_skills import skill_ner
+from config import AI_PRELOAD_MODELS
+
+logger = logging.getLogger(__name__)
+
+# "all" expands to every model handle registered by the imported routers
+PRELOAD_MODELS = (
+    list(lazy.registry) if "all" in AI_PRELOAD_MODELS else AI_PRELOAD_MODELS
+)
+if lazy.unknown(PRELOAD_MODELS):
+    # A typo here would otherwise leave the model unloaded while /health/ready says ready
+    raise ValueError(
+        f"Unknown models in AI_PRELOAD_MODELS: {lazy.unknown(PRELOAD_MODELS)}; "
+        f"known: {sorted(lazy.registry)}"
+    )
+
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm up in the background so liveness answers while models load;
+    # readiness stays 503 until the preloaded models are in memory.
+    warm_up_task = asyncio.create_task(asyncio.to_thread(lazy.warm_up, PRELOAD_MODELS))
+    yield
+    warm_up_task.cancel()
+    skill_ner.save_vector_snapshot()
+    if matcher_instance.embedding_cache is not None:
+        matcher_instance.embedding_cache.flush()
+    # Queued matching work must not start against models being torn down
+    matcher_instance.worker_pool.shutdown(cancel_futures=True)
+    pdf_worker.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.include_router(parser_router, prefix="/parser", tags=["parser"])
 app.include_router(matcher_router, prefix="/matcher", tags=["matcher"])
-# app.include_router(skills_router, prefix="/skills", tags=["skills"])
+app.include_router(skills_router, prefix="/skills", tags=["skills"])
 
 
 @app.get("/")
+@app.get("/health")
+@app.get("/health/live")
 def health():
+    """Liveness: the process is up and serving requests."""
     return {"status": "ok"}
 
 
+@app.get("/health/ready")
+def ready():
+    """Readiness: every model listed in AI_PRELOAD_MODELS is loaded."""
+    status = lazy.readiness(PRELOAD_MODELS)
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+
 if __name__ == "__main__":
     import uvicorn
 
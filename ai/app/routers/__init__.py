@@ -1,9 +1,9 @@
 from .parser_router import router as parser_router
 from .matcher_router import router as matcher_router
-# from .skills_router import router as skills_router
+from .skills_router import router as skills_router
 
 __all__ = [
     "parser_router",
     "matcher_router",
-    # "skills_router",
+    "skills_router",
 ]
@@ -1,10 +1,15 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from typing import List, Dict, Optional
 import sys
 from pathlib import Path
 
-from services.matcher.matcher import Matcher
+from services.matcher.matcher import Matcher, AnalysisMode
+from services.skills_module.ner_skills import skill_ner
+from services.llm.agent_dir import dispatcher
+from config import MATCH_ANALYSIS_TOP_K
+import json
 import logging
 
 logger = logging.getLogger(__name__)
@@ -40,6 +45,15 @@ class MatchRequest(BaseModel):
         le=100,
         description="Minimum fuzzy match score for skills (0-100)",
     )
+    analysis_mode: AnalysisMode = Field(
+        default=AnalysisMode.ALL,
+        description="Which candidates get an LLM analysis: none, top_k (best K by score) or all",
+    )
+    analysis_top_k: int = Field(
+        default=MATCH_ANALYSIS_TOP_K,
+        ge=1,
+        description="Number of best-scoring candidates analyzed when analysis_mode is top_k",
+    )
 
 
 class ScoreBreakdown(BaseModel):
@@ -62,7 +76,10 @@ class MatchResult(BaseModel):
     extra_skills: List[str] = Field(..., description="Extra skills")
     matching_skills: List[str] = Field(..., description="Matching skills")
     weights_used: WeightsUsed = Field(..., description="Weights used in calculation")
-    analysis: str = Field(..., description="Analysis of the match")
+    analysis: Optional[str] = Field(None, description="Analysis of the match")
+    analyzed: bool = Field(
+        False, description="Whether an LLM analysis was produced for this candidate"
+    )
 
 
 class MatchResponse(BaseModel):
@@ -70,6 +87,9 @@ class MatchResponse(BaseModel):
     total_candidates: int = Field(
         ..., description="Total number of candidates processed"
     )
+    analyzed_candidates: int = Field(
+        0, description="Number of candidates that received an LLM analysis"
+    )
 
 
 @router.post("/match_candidates", response_model=MatchResponse)
@@ -100,6 +120,8 @@ async def match_candidates_endpoint(request: MatchRequest):
             candidates=candidates_dicts,
             weights=request.weights,
             fuzzy_threshold=request.fuzzy_threshold or 80.0,
+            analysis_mode=request.analysis_mode,
+            analysis_top_k=request.analysis_top_k,
         )
 
         # Convert results to response format
@@ -114,12 +136,15 @@ async def match_candidates_endpoint(request: MatchRequest):
                 matching_skills=result["matching_skills"],
                 weights_used=result["weights_used"],
                 analysis=result["analysis"],
+                analyzed=result["analyzed"],
             )
             print(f"\n\n\n\nMatch result: {match_result}")
             response_results.append(match_result)
 
         return MatchResponse(
-            results=response_results, total_candidates=len(request.candidates)
+            results=response_results,
+            total_candidates=len(request.candidates),
+            analyzed_candidates=sum(1 for r in response_results if r.analyzed),
         )
 
     except Exception as e:
@@ -131,6 +156,224 @@ async def match_candidates_endpoint(request: MatchRequest):
         )
 
 
+@router.post("/match_candidates/stream")
+async def match_candidates_stream_endpoint(request: MatchRequest):
+    """
+    Streaming variant of /match_candidates, returned as NDJSON (one JSON object per line).
+
+    - {"type": "result", "candidate_index": <index in request.candidates>, ...MatchResult fields}
+      is emitted per candidate as soon as it is final: unanalyzed candidates right after
+      scoring (best first), analyzed ones as their LLM analysis completes.
+    - {"type": "summary", "ranking": [candidate_index, ...], "total_candidates", "analyzed_candidates"}
+      closes the stream; ranking is best first.
+    - {"type": "error", "detail": ...} replaces the summary if matching fails mid-stream;
+      results already emitted remain valid.
+    """
+    if not request.job or not request.candidates:
+        raise HTTPException(
+            status_code=400,
+            detail="Job and candidates list cannot be empty.",
+        )
+
+    async def ndjson_records():
+        try:
+            async for record in matcher_instance.match_candidates_stream(
+                job=request.job,
+                candidates=request.candidates,
+                weights=request.weights,
+                fuzzy_threshold=request.fuzzy_threshold or 80.0,
+                analysis_mode=request.analysis_mode,
+                analysis_top_k=request.analysis_top_k,
+            ):
+                yield json.dumps(record) + "\n"
+        except Exception as e:
+            logger.error(f"Error during streamed candidate matching: {e}")
+            yield json.dumps({"type": "error", "detail": str(e)}) + "\n"
+
+    return StreamingResponse(ndjson_records(), media_type="application/x-ndjson")
+
+
+class MatchPair(BaseModel):
+    job_id: str = Field(..., description="Key of the job in the jobs mapping")
+    candidate_id: str = Field(
+        ..., description="Key of the candidate in the candidates mapping"
+    )
+
+
+class MatchBatchRequest(BaseModel):
+    jobs: Dict[str, Dict] = Field(..., description="Jobs keyed by caller-chosen id")
+    candidates: Dict[str, Dict] = Field(
+        ..., description="Candidates keyed by caller-chosen id"
+    )
+    pairs: List[MatchPair] = Field(..., description="(job, candidate) pairs to score")
+    weights: Optional[Dict] = Field(
+        default=None, description="Optional nested dictionary for weights"
+    )
+    fuzzy_threshold: Optional[float] = Field(
+        default=80.0,
+        ge=0,
+        le=100,
+        description="Minimum fuzzy match score for skills (0-100)",
+    )
+    analysis_mode: AnalysisMode = Field(
+        default=AnalysisMode.ALL,
+        description="Which candidates get an LLM analysis: none, top_k (best K by score per job) or all",
+    )
+    analysis_top_k: int = Field(
+        default=MATCH_ANALYSIS_TOP_K,
+        ge=1,
+        description="Number of best-scoring candidates analyzed per job when analysis_mode is top_k",
+    )
+
+
+class PairMatchResult(MatchResult):
+    job_id: str = Field(..., description="Job id from the request")
+    candidate_id: str = Field(..., description="Candidate id from the request")
+
+
+class MatchBatchResponse(BaseModel):
+    results: List[PairMatchResult] = Field(
+        ..., description="One result per requested pair, in request order"
+    )
+    total_pairs: int = Field(..., description="Total number of pairs processed")
+    analyzed_pairs: int = Field(
+        0, description="Number of pairs that received an LLM analysis"
+    )
+
+
+@router.post("/match_batch", response_model=MatchBatchResponse)
+async def match_batch_endpoint(request: MatchBatchRequest):
+    """
+    Matches many (job, candidate) pairs in one call.
+
+    Every distinct job and candidate is pre-processed (rendering, skill extraction,
+    embeddings) once, no matter how many pairs reference it, before the pairwise
+    scoring fans out.
+    """
+    if not request.pairs:
+        raise HTTPException(status_code=400, detail="Pairs list cannot be empty.")
+
+    unknown = [
+        f"{p.job_id}/{p.candidate_id}"
+        for p in request.pairs
+        if p.job_id not in request.jobs or p.candidate_id not in request.candidates
+    ]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Pairs reference unknown job or candidate ids: {unknown[:10]}",
+        )
+
+    try:
+        matched_results = await matcher_instance.match_batch(
+            jobs=request.jobs,
+            candidates=request.candidates,
+            pairs=[(p.job_id, p.candidate_id) for p in request.pairs],
+            weights=request.weights,
+            fuzzy_threshold=request.fuzzy_threshold or 80.0,
+            analysis_mode=request.analysis_mode,
+            analysis_top_k=request.analysis_top_k,
+        )
+        response_results = [PairMatchResult(**result) for result in matched_results]
+        return MatchBatchResponse(
+            results=response_results,
+            total_pairs=len(request.pairs),
+            analyzed_pairs=sum(1 for r in response_results if r.analyzed),
+        )
+    except Exception as e:
+        logger.error(f"Error during batch matching: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"An error occurred during the batch matching process: {str(e)}",
+        )
+
+
+class ScoreMatrixRequest(BaseModel):
+    jobs: List[Dict] = Field(..., description="Jobs to score candidates against")
+    candidates: List[Dict] = Field(..., description="Candidates to score")
+    weights: Optional[Dict] = Field(
+        default=None, description="Optional nested dictionary for weights"
+    )
+    fuzzy_threshold: Optional[float] = Field(
+        default=80.0,
+        ge=0,
+        le=100,
+        description="Minimum fuzzy match score for skills (0-100)",
+    )
+    top_k: int = Field(default=10, ge=1, description="Candidates returned per job")
+
+
+class RankedCandidate(BaseModel):
+    candidate_index: int = Field(..., description="Index in the request candidates")
+    candidate: Optional[str] = Field(None, description="Candidate name")
+    score: float = Field(..., description="Overall matching score")
+    score_breakdown: ScoreBreakdown = Field(
+        ..., description="Breakdown of score components"
+    )
+
+
+class JobRanking(BaseModel):
+    job_index: int = Field(..., description="Index in the request jobs")
+    results: List[RankedCandidate] = Field(..., description="Top-K candidates")
+
+
+class ScoreMatrixResponse(BaseModel):
+    rankings: List[JobRanking] = Field(..., description="One ranking per job")
+
+
+@router.post("/score_matrix", response_model=ScoreMatrixResponse)
+async def score_matrix_endpoint(request: ScoreMatrixRequest):
+    """
+    Scores every candidate against every job in one vectorized pass and returns the
+    top-K candidates per job. Numeric scores only (no skill lists, no LLM analysis),
+    meant for re-ranking backfills after a weight change or model upgrade.
+    """
+    if not request.jobs or not request.candidates:
+        raise HTTPException(
+            status_code=400,
+            detail="Jobs and candidates lists cannot be empty.",
+        )
+
+    try:
+        rankings = await matcher_instance.worker_pool.run(
+            matcher_instance.rank_candidates_for_jobs,
+            jobs=request.jobs,
+            candidates=request.candidates,
+            weights=request.weights,
+            fuzzy_threshold=request.fuzzy_threshold or 80.0,
+            top_k=request.top_k,
+        )
+        return ScoreMatrixResponse(rankings=rankings)
+    except Exception as e:
+        logger.error(f"Error during score matrix computation: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"An error occurred during the scoring process: {str(e)}",
+        )
+
+
+@router.get("/stats")
+async def matcher_stats():
+    """Returns runtime counters of the matcher (cache hit/miss, size, worker queue depth, batching)."""
+    return {
+        "worker_pool": matcher_instance.worker_pool.stats(),
+        "ner": skill_ner.stats(),
+        "batchers": {
+            "embedding": matcher_instance.embedding_batcher.stats(),
+            "gliner": skill_ner._gliner_batcher.stats(),
+        },
+        "embedding_cache": (
+            matcher_instance.embedding_cache.stats()
+            if matcher_instance.embedding_cache
+            else None
+        ),
+        "job_cache": (
+            matcher_instance.job_cache.stats() if matcher_instance.job_cache else None
+        ),
+        "llm_dispatch": dispatcher.stats(),
+    }
+
+
 # Example usage and testing
 if __name__ == "__main__":
     import uvicorn
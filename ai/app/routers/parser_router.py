@@ -1,17 +1,62 @@
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Body
 from pydantic import BaseModel
 from services.llm.llm_agent import LLM
+from services.llm import documents, pdf_worker
+from services.llm.documents import Document
+from services.llm.agent_dir import agent_pool, dispatcher
 from services.llm.entities_models.candidate_pydantic import Candidate
-from utils import create_model_from_schema
+from services.llm.parse_cache import CacheMode, ParseResultCache
+from utils import compile_schema, schema_cache_stats, schema_hash
+from config import (
+    PARSE_CACHE_ENABLED,
+    PARSE_CACHE_DIR,
+    PARSE_CACHE_MAX_ITEMS,
+    PARSE_CACHE_MAX_BYTES,
+)
+import asyncio
 import os
 import json
+import time
 from typing import List, Optional, Any, Dict, Union
-import aiofiles
-import tempfile
-import shutil
 
 router = APIRouter()
 
+parse_cache = (
+    ParseResultCache(PARSE_CACHE_DIR, PARSE_CACHE_MAX_ITEMS, PARSE_CACHE_MAX_BYTES)
+    if PARSE_CACHE_ENABLED
+    else None
+)
+
+
+async def _parse_cached(
+    llm_parser: LLM,
+    inputs: List[Any],
+    schema_key: str,
+    system_prompt: Optional[str],
+    cache: CacheMode,
+) -> Any:
+    """llm_parser.parse_async(inputs), answered from the parse cache when possible."""
+    key = (
+        ParseResultCache.key(inputs, schema_key, system_prompt, llm_parser.model)
+        if parse_cache is not None
+        else None
+    )
+    if key is not None:
+        if cache == CacheMode.bypass:
+            parse_cache.record_bypass()
+        else:
+            cached = await asyncio.to_thread(parse_cache.get, key)
+            if cached is not None:
+                return cached
+
+    start = time.perf_counter()
+    result = await llm_parser.parse_async(inputs)
+    if key is not None and isinstance(result, dict):
+        await asyncio.to_thread(
+            parse_cache.put, key, result, (time.perf_counter() - start) * 1000
+        )
+    return result
+
 
 # This model is for the items in the JSON payload of the /batch_parse endpoint
 class BatchParseItem(BaseModel):
@@ -39,30 +84,6 @@ class CleanBatchParseItem(BaseModel):
     system_prompt: Optional[str] = None  # Matches "system_prompt" key in client
 
 
-# Helper function to process uploaded files asynchronously
-async def process_uploaded_files(
-    resume_files: List[UploadFile],
-) -> tuple[List[str], str]:
-    temp_dir = tempfile.mkdtemp()
-    processed_file_paths = []
-    for file in resume_files:
-        safe_filename = os.path.basename(file.filename)
-        temp_file_path = os.path.join(temp_dir, safe_filename)
-
-        try:
-            async with aiofiles.open(temp_file_path, "wb") as f:
-                content = await file.read()
-                await f.write(content)
-            processed_file_paths.append(temp_file_path)
-        except Exception as e:
-            shutil.rmtree(temp_dir)
-            raise HTTPException(
-                status_code=500, detail=f"Error processing file {file.filename}: {e}"
-            )
-
-    return processed_file_paths, temp_dir
-
-
 # @router.post("/parse")
 # async def parse_resume(
 #     resume_texts: Optional[List[str]] = Form(default=None),
@@ -123,9 +144,11 @@ async def parse_resume(
     inputs: List[Union[str, UploadFile]] = Form(...),
     schema: str = Form(...),
     system_prompt: Optional[str] = Form(default=None),
+    cache: CacheMode = Form(default=CacheMode.use),
 ):
     """
     Parse resumes from ordered list of text strings or files (PDF/images) and return structured candidate data.
+    Identical requests are answered from the parse cache; cache=bypass forces a fresh parse.
     """
     if not inputs:
         raise HTTPException(status_code=400, detail="inputs must be provided.")
@@ -139,7 +162,7 @@ async def parse_resume(
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Schema is not valid JSON: {e}")
 
-    schema_model = create_model_from_schema(schema_dict, globals_dict=globals())
+    schema_model = compile_schema(schema_dict)
     if not issubclass(schema_model, BaseModel):
         raise HTTPException(
             status_code=400, detail="Schema must be a valid Pydantic model."
@@ -152,8 +175,7 @@ async def parse_resume(
     )
 
     processed_inputs = []
-    files_to_process = []
-    temp_dir_to_clean = None
+    uploaded: List[Document] = []
 
     try:
         for input_item in inputs:
@@ -162,42 +184,34 @@ async def parse_resume(
             )
             if hasattr(input_item, "filename") and hasattr(input_item, "read"):
                 if input_item.filename:  # It's a real file
-                    files_to_process.append(input_item)
-                    processed_inputs.append(None)
+                    document = await documents.read_upload(input_item)
+                    uploaded.append(document)
+                    processed_inputs.append(document)
                 else:  # It's a text field sent as a file
                     text = (await input_item.read()).decode("utf-8")
                     processed_inputs.append(text)
             else:
                 processed_inputs.append(str(input_item))
 
-        if files_to_process:
-            processed_file_paths, temp_dir_to_clean = await process_uploaded_files(
-                files_to_process
-            )
-
-            # Replace placeholders with actual file paths in order
-            file_index = 0
-            for i, item in enumerate(processed_inputs):
-                if item is None:
-                    processed_inputs[i] = processed_file_paths[file_index]
-                    file_index += 1
-
-        result = await llm_parser.parse_async(processed_inputs)
+        result = await _parse_cached(
+            llm_parser, processed_inputs, schema_hash(schema_dict), system_prompt, cache
+        )
         return result
     finally:
-        if temp_dir_to_clean and os.path.exists(temp_dir_to_clean):
-            shutil.rmtree(temp_dir_to_clean)
+        documents.close_all(uploaded)
 
 
 @router.post("/batch_parse")
 async def batch_parse_resume(
     batch_metadata: str = Form(...),
     resume_files: Optional[List[UploadFile]] = File(None),
+    cache: CacheMode = Form(default=CacheMode.use),
 ):
     """
     Parse a batch of resumes, supporting both text and file uploads per batch item.
     batch_metadata: JSON string describing each batch item, including which files belong to which item (by filename).
     resume_files: All files for all batch items, flat list.
+    cache: "use" (default) answers items seen before from the parse cache; "bypass" re-parses every item.
     """
     try:
         batch_requests = json.loads(batch_metadata)
@@ -231,7 +245,7 @@ async def batch_parse_resume(
             detail=f"Schema in the first request is not valid JSON: {e}",
         )
 
-    schema_model = create_model_from_schema(schema_dict, globals_dict=globals())
+    schema_model = compile_schema(schema_dict)
     if not issubclass(schema_model, BaseModel):
         raise HTTPException(
             status_code=400,
@@ -254,7 +268,8 @@ async def batch_parse_resume(
             file_map[f.filename] = f
 
     payloads_for_llm_markers = []
-    temp_dirs_to_clean = []
+    uploaded: List[Document] = []
+    documents_by_name: Dict[str, Document] = {}
 
     try:
         for req_idx, request_item in enumerate(batch_requests):
@@ -264,16 +279,15 @@ async def batch_parse_resume(
                 current_input_data.extend(request_item["resume_texts"])
             # Files
             item_file_names = request_item.get("resume_files") or []
-            item_files = [
-                file_map[name] for name in item_file_names if name in file_map
-            ]
-            if item_files:
-                processed_file_paths, temp_dir = await process_uploaded_files(
-                    item_files
-                )
-                current_input_data.extend(processed_file_paths)
-                if temp_dir:
-                    temp_dirs_to_clean.append(temp_dir)
+            # Read each upload once, even when several items reference it
+            for name in item_file_names:
+                if name in file_map and name not in documents_by_name:
+                    document = await documents.read_upload(file_map[name])
+                    uploaded.append(document)
+                    documents_by_name[name] = document
+            current_input_data.extend(
+                documents_by_name[name] for name in item_file_names if name in file_map
+            )
             if not current_input_data:
                 print(
                     f"Info: Request at index {req_idx} in batch has no input data. A None will be placed in the results for this item."
@@ -285,8 +299,19 @@ async def batch_parse_resume(
         actual_llm_payloads = [p for p in payloads_for_llm_markers if p is not None]
         processed_llm_results_iter = iter([])
         if actual_llm_payloads:
-            raw_results_from_llm = await llm_parser.parse_batch_async(
-                actual_llm_payloads
+            # Each item is looked up, and on a miss parsed, independently
+            schema_key = schema_hash(schema_dict)
+            raw_results_from_llm = await asyncio.gather(
+                *(
+                    _parse_cached(
+                        llm_parser,
+                        payload,
+                        schema_key,
+                        first_request.get("system_prompt"),
+                        cache,
+                    )
+                    for payload in actual_llm_payloads
+                )
             )
             processed_llm_results_iter = iter(raw_results_from_llm)
         final_results = []
@@ -303,9 +328,19 @@ async def batch_parse_resume(
                     final_results.append(None)
         return final_results
     finally:
-        for temp_dir in temp_dirs_to_clean:
-            if os.path.exists(temp_dir):
-                shutil.rmtree(temp_dir)
+        documents.close_all(uploaded)
+
+
+@router.get("/stats")
+async def parser_stats():
+    return {
+        "schema_cache": schema_cache_stats(),
+        "agents": agent_pool.stats(),
+        "llm_dispatch": dispatcher.stats(),
+        "pdf": pdf_worker.stats(),
+        "uploads": documents.stats(),
+        "parse_cache": parse_cache.stats() if parse_cache is not None else None,
+    }
 
 
 # Example usage comment block can remain as is or be removed if not current.
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException, Body
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
-from typing import List, Dict, Set, Tuple
+from typing import List, Dict, Optional, Set, Tuple
 import sys
 from pathlib import Path
 
@@ -29,8 +30,39 @@ class CompareTextsRequest(BaseModel):
     )
 
 
+class TextsRequest(BaseModel):
+    texts: List[str] = Field(
+        ...,
+        min_length=1,
+        example=["Experienced in Python, Java, and SQL.", "Skilled in React and CSS."],
+    )
+
+
+class SkillsBatchResponse(BaseModel):
+    skills: List[List[str]]  # One list per input text, in input order
+
+
+class CompareBatchRequest(BaseModel):
+    job_text: str = Field(..., example="Job requires Python, Machine Learning, and AWS.")
+    candidate_texts: List[str] = Field(
+        ...,
+        min_length=1,
+        example=["Candidate proficient in Python, Docker, and Azure."],
+    )
+    candidate_skills: Optional[List[Optional[List[str]]]] = Field(
+        default=None,
+        description="Optional known skills per candidate, added to those extracted from its text",
+    )
+
+
+class SkillPairMatch(BaseModel):
+    job: str
+    candidate: str
+    score: float
+
+
 class SkillAnalysisResponse(BaseModel):
-    matching_skills: List[str]
+    matching_skills: List[SkillPairMatch]
     missing_skills: List[
         str
     ]  # Skills in text_one (e.g. job) but not in text_two (e.g. candidate)
@@ -66,6 +98,10 @@ class SkillMatchDetailsResponse(BaseModel):
     summary: SkillMatchSummary
 
 
+class CompareBatchResponse(BaseModel):
+    results: List[SkillMatchDetailsResponse]  # One per candidate text, in input order
+
+
 # --- API Endpoints ---
 
 
@@ -78,14 +114,81 @@ async def extract_skills_endpoint(request: TextRequest):
     if not request.text.strip():
         raise HTTPException(status_code=400, detail="Text cannot be empty.")
     try:
-        extracted_skills = skill_ner.extract_skills(request.text)
-        # Convert set to list for JSON response
-        return SkillsListResponse(skills=list(extracted_skills))
+        # GLiNER inference is CPU-bound; keep it off the event loop
+        (extracted_skills,) = await run_in_threadpool(
+            skill_ner.extract_skills_batch, [request.text]
+        )
+        return SkillsListResponse(skills=extracted_skills)
     except Exception as e:
         # logger.error(f"Error in extract_skills_endpoint: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/extract_skills_batch", response_model=SkillsBatchResponse)
+async def extract_skills_batch_endpoint(request: TextsRequest):
+    """
+    Extracts skills from many texts in one call. Texts seen before are answered from
+    the extraction cache; the rest share batched model passes.
+    - **texts**: The input strings; empty strings yield an empty list.
+    """
+    try:
+        skills = await run_in_threadpool(skill_ner.extract_skills_batch, request.texts)
+        return SkillsBatchResponse(skills=skills)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/compare_batch", response_model=CompareBatchResponse)
+async def compare_batch_endpoint(request: CompareBatchRequest):
+    """
+    Skill match report of one job text against many candidate texts, without the
+    full matching pipeline (no embeddings scoring, no LLM analysis).
+
+    - **job_text**: The job description; its skills are considered 'required'.
+    - **candidate_texts**: The candidate texts (e.g. CVs).
+    - **candidate_skills**: Optional known skills per candidate.
+
+    Returns one report per candidate, in input order, shaped like /skill_match_details.
+    """
+    if not request.job_text.strip():
+        raise HTTPException(status_code=400, detail="job_text cannot be empty.")
+    if request.candidate_skills is not None and len(request.candidate_skills) != len(
+        request.candidate_texts
+    ):
+        raise HTTPException(
+            status_code=400,
+            detail="candidate_skills must have one entry per candidate text.",
+        )
+    try:
+        results = await run_in_threadpool(
+            skill_ner.get_skill_match_details_batch,
+            request.job_text,
+            request.candidate_texts,
+            request.candidate_skills,
+        )
+        return CompareBatchResponse(
+            results=[
+                SkillMatchDetailsResponse(
+                    match_percentage=r["match_percentage"],
+                    skill_analysis=SkillAnalysisResponse(**r["skill_analysis"]),
+                    summary=SkillMatchSummary(**r["summary"]),
+                )
+                for r in results
+            ]
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/stats")
+async def skills_stats():
+    """Extraction cache, dictionary tier, chunking and vector store counters."""
+    return {
+        "ner": skill_ner.stats(),
+        "gliner_batcher": skill_ner._gliner_batcher.stats(),
+    }
+
+
 @router.post("/analyze_skills", response_model=SkillAnalysisResponse)
 async def analyze_skills_endpoint(request: CompareTextsRequest):
     """
@@ -102,7 +205,9 @@ async def analyze_skills_endpoint(request: CompareTextsRequest):
             status_code=400, detail="Both texts must be provided and cannot be empty."
         )
     try:
-        analysis_result = skill_ner.analyze_skills(request.text_one, request.text_two)
+        analysis_result = await run_in_threadpool(
+            skill_ner.analyze_skills, request.text_one, request.text_two
+        )
         return SkillAnalysisResponse(**analysis_result)
     except Exception as e:
         # logger.error(f"Error in analyze_skills_endpoint: {e}")
@@ -124,8 +229,10 @@ async def get_skill_resemblance_rate_endpoint(request: CompareTextsRequest):
             status_code=400, detail="Both texts must be provided and cannot be empty."
         )
     try:
-        rate, analysis = skill_ner.calculate_skills_resemblance_rate(
-            request.text_one, request.text_two
+        rate, analysis = await run_in_threadpool(
+            skill_ner.calculate_skills_resemblance_rate,
+            request.text_one,
+            request.text_two,
         )
         # The analysis from calculate_skills_resemblance_rate matches SkillAnalysisResponse structure
         return SkillResemblanceResponse(
@@ -152,8 +259,8 @@ async def get_skill_match_details_endpoint(request: CompareTextsRequest):
             status_code=400, detail="Both texts must be provided and cannot be empty."
         )
     try:
-        match_details = skill_ner.get_skill_match_details(
-            request.text_one, request.text_two
+        match_details = await run_in_threadpool(
+            skill_ner.get_skill_match_details, request.text_one, request.text_two
         )
 
         # Ensure the nested dictionaries map correctly to Pydantic models
@@ -0,0 +1,95 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routers.skills_router import router
+from services.skills_module.ner_skills import skill_ner
+
+app = FastAPI()
+app.include_router(router, prefix="/skills")
+client = TestClient(app)
+
+
+def _details(matching: int, total: int) -> dict:
+    return {
+        "match_percentage": round(matching / total * 100, 2),
+        "skill_analysis": {
+            "matching_skills": [{"job": "Python", "candidate": "python", "score": 1.0}] * matching,
+            "missing_skills": ["SQL"] * (total - matching),
+            "extra_skills": [],
+            "total_job_skills": total,
+            "total_candidate_skills": matching,
+            "matching_skills_count": matching,
+            "missing_skills_count": total - matching,
+            "extra_skills_count": 0,
+        },
+        "summary": {
+            "total_required_skills": total,
+            "matching_skills_count": matching,
+            "missing_skills_count": total - matching,
+            "extra_skills_count": 0,
+        },
+    }
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = []
+
+    def extract_skills_batch(texts):
+        calls.append(("extract", list(texts)))
+        return [sorted(set(text.split())) if text else [] for text in texts]
+
+    def get_skill_match_details_batch(job_text, candidate_texts, candidate_skills=None):
+        calls.append(("compare", job_text, list(candidate_texts), candidate_skills))
+        return [_details(i % 2 + 1, 2) for i in range(len(candidate_texts))]
+
+    monkeypatch.setattr(skill_ner, "extract_skills_batch", extract_skills_batch)
+    monkeypatch.setattr(skill_ner, "get_skill_match_details_batch", get_skill_match_details_batch)
+    return calls
+
+
+def test_extract_skills_batch_answers_every_text_in_one_call(calls):
+    response = client.post("/skills/extract_skills_batch", json={"texts": ["SQL Python", "", "Go"]})
+
+    assert response.status_code == 200
+    assert response.json() == {"skills": [["Python", "SQL"], [], ["Go"]]}
+    assert calls == [("extract", ["SQL Python", "", "Go"])]
+
+
+def test_extract_skills_batch_rejects_an_empty_list(calls):
+    assert client.post("/skills/extract_skills_batch", json={"texts": []}).status_code == 422
+    assert calls == []
+
+
+def test_compare_batch_returns_one_report_per_candidate(calls):
+    response = client.post(
+        "/skills/compare_batch",
+        json={
+            "job_text": "Python SQL",
+            "candidate_texts": ["python", "python sql"],
+            "candidate_skills": [None, ["SQL"]],
+        },
+    )
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["match_percentage"] for r in results] == [50.0, 100.0]
+    assert calls == [("compare", "Python SQL", ["python", "python sql"], [None, ["SQL"]])]
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        {"job_text": "  ", "candidate_texts": ["python"]},
+        {"job_text": "Python", "candidate_texts": ["python", "sql"], "candidate_skills": [["SQL"]]},
+    ],
+)
+def test_compare_batch_rejects_bad_requests(calls, body):
+    assert client.post("/skills/compare_batch", json=body).status_code == 400
+    assert calls == []
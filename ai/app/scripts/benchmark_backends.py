@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Compares inference backends against the fp32 torch reference.
+
+For each model and backend reports single-text latency (p50/p95), batched
+throughput, and drift from fp32: cosine similarity of embeddings, and Jaccard
+overlap of GLiNER skill sets.
+
+Usage (from ai/app):
+    python -m scripts.benchmark_backends [--texts texts.json] [--backends torch_int8 onnx onnx_int8]
+                                         [--output static/benchmarks/backends.md]
+
+--texts is a JSON list of strings or of objects (rendered with utils.render_model),
+e.g. parsed resumes; a few built-in samples are used otherwise.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from typing import Dict, List
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import torch
+
+from config import EMBEDDING_BATCH_SIZE, EMBEDDING_MODEL_NAME, GLINER_MODEL_NAME
+from services.inference.backends import (
+    InferenceBackend,
+    load_embedding_model,
+    load_gliner_model,
+)
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger("benchmark_backends")
+
+SKILL_LABELS = ["soft skills", "technical skills"]
+SAMPLE_TEXTS = [
+    "Senior Python developer with 6 years of FastAPI, PostgreSQL and Docker experience.",
+    "Looking for a data engineer familiar with Spark, Airflow and AWS; strong communication skills required.",
+    "Project manager with Agile and Scrum certification, stakeholder management and budgeting experience.",
+    "Machine learning engineer: PyTorch, TensorFlow, MLOps, model deployment on Kubernetes.",
+    "Frontend developer skilled in React, TypeScript and accessibility; collaborative team player.",
+    "Accountant with IFRS reporting, Excel modelling and attention to detail.",
+]
+
+
+def load_texts(path: str) -> List[str]:
+    if not path:
+        return SAMPLE_TEXTS
+    from utils import render_model
+
+    with open(path, "r") as f:
+        items = json.load(f)
+    return [item if isinstance(item, str) else render_model(item) for item in items]
+
+
+def _latency_stats(fn, texts: List[str]) -> Dict:
+    timings = []
+    for text in texts:
+        start = time.perf_counter()
+        fn([text])
+        timings.append((time.perf_counter() - start) * 1000)
+    start = time.perf_counter()
+    fn(texts)
+    batch_seconds = time.perf_counter() - start
+    return {
+        "p50_ms": round(float(np.percentile(timings, 50)), 1),
+        "p95_ms": round(float(np.percentile(timings, 95)), 1),
+        "throughput_per_s": round(len(texts) / batch_seconds, 2),
+    }
+
+
+def bench_embeddings(texts: List[str], backends: List[str]) -> List[Dict]:
+    rows = []
+    reference = None
+    for backend in [InferenceBackend.TORCH.value, *backends]:
+        model = load_embedding_model(EMBEDDING_MODEL_NAME, backend)
+
+        def encode(batch):
+            return model.encode(
+                batch,
+                batch_size=EMBEDDING_BATCH_SIZE,
+                normalize_embeddings=True,
+                show_progress_bar=False,
+            )
+
+        encode(texts[:1])  # warm-up
+        row = {"model": "embedding", "backend": backend, **_latency_stats(encode, texts)}
+        vectors = encode(texts)
+        if reference is None:
+            reference = vectors
+        cosines = np.sum(reference * vectors, axis=1)
+        row["drift"] = f"cos mean {cosines.mean():.4f} / min {cosines.min():.4f}"
+        rows.append(row)
+        del model
+    return rows
+
+
+def bench_gliner(texts: List[str], backends: List[str]) -> List[Dict]:
+    rows = []
+    reference = None
+    device = torch.device("cpu")
+    for backend in [InferenceBackend.TORCH.value, *backends]:
+        model = load_gliner_model(GLINER_MODEL_NAME, backend, device)
+
+        def predict(batch):
+            return model.batch_predict_entities(batch, SKILL_LABELS, threshold=0.5)
+
+        predict(texts[:1])  # warm-up
+        row = {"model": "gliner", "backend": backend, **_latency_stats(predict, texts)}
+        skills = [
+            {e["text"].strip().lower() for e in entities}
+            for entities in predict(texts)
+        ]
+        if reference is None:
+            reference = skills
+        jaccards = [
+            len(a & b) / len(a | b) if (a | b) else 1.0
+            for a, b in zip(reference, skills)
+        ]
+        row["drift"] = f"jaccard mean {np.mean(jaccards):.4f} / min {np.min(jaccards):.4f}"
+        rows.append(row)
+        del model
+    return rows
+
+
+def to_markdown(rows: List[Dict], n_texts: int) -> str:
+    lines = [
+        f"# Inference backend comparison ({n_texts} texts, {torch.get_num_threads()} torch threads)",
+        "",
+        "| model | backend | p50 ms | p95 ms | texts/s (batched) | drift vs torch fp32 |",
+        "|---|---|---|---|---|---|",
+    ]
+    for r in rows:
+        lines.append(
+            f"| {r['model']} | {r['backend']} | {r['p50_ms']} | {r['p95_ms']} | {r['throughput_per_s']} | {r['drift']} |"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--texts", default=None)
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        default=[
+            InferenceBackend.TORCH_INT8.value,
+            InferenceBackend.ONNX.value,
+            InferenceBackend.ONNX_INT8.value,
+        ],
+        choices=[b.value for b in InferenceBackend if b != InferenceBackend.TORCH],
+    )
+    parser.add_argument("--only", choices=["embedding", "gliner"], default=None)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    texts = load_texts(args.texts)
+    rows = []
+    if args.only in (None, "embedding"):
+        rows += bench_embeddings(texts, args.backends)
+    if args.only in (None, "gliner"):
+        rows += bench_gliner(texts, args.backends)
+
+    report = to_markdown(rows, len(texts))
+    print(report)
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w") as f:
+            f.write(report)
+        logger.info(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
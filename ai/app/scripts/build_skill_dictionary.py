@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Builds the skill dictionary file loaded by the dictionary extraction tier.
+
+Run at image build time, so the service never downloads skillNer's SKILL_DB
+while extracting skills. Keeps only the fields SkillDictionary reads (skill
+name, full form and abbreviation) from skillNer's database, or from a curated
+skillNer-style JSON given with --source.
+
+Usage (from ai/app):
+    python -m scripts.build_skill_dictionary [--source curated_skills.json]
+                                             [--output data/skill_dictionary.json]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import SKILL_DICTIONARY_PATH
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger("build_skill_dictionary")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--source", default=None)
+    parser.add_argument("--output", default=SKILL_DICTIONARY_PATH)
+    args = parser.parse_args()
+
+    if args.source:
+        with open(args.source, "r") as f:
+            skill_db = json.load(f)
+    else:
+        # skillNer fetches skill_db_relax_20.json from GitHub on first import
+        from skillNer.general_params import SKILL_DB as skill_db
+
+    entries = {}
+    for skill_id, entry in skill_db.items():
+        if not entry.get("skill_name"):
+            continue
+        forms = entry.get("high_surfce_forms") or {}
+        entries[skill_id] = {
+            "skill_name": entry["skill_name"],
+            "high_surfce_forms": {k: forms[k] for k in ("full", "abv") if forms.get(k)},
+        }
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    tmp_path = args.output + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(entries, f)
+    os.replace(tmp_path, args.output)
+    logger.info(f"Wrote {len(entries)} skills to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
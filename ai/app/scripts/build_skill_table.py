@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Builds the precomputed skill vector table used by skill_ner.match_skills.
+
+Embeds every distinct skill phrase (normalized the same way as at match time)
+with the spaCy model and writes a float16 matrix plus a phrase -> row index to
+SKILL_TABLE_DIR. Running workers pick the table up on their next start.
+
+Usage (from ai/app):
+    python -m scripts.build_skill_table [--skills skill_vocabulary.json ...] [--no-dictionary]
+                                        [--output static/skill_table]
+
+--skills takes JSON lists of skill names, e.g. the file written by the
+backend's scripts/export_skill_vocabulary.py; the skill dictionary vocabulary
+is added unless --no-dictionary is given.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from typing import List
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from config import SKILL_DICTIONARY_PATH, SKILL_TABLE_DIR
+from services.skills_module.ner_skills import (
+    skill_ner,
+    spacy_model,
+    spacy_model_name,
+    spacy_vector_dim,
+)
+from services.skills_module.skill_dictionary import load_skill_dictionary
+from services.skills_module.skill_table import write_skill_table
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger("build_skill_table")
+
+
+def collect_phrases(skill_files: List[str], with_dictionary: bool) -> List[str]:
+    phrases = set()
+    for path in skill_files:
+        with open(path, "r") as f:
+            phrases.update(str(s) for s in json.load(f) if s)
+        logger.info(f"{len(phrases)} phrases after {path}")
+    if with_dictionary:
+        dictionary = load_skill_dictionary(SKILL_DICTIONARY_PATH)
+        if dictionary is not None:
+            phrases.update(dictionary.skills)
+            logger.info(f"{len(phrases)} phrases after adding the skill dictionary")
+    return sorted(phrases)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--skills", nargs="*", default=[])
+    parser.add_argument("--no-dictionary", action="store_true")
+    parser.add_argument("--output", default=SKILL_TABLE_DIR)
+    parser.add_argument("--batch-size", type=int, default=1024)
+    args = parser.parse_args()
+
+    phrases = collect_phrases(args.skills, not args.no_dictionary)
+    keys = sorted({key for key in skill_ner._clean_many(phrases) if key.strip()})
+    if not keys:
+        logger.error("No skill phrases to embed")
+        sys.exit(1)
+
+    nlp = spacy_model.get()
+    dim = spacy_vector_dim(nlp)
+    vectors = np.zeros((len(keys), dim), dtype=np.float32)
+    for row, doc in enumerate(nlp.pipe(keys, batch_size=args.batch_size)):
+        vec = doc.vector
+        if vec is not None and vec.shape == (dim,):
+            vectors[row] = vec / (np.linalg.norm(vec) + 1e-9)
+        if (row + 1) % 10000 == 0:
+            logger.info(f"Embedded {row + 1}/{len(keys)} phrases")
+
+    write_skill_table(args.output, spacy_model_name(nlp), keys, vectors)
+    logger.info(
+        f"Wrote {len(keys)} x {dim} float16 skill table ({vectors.size * 2 / 1e6:.1f} MB) to {args.output}"
+    )
+
+
+if __name__ == "__main__":
+    main()
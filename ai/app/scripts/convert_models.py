@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+One-time conversion of the embedding and GLiNER models to ONNX (fp32 + int8).
+
+Writes to CONVERTED_MODELS_DIR; afterwards set INFERENCE_BACKEND (or
+EMBEDDING_BACKEND / GLINER_BACKEND) to onnx or onnx_int8. The torch_int8
+backend needs no conversion.
+
+Usage (from ai/app):
+    python -m scripts.convert_models [--only embedding|gliner]
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import EMBEDDING_MODEL_NAME, GLINER_MODEL_NAME
+from services.inference.backends import export_embedding_model, export_gliner_model
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger("convert_models")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--only", choices=["embedding", "gliner"], default=None)
+    args = parser.parse_args()
+
+    if args.only in (None, "embedding"):
+        logger.info(f"Converting embedding model {EMBEDDING_MODEL_NAME}...")
+        logger.info(f"Wrote {export_embedding_model(EMBEDDING_MODEL_NAME)}")
+    if args.only in (None, "gliner"):
+        logger.info(f"Converting GLiNER model {GLINER_MODEL_NAME}...")
+        logger.info(f"Wrote {export_gliner_model(GLINER_MODEL_NAME)}")
+
+
+if __name__ == "__main__":
+    main()
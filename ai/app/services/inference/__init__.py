@@ -0,0 +1,19 @@
+from .lazy import LazyModel
+from .micro_batcher import MicroBatcher
+from .backends import (
+    InferenceBackend,
+    load_embedding_model,
+    load_gliner_model,
+    model_version,
+    set_torch_threads,
+)
+
+__all__ = [
+    "LazyModel",
+    "MicroBatcher",
+    "InferenceBackend",
+    "load_embedding_model",
+    "load_gliner_model",
+    "model_version",
+    "set_torch_threads",
+]
@@ -0,0 +1,186 @@
+"""
+Selectable CPU inference backends for the embedding (SentenceTransformer) and
+GLiNER models.
+
+- torch:      fp32 eager PyTorch (reference)
+- torch_int8: PyTorch with dynamic int8 quantization of Linear layers, applied at load
+- onnx:       ONNX Runtime, fp32 graph exported by scripts.convert_models
+- onnx_int8:  ONNX Runtime, dynamically int8-quantized graph exported by scripts.convert_models
+"""
+
+import logging
+from enum import Enum
+from pathlib import Path
+from typing import Union
+
+from config import CONVERTED_MODELS_DIR, ONNX_QUANTIZATION_CONFIG
+
+logger = logging.getLogger(__name__)
+
+GLINER_ONNX_FILE = "model.onnx"
+GLINER_ONNX_INT8_FILE = "model_quantized.onnx"
+
+
+class InferenceBackend(str, Enum):
+    TORCH = "torch"
+    TORCH_INT8 = "torch_int8"
+    ONNX = "onnx"
+    ONNX_INT8 = "onnx_int8"
+
+
+def set_torch_threads(n_threads: int) -> None:
+    """
+    Process-wide torch intra-op thread count. Every forward pass runs on one
+    micro-batcher thread per model, so torch's default (all cores) already fits;
+    set this only to leave cores to other processes on the host.
+    """
+    try:
+        import torch
+
+        torch.set_num_threads(n_threads)
+        logger.info(f"Torch intra-op threads set to {n_threads}")
+    except Exception as e:
+        logger.warning(f"Could not set torch intra-op threads: {e}")
+
+
+def model_version(model_name: str, backend: Union[str, InferenceBackend]) -> str:
+    """Identifier for cache keys: outputs of different backends drift slightly."""
+    backend = InferenceBackend(backend)
+    if backend == InferenceBackend.TORCH:
+        return model_name
+    return f"{model_name}:{backend.value}"
+
+
+def converted_model_dir(model_name: str) -> Path:
+    return Path(CONVERTED_MODELS_DIR) / model_name.replace("/", "__")
+
+
+def _quantize_linear_layers(module):
+    import torch
+
+    return torch.ao.quantization.quantize_dynamic(
+        module, {torch.nn.Linear}, dtype=torch.qint8
+    )
+
+
+def _embedding_int8_file() -> str:
+    return f"onnx/model_qint8_{ONNX_QUANTIZATION_CONFIG}.onnx"
+
+
+# ---------- SentenceTransformer ----------
+def load_embedding_model(model_name: str, backend: Union[str, InferenceBackend]):
+    from sentence_transformers import SentenceTransformer
+
+    backend = InferenceBackend(backend)
+    if backend == InferenceBackend.TORCH:
+        return SentenceTransformer(model_name)
+    if backend == InferenceBackend.TORCH_INT8:
+        return _quantize_linear_layers(SentenceTransformer(model_name, device="cpu"))
+
+    model_dir = converted_model_dir(model_name)
+    if not model_dir.exists():
+        raise FileNotFoundError(
+            f"No converted model for {model_name} in {model_dir}; run `python -m scripts.convert_models` first."
+        )
+    file_name = (
+        _embedding_int8_file()
+        if backend == InferenceBackend.ONNX_INT8
+        else "onnx/model.onnx"
+    )
+    return SentenceTransformer(
+        str(model_dir), backend="onnx", model_kwargs={"file_name": file_name}
+    )
+
+
+def export_embedding_model(model_name: str) -> Path:
+    """Exports the fp32 and int8 ONNX graphs of a SentenceTransformer model."""
+    from sentence_transformers import (
+        SentenceTransformer,
+        export_dynamic_quantized_onnx_model,
+    )
+
+    model_dir = converted_model_dir(model_name)
+    model = SentenceTransformer(model_name, backend="onnx")
+    model.save_pretrained(str(model_dir))
+    export_dynamic_quantized_onnx_model(model, ONNX_QUANTIZATION_CONFIG, str(model_dir))
+    logger.info(f"Exported ONNX embedding model to {model_dir}")
+    return model_dir
+
+
+# ---------- GLiNER ----------
+def load_gliner_model(
+    model_name: str, backend: Union[str, InferenceBackend], device
+):
+    from gliner import GLiNER
+
+    backend = InferenceBackend(backend)
+    if backend == InferenceBackend.TORCH:
+        return GLiNER.from_pretrained(model_name, device=device)
+    if backend == InferenceBackend.TORCH_INT8:
+        gliner = GLiNER.from_pretrained(model_name, map_location="cpu")
+        gliner.model = _quantize_linear_layers(gliner.model)
+        return gliner
+
+    model_dir = converted_model_dir(model_name)
+    onnx_file = (
+        GLINER_ONNX_INT8_FILE
+        if backend == InferenceBackend.ONNX_INT8
+        else GLINER_ONNX_FILE
+    )
+    if not (model_dir / onnx_file).exists():
+        raise FileNotFoundError(
+            f"No converted model {model_dir / onnx_file}; run `python -m scripts.convert_models` first."
+        )
+    return GLiNER.from_pretrained(
+        str(model_dir),
+        load_onnx_model=True,
+        load_tokenizer=True,
+        onnx_model_file=onnx_file,
+    )
+
+
+def export_gliner_model(model_name: str) -> Path:
+    """Exports the fp32 and int8 ONNX graphs of a GLiNER model next to its config and tokenizer."""
+    import torch
+    from gliner import GLiNER
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    model_dir = converted_model_dir(model_name)
+    gliner = GLiNER.from_pretrained(model_name, map_location="cpu")
+    gliner.save_pretrained(model_dir)
+
+    # Trace with a representative input; batch, sequence and span axes stay dynamic
+    inputs, _ = gliner.prepare_model_inputs(
+        ["Experienced Python developer with strong communication skills."],
+        ["soft skills", "technical skills"],
+    )
+    input_names = ["input_ids", "attention_mask", "words_mask", "text_lengths"]
+    dynamic_axes = {
+        "input_ids": {0: "batch_size", 1: "sequence_length"},
+        "attention_mask": {0: "batch_size", 1: "sequence_length"},
+        "words_mask": {0: "batch_size", 1: "sequence_length"},
+        "text_lengths": {0: "batch_size", 1: "value"},
+        "logits": {0: "position", 1: "batch_size", 2: "sequence_length", 3: "num_classes"},
+    }
+    if gliner.config.span_mode != "token_level":
+        input_names += ["span_idx", "span_mask"]
+        dynamic_axes["span_idx"] = {0: "batch_size", 1: "num_spans", 2: "idx"}
+        dynamic_axes["span_mask"] = {0: "batch_size", 1: "num_spans"}
+
+    onnx_path = model_dir / GLINER_ONNX_FILE
+    torch.onnx.export(
+        gliner.model,
+        tuple(inputs[name] for name in input_names),
+        f=str(onnx_path),
+        input_names=input_names,
+        output_names=["logits"],
+        dynamic_axes=dynamic_axes,
+        opset_version=14,
+    )
+    quantize_dynamic(
+        str(onnx_path),
+        str(model_dir / GLINER_ONNX_INT8_FILE),
+        weight_type=QuantType.QUInt8,
+    )
+    logger.info(f"Exported ONNX GLiNER model to {model_dir}")
+    return model_dir
@@ -0,0 +1,98 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LazyModel:
+    """
+    Handle to a model that is loaded on first use (or by an explicit warm-up),
+    exactly once per process, no matter how many threads ask for it at once.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        loader: Callable[[], Any],
+        warmup: Optional[Callable[[Any], Any]] = None,
+    ):
+        self.name = name
+        self._loader = loader
+        self._warmup = warmup
+        self._lock = threading.Lock()
+        self._model: Any = None
+        self.loaded = False
+        self.error: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+        registry[name] = self
+
+    def get(self) -> Any:
+        if self.loaded:
+            return self._model
+        with self._lock:
+            if not self.loaded:
+                logger.info(f"Loading model '{self.name}'...")
+                start = time.perf_counter()
+                try:
+                    self._model = self._loader()
+                except Exception as e:
+                    self.error = str(e)
+                    logger.error(f"Failed to load model '{self.name}': {e}")
+                    raise
+                self.load_seconds = round(time.perf_counter() - start, 2)
+                self.error = None
+                self.loaded = True
+                logger.info(f"Loaded model '{self.name}' in {self.load_seconds}s")
+        return self._model
+
+    def warm_up(self) -> None:
+        """Loads the model and runs one tiny inference so the first request is not slow."""
+        model = self.get()
+        if self._warmup is not None:
+            self._warmup(model)
+
+    def status(self) -> Dict:
+        return {
+            "loaded": self.loaded,
+            "load_seconds": self.load_seconds,
+            "error": self.error,
+        }
+
+
+# Every LazyModel registers itself here under its name.
+registry: Dict[str, LazyModel] = {}
+
+
+def warm_up(names: Iterable[str]) -> None:
+    """Loads and warms the named models; failures are logged and reported by readiness()."""
+    for name in names:
+        handle = registry.get(name)
+        if handle is None:
+            logger.warning(f"Unknown model '{name}' in preload list; known: {sorted(registry)}")
+            continue
+        try:
+            handle.warm_up()
+        except Exception as e:
+            logger.error(f"Warm-up of model '{name}' failed: {e}")
+
+
+def unknown(names: Iterable[str]) -> List[str]:
+    """The names that no LazyModel is registered under."""
+    return [name for name in names if name not in registry]
+
+
+def readiness(required: Iterable[str]) -> Dict:
+    """
+    {"ready": bool, "models": {name: status}}; ready once every required model is
+    loaded. A required name with no registered model never becomes ready.
+    """
+    required = list(required)
+    missing = unknown(required)
+    return {
+        "ready": not missing and all(registry[name].loaded for name in required),
+        "required": required,
+        "unknown": missing,
+        "models": {name: handle.status() for name, handle in registry.items()},
+    }
@@ -0,0 +1,163 @@
+import asyncio
+import bisect
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Histogram upper bounds; the last bucket is open-ended.
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+LATENCY_MS_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class _Histogram:
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def to_dict(self) -> Dict:
+        labels = [f"<={b}" for b in self.bounds] + [f">{self.bounds[-1]}"]
+        return {
+            "buckets": dict(zip(labels, self.counts)),
+            "count": self.count,
+            "mean": round(self.total / self.count, 2) if self.count else 0.0,
+        }
+
+
+class MicroBatcher:
+    """
+    In-process dynamic batching for one model.
+
+    Callers submit single items from any thread (or coroutine); a background thread
+    collects them for up to max_wait_ms or until max_batch_size items are queued,
+    runs batch_fn once over the whole batch and resolves each caller's future with
+    its own output. batch_fn must return one output per input, in order.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        batch_fn: Callable[[List[Any]], List[Any]],
+        max_batch_size: int,
+        max_wait_ms: float,
+    ):
+        self.name = name
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_seconds = max(0.0, max_wait_ms) / 1000
+
+        self._queue: "queue.Queue[Tuple[Any, Future, float]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self.batch_sizes = _Histogram(BATCH_SIZE_BUCKETS)
+        self.latencies_ms = _Histogram(LATENCY_MS_BUCKETS)
+        self.batches = 0
+        self.failed_batches = 0
+        self.cancelled = 0
+
+        self._thread = threading.Thread(
+            target=self._loop, name=f"micro-batcher-{name}", daemon=True
+        )
+        self._thread.start()
+
+    # ---------- submission ----------
+    def submit(self, item: Any) -> Future:
+        future: Future = Future()
+        self._queue.put((item, future, time.perf_counter()))
+        return future
+
+    def run(self, item: Any) -> Any:
+        """Blocking: batched result for a single item."""
+        return self.submit(item).result()
+
+    def run_many(self, items: Sequence[Any]) -> List[Any]:
+        """Blocking: submits every item before waiting so they share batches."""
+        futures = [self.submit(item) for item in items]
+        return [f.result() for f in futures]
+
+    async def run_async(self, item: Any) -> Any:
+        return await asyncio.wrap_future(self.submit(item))
+
+    # ---------- worker ----------
+    def _collect(self) -> List[Tuple[Any, Future, float]]:
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait_seconds
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                # Drain whatever is already queued even past the deadline
+                batch.append(
+                    self._queue.get(timeout=remaining)
+                    if remaining > 0
+                    else self._queue.get_nowait()
+                )
+            except queue.Empty:
+                break
+        return batch
+
+    def _loop(self) -> None:
+        while True:
+            try:
+                self._run_batch(self._collect())
+            except Exception as e:
+                # Never let the worker thread die: every later submit would hang
+                logger.exception(f"{self.name} batcher loop error: {e}")
+
+    def _run_batch(self, batch: List[Tuple[Any, Future, float]]) -> None:
+        # Drop items whose caller gave up (cancelled, timed out) before the batch
+        # started; the rest can no longer be cancelled
+        live = [entry for entry in batch if entry[1].set_running_or_notify_cancel()]
+        if len(live) < len(batch):
+            with self._lock:
+                self.cancelled += len(batch) - len(live)
+        if not live:
+            return
+        batch = live
+        items = [item for item, _, _ in batch]
+        try:
+            outputs = self.batch_fn(items)
+            if len(outputs) != len(items):
+                raise RuntimeError(
+                    f"{self.name} batch_fn returned {len(outputs)} outputs for {len(items)} inputs"
+                )
+        except Exception as e:
+            logger.error(f"{self.name} batch of {len(items)} failed: {e}")
+            with self._lock:
+                self.batches += 1
+                self.failed_batches += 1
+                self.batch_sizes.observe(len(items))
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+
+        done_at = time.perf_counter()
+        with self._lock:
+            self.batches += 1
+            self.batch_sizes.observe(len(items))
+            for _, _, submitted_at in batch:
+                self.latencies_ms.observe((done_at - submitted_at) * 1000)
+        for (_, future, _), output in zip(batch, outputs):
+            future.set_result(output)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait_seconds * 1000,
+                "queue_depth": self._queue.qsize(),
+                "batches": self.batches,
+                "failed_batches": self.failed_batches,
+                "cancelled": self.cancelled,
+                "batch_size": self.batch_sizes.to_dict(),
+                "latency_ms": self.latencies_ms.to_dict(),
+            }
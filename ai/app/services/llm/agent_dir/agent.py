@@ -1,5 +1,4 @@
 from pydantic_ai import Agent, BinaryContent
-import os
 from pydantic import BaseModel
 import io
 from typing import Optional, Any, Dict, List
@@ -8,6 +7,8 @@ import traceback
 import time
 import asyncio
 
+from services.llm.agent_dir import agent_pool, dispatcher
+
 
 class agent:
     def __init__(
@@ -29,46 +30,23 @@ class agent:
         self.retries = retries
         self.tools = tools or []
 
-        # Handle API keys based on model provider prefix
-        if model.startswith(("gpt", "openai")):
-            os.environ["OPENAI_API_KEY"] = api_key
-        elif model.startswith(("anthropic", "claude")):
-            os.environ["ANTHROPIC_API_KEY"] = api_key
-        elif model.startswith(("google", "gemini")):
-            os.environ["GEMINI_API_KEY"] = api_key
-        elif model.startswith("cohere:"):
-            os.environ["COHERE_API_KEY"] = api_key
-        elif model.startswith("groq:"):
-            os.environ["GROQ_API_KEY"] = api_key
-        elif model.startswith("deepseek:"):
-            os.environ["DEEPSEEK_API_KEY"] = api_key
-        elif model.startswith("mistral:"):
-            os.environ["MISTRAL_API_KEY"] = api_key
-        elif model.startswith("bedrock:"):
-            # AWS Bedrock requires different credentials setup
-            os.environ["AWS_ACCESS_KEY_ID"] = (
-                api_key.split(":")[0] if ":" in api_key else api_key
-            )
-            os.environ["AWS_SECRET_ACCESS_KEY"] = (
-                api_key.split(":")[1] if ":" in api_key else ""
-            )
-        else:
-            os.environ["OPENAI_API_KEY"] = api_key
+        # Keys are handed to the model's provider by the agent pool, not os.environ
+        self.api_key = api_key
 
-    async def run(self, payload, output_type: Optional[BaseModel] = None):
-        agent = Agent(
+    def _agent(self, output_type: Optional[BaseModel] = None) -> Agent:
+        return agent_pool.get_agent(
             model=self.model,
+            api_key=self.api_key,
             output_type=output_type or self.output_type,
             system_prompt=self.system_prompt,
             name=self.name,
             model_settings=self.model_settings,
             retries=self.retries,
+            tools=self.tools,
         )
-        # print("agent created for",payload)
-        # Add tools if provided
-        if self.tools:
-            for tool in self.tools:
-                agent.tool(tool)
+
+    async def run(self, payload, output_type: Optional[BaseModel] = None):
+        agent = self._agent(output_type)
 
         for i, load in enumerate(payload):
             if isinstance(load, Image.Image):
@@ -78,33 +56,21 @@ class agent:
                     data=img_byte_arr.getvalue(), media_type="image/png"
                 )
 
-        attempts = 0
-        while attempts < 3:
-            try:
-                result = await agent.run(payload)
-                return (
-                    result.output.model_dump()
-                    if hasattr(result.output, "model_dump")
-                    else result.output
-                )
-            except Exception as e:
-                attempts += 1
-                if hasattr(e, "status_code"):
-                    if e.status_code == 503:
-                        print("503 error, retrying...")
-                        await asyncio.sleep(10)
-                    elif e.status_code == 429:
-                        print("429 error, retrying...")
-                        await asyncio.sleep(10)
-                print(e)
-                print(traceback.format_exc())
-
-                if attempts >= 3:
-                    raise Exception(
-                        f"Failed to run agent after {attempts} attempts: {str(e)}"
-                    )
-
-        raise Exception("Failed to run agent")
+        try:
+            # Rate limits, adaptive concurrency and retries are shared per provider
+            result = await dispatcher.for_model(self.model).call(
+                lambda: agent.run(payload),
+                estimated_tokens=dispatcher.estimate_tokens(payload, self.system_prompt),
+            )
+        except Exception as e:
+            print(e)
+            print(traceback.format_exc())
+            raise Exception(f"Failed to run agent: {str(e)}")
+        return (
+            result.output.model_dump()
+            if hasattr(result.output, "model_dump")
+            else result.output
+        )
 
     # async def run_stream(self, payload):
     #     """Run the agent with streaming response"""
@@ -138,19 +104,7 @@ class agent:
     def run_sync(self, payload):
         try:
             """Run the agent synchronously"""
-            agent = Agent(
-                model=self.model,
-                output_type=self.output_type,
-                system_prompt=self.system_prompt,
-                name=self.name,
-                model_settings=self.model_settings,
-                retries=self.retries,
-            )
-
-            # Add tools if provided
-            if self.tools:
-                for tool in self.tools:
-                    agent.tool(tool)
+            agent = self._agent()
 
             for i, load in enumerate(payload):
                 if isinstance(load, Image.Image):
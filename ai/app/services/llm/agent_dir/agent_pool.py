@@ -0,0 +1,148 @@
+import hashlib
+import importlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic_ai import Agent
+
+from config import AGENT_POOL_MAX_ITEMS
+
+# provider -> (model class, provider class); both accept an explicit API key,
+# so keys never have to go through os.environ.
+_PROVIDERS: Dict[str, Tuple[str, str]] = {
+    "google-gla": ("pydantic_ai.models.google:GoogleModel", "pydantic_ai.providers.google:GoogleProvider"),
+    "openai": ("pydantic_ai.models.openai:OpenAIModel", "pydantic_ai.providers.openai:OpenAIProvider"),
+    "deepseek": ("pydantic_ai.models.openai:OpenAIModel", "pydantic_ai.providers.deepseek:DeepSeekProvider"),
+    "anthropic": ("pydantic_ai.models.anthropic:AnthropicModel", "pydantic_ai.providers.anthropic:AnthropicProvider"),
+    "groq": ("pydantic_ai.models.groq:GroqModel", "pydantic_ai.providers.groq:GroqProvider"),
+    "mistral": ("pydantic_ai.models.mistral:MistralModel", "pydantic_ai.providers.mistral:MistralProvider"),
+    "cohere": ("pydantic_ai.models.cohere:CohereModel", "pydantic_ai.providers.cohere:CohereProvider"),
+}
+
+_lock = threading.Lock()
+_models: Dict[Tuple[str, str], Any] = {}
+_agents: "OrderedDict[Tuple, Agent]" = OrderedDict()
+_counters = {"models_created": 0, "agents_created": 0, "agent_hits": 0, "agent_evictions": 0}
+
+
+def _import(path: str) -> Any:
+    module, name = path.split(":")
+    return getattr(importlib.import_module(module), name)
+
+
+def _digest(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+def split_model_name(model: str) -> Tuple[str, str]:
+    """("provider", "model name") the way pydantic-ai infers it from a model string."""
+    if ":" in model:
+        provider, model_name = model.split(":", 1)
+    elif model.startswith(("gpt", "o1", "o3")):
+        provider, model_name = "openai", model
+    elif model.startswith("claude"):
+        provider, model_name = "anthropic", model
+    elif model.startswith("gemini"):
+        provider, model_name = "google-gla", model
+    else:
+        provider, model_name = "", model
+    return {"google": "google-gla", "gemini": "google-gla"}.get(provider, provider), model_name
+
+
+def _set_env_api_key(model: str, api_key: str) -> None:
+    """Fallback for providers without an explicit-key constructor above (e.g. Bedrock)."""
+    if model.startswith("bedrock:"):
+        # AWS Bedrock requires different credentials setup
+        os.environ["AWS_ACCESS_KEY_ID"] = api_key.split(":")[0] if ":" in api_key else api_key
+        os.environ["AWS_SECRET_ACCESS_KEY"] = api_key.split(":")[1] if ":" in api_key else ""
+    else:
+        os.environ["OPENAI_API_KEY"] = api_key
+
+
+def get_model(model: str, api_key: str) -> Any:
+    """
+    One model instance (and so one provider HTTP client with keep-alive
+    connections) per (model, API key) for the whole process.
+    """
+    key = (model, _digest(api_key or ""))
+    with _lock:
+        if key in _models:
+            return _models[key]
+        provider, model_name = split_model_name(model)
+        if provider in _PROVIDERS:
+            model_path, provider_path = _PROVIDERS[provider]
+            instance = _import(model_path)(
+                model_name, provider=_import(provider_path)(api_key=api_key)
+            )
+        else:
+            _set_env_api_key(model, api_key)
+            instance = model
+        _models[key] = instance
+        _counters["models_created"] += 1
+        return instance
+
+
+def get_agent(
+    model: str,
+    api_key: str,
+    output_type: Any,
+    system_prompt: str,
+    name: Optional[str] = None,
+    model_settings: Optional[Dict[str, Any]] = None,
+    retries: int = 3,
+    tools: Optional[List[Any]] = None,
+) -> Agent:
+    """
+    Process-wide Agent for this configuration, created on first use.
+
+    Keyed by model, API key hash, output type, system prompt hash, settings,
+    retries, name and tools; the least recently used agent is dropped past
+    AGENT_POOL_MAX_ITEMS. Agents are stateless between runs, so sharing them
+    across concurrent requests is safe.
+    """
+    key = (
+        model,
+        _digest(api_key or ""),
+        output_type,
+        _digest(system_prompt or ""),
+        json.dumps(model_settings or {}, sort_keys=True, default=str),
+        retries,
+        name,
+        tuple(tools or ()),
+    )
+    with _lock:
+        agent = _agents.get(key)
+        if agent is not None:
+            _agents.move_to_end(key)
+            _counters["agent_hits"] += 1
+            return agent
+
+    agent = Agent(
+        model=get_model(model, api_key),
+        output_type=output_type,
+        system_prompt=system_prompt,
+        name=name,
+        model_settings=model_settings,
+        retries=retries,
+    )
+    for tool in tools or []:
+        agent.tool(tool)
+
+    with _lock:
+        # Another request may have built the same agent meanwhile; keep the first
+        if key in _agents:
+            return _agents[key]
+        _agents[key] = agent
+        _counters["agents_created"] += 1
+        while len(_agents) > AGENT_POOL_MAX_ITEMS:
+            _agents.popitem(last=False)
+            _counters["agent_evictions"] += 1
+    return agent
+
+
+def stats() -> Dict[str, Any]:
+    with _lock:
+        return {"models": len(_models), "agents": len(_agents), **_counters}
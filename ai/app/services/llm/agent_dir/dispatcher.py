@@ -0,0 +1,246 @@
+import asyncio
+import email.utils
+import logging
+import random
+import re
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from PIL import Image
+
+from config import (
+    LLM_REQUESTS_PER_MINUTE,
+    LLM_TOKENS_PER_MINUTE,
+    LLM_MAX_CONCURRENCY,
+    LLM_MAX_RETRIES,
+    LLM_BACKOFF_BASE_SECONDS,
+    LLM_BACKOFF_MAX_SECONDS,
+    LLM_PROVIDER_LIMITS,
+)
+from services.llm.agent_dir.agent_pool import split_model_name
+
+logger = logging.getLogger(__name__)
+
+# Statuses worth retrying: rate limited, overloaded, or a transient upstream failure
+RETRYABLE_STATUSES = {408, 429, 500, 502, 503, 504}
+THROTTLE_STATUSES = {429, 503}
+# Rough token cost of an image input (Gemini bills 258 per image tile)
+IMAGE_TOKENS = 258
+_RESOURCE_EXHAUSTED_RE = re.compile(r"['\"]status['\"]?\s*[:=]\s*['\"]RESOURCE_EXHAUSTED['\"]")
+_RETRY_DELAY_RE = re.compile(r"retryDelay['\"]?\s*[:=]\s*['\"]?(\d+(?:\.\d+)?)s")
+
+
+class TokenBucket:
+    """Refills at rate units per second up to capacity; acquire() waits until enough are available."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float) -> None:
+        # Requests larger than the bucket would never fit; let them drain it instead
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            self._refill()
+            while self._tokens < amount:
+                await asyncio.sleep((amount - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= amount
+
+
+def estimate_tokens(payload: Any, system_prompt: str = "") -> int:
+    """Crude input-size estimate (4 characters per token, fixed cost per image)."""
+    tokens = len(system_prompt or "") // 4
+    for item in payload if isinstance(payload, list) else [payload]:
+        if isinstance(item, str):
+            tokens += len(item) // 4
+        elif isinstance(item, Image.Image) or hasattr(item, "media_type"):
+            tokens += IMAGE_TOKENS
+        else:
+            tokens += len(str(item)) // 4
+    return max(1, tokens)
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    """HTTP status of a provider error, read from the exception, never guessed from its message."""
+    for e in (error, error.__cause__, error.__context__):
+        if e is None:
+            continue
+        if isinstance(getattr(e, "status_code", None), int):
+            return e.status_code
+        response = getattr(e, "response", None)
+        if isinstance(getattr(response, "status_code", None), int):
+            return response.status_code
+    # Gemini quota errors can surface with only the JSON error payload as the message
+    if _RESOURCE_EXHAUSTED_RE.search(str(error)):
+        return 429
+    return None
+
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    """Seconds the provider asked us to wait, from a Retry-After header or a Gemini retryDelay."""
+    for e in (error, error.__cause__, error.__context__):
+        if e is None:
+            continue
+        headers = getattr(getattr(e, "response", None), "headers", None) or {}
+        value = headers.get("retry-after") if hasattr(headers, "get") else None
+        if value:
+            try:
+                return max(0.0, float(value))
+            except ValueError:
+                parsed = email.utils.parsedate_to_datetime(value)
+                if parsed is not None:
+                    return max(0.0, parsed.timestamp() - time.time())
+    match = _RETRY_DELAY_RE.search(str(error))
+    return float(match.group(1)) if match else None
+
+
+class ProviderDispatcher:
+    """
+    Admission control for one LLM provider.
+
+    Every call waits for a concurrency slot and for room in two token buckets
+    (requests per minute and estimated tokens per minute). The concurrency limit
+    adapts AIMD-style: +1/limit per success, halved on a 429/503. Retryable
+    failures back off exponentially with full jitter, or for as long as the
+    provider's Retry-After says, whichever is longer.
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        requests_per_minute: float,
+        tokens_per_minute: float,
+        max_concurrency: int,
+    ):
+        self.provider = provider
+        self.max_concurrency = max(1, max_concurrency)
+        self.limit = float(self.max_concurrency)
+        # Allow bursts of up to ten seconds' worth of budget
+        self._requests = TokenBucket(requests_per_minute / 60, requests_per_minute / 6)
+        self._tokens = TokenBucket(tokens_per_minute / 60, tokens_per_minute / 6)
+        self._slots: Optional[asyncio.Condition] = None
+        self._in_flight = 0
+        self._waiting = 0
+        self.max_waiting = 0
+        self.calls = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.retries = 0
+        self.throttled = 0
+        self._wait_ms_total = 0.0
+
+    async def _acquire_slot(self) -> None:
+        if self._slots is None:
+            self._slots = asyncio.Condition()
+        async with self._slots:
+            await self._slots.wait_for(lambda: self._in_flight < int(self.limit))
+            self._in_flight += 1
+
+    async def _release_slot(self) -> None:
+        async with self._slots:
+            self._in_flight -= 1
+            self._slots.notify_all()
+
+    def _on_success(self) -> None:
+        self.limit = min(float(self.max_concurrency), self.limit + 1.0 / self.limit)
+
+    def _on_throttle(self) -> None:
+        self.throttled += 1
+        self.limit = max(1.0, self.limit / 2)
+
+    async def call(self, fn: Callable[[], Awaitable[Any]], estimated_tokens: int = 1) -> Any:
+        """Runs fn() under the limits, retrying retryable failures; raises the last error."""
+        self.calls += 1
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            self._waiting += 1
+            self.max_waiting = max(self.max_waiting, self._waiting)
+            try:
+                await self._requests.acquire(1)
+                await self._tokens.acquire(estimated_tokens)
+                await self._acquire_slot()
+            finally:
+                self._waiting -= 1
+            self._wait_ms_total += (time.perf_counter() - start) * 1000
+
+            error: Optional[Exception] = None
+            try:
+                result = await fn()
+            except Exception as e:
+                error = e
+            finally:
+                # Free the slot before any backoff sleep
+                await self._release_slot()
+
+            if error is None:
+                self._on_success()
+                self.succeeded += 1
+                return result
+
+            status = _status_code(error)
+            if status in THROTTLE_STATUSES:
+                self._on_throttle()
+            attempt += 1
+            if status not in RETRYABLE_STATUSES or attempt > LLM_MAX_RETRIES:
+                self.failed += 1
+                raise error
+            backoff = random.uniform(
+                0, min(LLM_BACKOFF_MAX_SECONDS, LLM_BACKOFF_BASE_SECONDS * 2**attempt)
+            )
+            delay = max(backoff, _retry_after(error) or 0.0)
+            self.retries += 1
+            logger.warning(
+                f"{self.provider}: HTTP {status}, retry {attempt}/{LLM_MAX_RETRIES} in {delay:.1f}s"
+            )
+            await asyncio.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        admitted = self.succeeded + self.failed + self.retries
+        return {
+            "queue_depth": self._waiting,
+            "max_queue_depth": self.max_waiting,
+            "in_flight": self._in_flight,
+            "concurrency_limit": round(self.limit, 2),
+            "max_concurrency": self.max_concurrency,
+            "calls": self.calls,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "avg_wait_ms": round(self._wait_ms_total / admitted, 2) if admitted else 0.0,
+        }
+
+
+_dispatchers: Dict[str, ProviderDispatcher] = {}
+_dispatchers_lock = threading.Lock()
+
+
+def for_model(model: str) -> ProviderDispatcher:
+    """The process-wide dispatcher of the model's provider; limits come from config."""
+    provider = split_model_name(model)[0] or "default"
+    with _dispatchers_lock:
+        if provider not in _dispatchers:
+            limits = LLM_PROVIDER_LIMITS.get(provider, {})
+            _dispatchers[provider] = ProviderDispatcher(
+                provider,
+                requests_per_minute=limits.get("requests_per_minute", LLM_REQUESTS_PER_MINUTE),
+                tokens_per_minute=limits.get("tokens_per_minute", LLM_TOKENS_PER_MINUTE),
+                max_concurrency=limits.get("max_concurrency", LLM_MAX_CONCURRENCY),
+            )
+        return _dispatchers[provider]
+
+
+def stats() -> Dict[str, Any]:
+    with _dispatchers_lock:
+        return {provider: d.stats() for provider, d in _dispatchers.items()}
@@ -0,0 +1,66 @@
+import sys
+from collections import OrderedDict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+import pytest
+from pydantic import BaseModel
+
+from services.llm.agent_dir import agent_pool
+from services.llm.agent_dir.agent_pool import get_agent, get_model, split_model_name
+
+
+class Resume(BaseModel):
+    full_name: str
+
+
+@pytest.fixture(autouse=True)
+def empty_pool(monkeypatch):
+    monkeypatch.setattr(agent_pool, "_agents", OrderedDict())
+    monkeypatch.setattr(agent_pool, "_models", {})
+    # pydantic-ai's built-in "test" model has no key constructor, so the key goes to the env
+    monkeypatch.setenv("OPENAI_API_KEY", "unset")
+
+
+@pytest.mark.parametrize(
+    "model, expected",
+    [
+        ("gemini-2.0-flash", ("google-gla", "gemini-2.0-flash")),
+        ("google:gemini-2.5-pro", ("google-gla", "gemini-2.5-pro")),
+        ("gpt-4o", ("openai", "gpt-4o")),
+        ("claude-3-5-sonnet-latest", ("anthropic", "claude-3-5-sonnet-latest")),
+        ("groq:llama-3.3-70b", ("groq", "llama-3.3-70b")),
+        ("test", ("", "test")),
+    ],
+)
+def test_split_model_name(model, expected):
+    assert split_model_name(model) == expected
+
+
+def test_same_configuration_reuses_the_agent():
+    agent = get_agent("test", "key", Resume, "Extract the resume")
+
+    assert get_agent("test", "key", Resume, "Extract the resume") is agent
+    assert get_agent("test", "key", Resume, "Extract the job") is not agent
+    assert get_agent("test", "other key", Resume, "Extract the resume") is not agent
+    assert get_agent("test", "key", Resume, "Extract the resume", model_settings={"temperature": 0}) is not agent
+
+
+def test_model_is_shared_per_model_and_key():
+    assert get_model("test", "key") is get_model("test", "key")
+    assert agent_pool.stats()["models"] == 1
+
+
+def test_least_recently_used_agent_is_evicted(monkeypatch):
+    monkeypatch.setattr(agent_pool, "AGENT_POOL_MAX_ITEMS", 2)
+    first = get_agent("test", "key", Resume, "one")
+    get_agent("test", "key", Resume, "two")
+    get_agent("test", "key", Resume, "one")
+    evictions = agent_pool.stats()["agent_evictions"]
+
+    get_agent("test", "key", Resume, "three")
+
+    assert agent_pool.stats()["agents"] == 2
+    assert agent_pool.stats()["agent_evictions"] == evictions + 1
+    assert get_agent("test", "key", Resume, "one") is first
@@ -0,0 +1,173 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+import pytest
+
+from services.llm.agent_dir import dispatcher
+from services.llm.agent_dir.dispatcher import ProviderDispatcher, TokenBucket
+
+
+class ProviderError(Exception):
+    def __init__(self, message: str, status_code=None, response=None):
+        super().__init__(message)
+        if status_code is not None:
+            self.status_code = status_code
+        self.response = response
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(dispatcher, "LLM_BACKOFF_BASE_SECONDS", 0.0)
+    monkeypatch.setattr(dispatcher, "LLM_BACKOFF_MAX_SECONDS", 0.0)
+    monkeypatch.setattr(dispatcher, "LLM_MAX_RETRIES", 2)
+
+
+def _dispatcher(max_concurrency: int = 4) -> ProviderDispatcher:
+    # Budgets large enough that the token buckets never make a test wait
+    return ProviderDispatcher("test", 600_000, 600_000_000, max_concurrency)
+
+
+def test_token_bucket_bursts_up_to_capacity_then_waits_for_refill():
+    async def run():
+        bucket = TokenBucket(rate=50, capacity=2)
+        start = time.monotonic()
+        await bucket.acquire(1)
+        await bucket.acquire(1)
+        burst = time.monotonic() - start
+        await bucket.acquire(1)
+        return burst, time.monotonic() - start
+
+    burst, total = asyncio.run(run())
+
+    assert burst < 0.01
+    # One unit refills in 1 / rate = 20 ms
+    assert total >= 0.015
+
+
+def test_token_bucket_caps_oversized_requests_at_capacity():
+    async def run():
+        bucket = TokenBucket(rate=1, capacity=5)
+        await asyncio.wait_for(bucket.acquire(50), timeout=1)
+        return bucket._tokens
+
+    assert asyncio.run(run()) == pytest.approx(0.0, abs=0.01)
+
+
+def test_success_grows_the_limit_additively_up_to_max():
+    d = _dispatcher(max_concurrency=4)
+    d.limit = 2.0
+
+    d._on_success()
+    assert d.limit == pytest.approx(2.5)
+    for _ in range(50):
+        d._on_success()
+    assert d.limit == 4.0
+
+
+def test_throttle_halves_the_limit_down_to_one():
+    d = _dispatcher(max_concurrency=8)
+
+    d._on_throttle()
+    assert d.limit == 4.0
+    for _ in range(5):
+        d._on_throttle()
+    assert d.limit == 1.0
+    assert d.throttled == 6
+
+
+def test_throttled_call_is_retried_and_halves_the_limit():
+    d = _dispatcher(max_concurrency=8)
+    outcomes = [ProviderError("quota", status_code=429), "parsed"]
+
+    async def fn():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    assert asyncio.run(d.call(fn)) == "parsed"
+    stats = d.stats()
+    assert (stats["retries"], stats["throttled"], stats["succeeded"]) == (1, 1, 1)
+    assert 4.0 < d.limit < 8.0
+
+
+def test_retryable_failures_give_up_after_max_retries():
+    d = _dispatcher()
+    attempts = []
+
+    async def fn():
+        attempts.append(1)
+        raise ProviderError("overloaded", response=SimpleNamespace(status_code=503, headers={}))
+
+    with pytest.raises(ProviderError):
+        asyncio.run(d.call(fn))
+    assert len(attempts) == 3
+    assert (d.stats()["failed"], d.stats()["retries"]) == (1, 2)
+
+
+def test_non_retryable_failure_is_raised_at_once():
+    d = _dispatcher(max_concurrency=4)
+    attempts = []
+
+    async def fn():
+        attempts.append(1)
+        raise ProviderError("bad request", status_code=400)
+
+    with pytest.raises(ProviderError):
+        asyncio.run(d.call(fn))
+    assert len(attempts) == 1
+    assert d.limit == 4.0
+
+
+def test_in_flight_calls_never_exceed_the_limit():
+    d = _dispatcher(max_concurrency=2)
+    in_flight, peak = 0, 0
+
+    async def fn():
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+
+    async def run():
+        await asyncio.gather(*(d.call(fn) for _ in range(6)))
+
+    asyncio.run(run())
+    assert peak == 2
+    assert d.stats()["max_queue_depth"] >= 4
+
+
+def test_status_code_ignores_numbers_in_the_message():
+    assert dispatcher._status_code(ProviderError("request 429 took 503 ms")) is None
+
+
+def test_status_code_reads_the_gemini_quota_payload():
+    error = ProviderError(
+        "429 RESOURCE_EXHAUSTED. {'error': {'code': 429, 'status': 'RESOURCE_EXHAUSTED', "
+        "'details': [{'retryDelay': '7s'}]}}"
+    )
+
+    assert dispatcher._status_code(error) == 429
+    assert dispatcher._retry_after(error) == 7.0
+
+
+def test_status_code_follows_the_cause_chain():
+    try:
+        try:
+            raise ProviderError("upstream", response=SimpleNamespace(status_code=502))
+        except ProviderError as e:
+            raise RuntimeError("agent failed") from e
+    except RuntimeError as wrapped:
+        assert dispatcher._status_code(wrapped) == 502
+
+
+def test_retry_after_header_in_seconds():
+    error = ProviderError("slow down", response=SimpleNamespace(headers={"retry-after": "3"}))
+
+    assert dispatcher._retry_after(error) == 3.0
@@ -0,0 +1,133 @@
+"""
+Uploaded documents kept in memory for the parser pipeline.
+
+An upload is read once into bytes and handed to PyMuPDF's stream API (PDFs)
+or to the agent directly (images). Only uploads above
+UPLOAD_SPOOL_THRESHOLD_BYTES are spooled to a temp file, which close() removes.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import aiofiles
+from fastapi import UploadFile
+
+from config import UPLOAD_SPOOL_THRESHOLD_BYTES
+
+READ_CHUNK_BYTES = 1024 * 1024
+
+# Leading bytes -> media type of the image formats the agent accepts
+_IMAGE_SIGNATURES = {
+    b"\x89PNG\r\n\x1a\n": "image/png",
+    b"\xff\xd8\xff": "image/jpeg",
+    b"GIF87a": "image/gif",
+    b"GIF89a": "image/gif",
+}
+
+_lock = threading.Lock()
+_counters = {"in_memory": 0, "spooled": 0, "bytes_in_memory": 0, "bytes_spooled": 0}
+
+
+@dataclass
+class Document:
+    """One uploaded file: its bytes, or the path it was spooled to when too large."""
+
+    filename: str
+    digest: str = ""  # sha256 of the content
+    data: Optional[bytes] = None
+    path: Optional[str] = None
+    head: bytes = b""
+
+    @property
+    def source(self):
+        """What pdf_worker accepts: the bytes, or the spooled file's path."""
+        return self.data if self.data is not None else self.path
+
+    @property
+    def is_pdf(self) -> bool:
+        return self.head.startswith(b"%PDF") or self.filename.lower().endswith(".pdf")
+
+    @property
+    def image_media_type(self) -> Optional[str]:
+        for signature, media_type in _IMAGE_SIGNATURES.items():
+            if self.head.startswith(signature):
+                return media_type
+        if self.head[:4] == b"RIFF" and self.head[8:12] == b"WEBP":
+            return "image/webp"
+        return None
+
+    def read_bytes(self) -> bytes:
+        if self.data is not None:
+            return self.data
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def close(self) -> None:
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+        self.path = None
+
+
+async def read_upload(file: UploadFile) -> Document:
+    """Reads an upload into memory, switching to a temp file once it passes the threshold."""
+    filename = os.path.basename(file.filename or "")
+    chunks: List[bytes] = []
+    head = b""
+    digest = hashlib.sha256()
+    size = 0
+    path = None
+    spool = None
+    try:
+        while True:
+            chunk = await file.read(READ_CHUNK_BYTES)
+            if not chunk:
+                break
+            if len(head) < 16:
+                head = (head + chunk)[:16]
+            digest.update(chunk)
+            size += len(chunk)
+            if spool is None and size > UPLOAD_SPOOL_THRESHOLD_BYTES:
+                fd, path = tempfile.mkstemp(suffix=os.path.splitext(filename)[1])
+                os.close(fd)
+                spool = await aiofiles.open(path, "wb")
+                for buffered in chunks:
+                    await spool.write(buffered)
+                chunks = []
+            if spool is not None:
+                await spool.write(chunk)
+            else:
+                chunks.append(chunk)
+    except Exception:
+        if spool is not None:
+            await spool.close()
+        if path:
+            os.remove(path)
+        raise
+
+    if spool is not None:
+        await spool.close()
+        with _lock:
+            _counters["spooled"] += 1
+            _counters["bytes_spooled"] += size
+        return Document(filename=filename, digest=digest.hexdigest(), path=path, head=head)
+
+    with _lock:
+        _counters["in_memory"] += 1
+        _counters["bytes_in_memory"] += size
+    return Document(
+        filename=filename, digest=digest.hexdigest(), data=b"".join(chunks), head=head
+    )
+
+
+def close_all(documents: List[Document]) -> None:
+    for document in documents:
+        document.close()
+
+
+def stats() -> Dict:
+    with _lock:
+        return dict(_counters)
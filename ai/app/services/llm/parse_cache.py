@@ -0,0 +1,191 @@
+import copy
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from services.llm.documents import Document
+
+logger = logging.getLogger(__name__)
+
+# Bump to invalidate every stored result (e.g. after changing how inputs are preprocessed)
+CACHE_VERSION = "1"
+
+
+class CacheMode(str, Enum):
+    use = "use"  # return a stored result when there is one
+    bypass = "bypass"  # always call the LLM, then replace the stored result
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class ParseResultCache:
+    """
+    Two-level (memory + disk) cache of structured parse results.
+
+    Entries are keyed by the hashes of every input (file bytes or text, in
+    order) together with the schema hash, system prompt hash and model, so the
+    same resume re-uploaded for another job, or re-sent by a retried batch,
+    is answered without an LLM call. Results are stored as JSON files; the
+    least recently used files are removed once they exceed max_bytes. The size
+    of every file is tracked in memory (scanned once at start), so a store
+    never re-lists the directory.
+
+    get() and put() hand out and keep deep copies, so callers may modify the
+    results. Both touch the disk; async callers should run them in a thread.
+    """
+
+    def __init__(self, cache_dir: str, max_items: int, max_bytes: int):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_items = max(1, max_items)
+        self.max_bytes = max(1, max_bytes)
+
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, Dict]" = OrderedDict()
+        # key -> file size, least recently used first
+        self._files: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_bytes = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.stores = 0
+        self._hit_ms_total = 0.0
+        # LLM time the stored results originally took, summed over hits
+        self._llm_ms_saved = 0.0
+        self._scan_files()
+
+    @staticmethod
+    def key(
+        inputs: List[Any], schema_hash: str, system_prompt: Optional[str], model: str
+    ) -> Optional[str]:
+        """Hash of the request, or None when an input cannot be hashed (nothing is cached)."""
+        parts = [CACHE_VERSION, schema_hash, _sha256((system_prompt or "").encode("utf-8")), model]
+        for item in inputs:
+            if isinstance(item, Document):
+                parts.append(f"file:{item.digest}")
+            elif isinstance(item, str):
+                parts.append(f"text:{_sha256(item.encode('utf-8'))}")
+            else:
+                return None
+        return _sha256("\x00".join(parts).encode("utf-8"))
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _scan_files(self) -> None:
+        files = []
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            files.append((st.st_mtime, path.stem, st.st_size))
+        for _, key, size in sorted(files):
+            self._files[key] = size
+            self._disk_bytes += size
+
+    def get(self, key: str) -> Optional[Any]:
+        start = time.perf_counter()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+        if entry is None:
+            entry = self._load(key)
+            with self._lock:
+                if entry is None:
+                    self.misses += 1
+                    return None
+                self.disk_hits += 1
+                self._remember(key, entry)
+        result = copy.deepcopy(entry["result"])
+        with self._lock:
+            self._hit_ms_total += (time.perf_counter() - start) * 1000
+            self._llm_ms_saved += entry.get("llm_ms", 0.0)
+        return result
+
+    def put(self, key: str, result: Any, llm_ms: float = 0.0) -> None:
+        entry = {"result": copy.deepcopy(result), "llm_ms": round(llm_ms, 1)}
+        with self._lock:
+            self._remember(key, entry)
+            self.stores += 1
+        try:
+            self._save(key, entry)
+        except Exception as e:
+            logger.error(f"Failed to persist parse result {key}: {e}")
+
+    def record_bypass(self, count: int = 1) -> None:
+        with self._lock:
+            self.bypassed += count
+
+    def _remember(self, key: str, entry: Dict) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    def _load(self, key: str) -> Optional[Dict]:
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+            os.utime(path)  # recency survives restarts through the mtime
+            with self._lock:
+                if key in self._files:
+                    self._files.move_to_end(key)
+            return entry
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable parse result {path}: {e}")
+            return None
+
+    def _save(self, key: str, entry: Dict) -> None:
+        tmp_path = self.cache_dir / f"{key}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(entry, f, default=str)
+        size = tmp_path.stat().st_size
+        os.replace(tmp_path, self._path(key))
+        with self._lock:
+            self._disk_bytes += size - self._files.pop(key, 0)
+            self._files[key] = size
+            evicted = []
+            while self._disk_bytes > self.max_bytes and len(self._files) > 1:
+                old_key, old_size = self._files.popitem(last=False)
+                self._disk_bytes -= old_size
+                evicted.append(old_key)
+        for old_key in evicted:
+            try:
+                self._path(old_key).unlink()
+            except OSError:
+                pass
+
+    def stats(self) -> Dict:
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "memory_entries": len(self._memory),
+                "disk_entries": len(self._files),
+                "disk_bytes": self._disk_bytes,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "bypassed": self.bypassed,
+                "stores": self.stores,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "avg_hit_ms": round(self._hit_ms_total / hits, 2) if hits else 0.0,
+                "llm_calls_avoided": hits,
+                "llm_seconds_saved": round(self._llm_ms_saved / 1000, 1),
+            }
@@ -0,0 +1,140 @@
+"""
+PDF text extraction and page rendering in a process pool.
+
+The worker functions only need PyMuPDF; the pool is started from a forkserver
+that preloads just this module, so worker processes never import the app (or
+its models) and never inherit the server's threads.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
+
+import pymupdf as fitz
+
+from config import PDF_WORKERS, PDF_RENDER_ZOOM
+
+logger = logging.getLogger(__name__)
+
+
+# A PDF is either a path on disk or its bytes in memory
+PdfSource = Union[str, bytes]
+
+
+# ---------- worker functions (run in the pool) ----------
+def _open(source: PdfSource) -> "fitz.Document":
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return fitz.open(stream=source, filetype="pdf")
+    return fitz.open(source)
+
+
+def extract_text(source: PdfSource) -> Tuple[str, int]:
+    """(text of every page, page count)"""
+    with _open(source) as doc:
+        return "".join(page.get_text() for page in doc), len(doc)
+
+
+def render_pages(source: PdfSource, start: int, stop: int, zoom: float) -> List[bytes]:
+    """Pages [start, stop) rasterized to PNG bytes."""
+    with _open(source) as doc:
+        matrix = fitz.Matrix(zoom, zoom)
+        return [
+            doc.load_page(n).get_pixmap(matrix=matrix).tobytes("png")
+            for n in range(start, stop)
+        ]
+
+
+# ---------- pool ----------
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stage_totals: Dict[str, Dict[str, float]] = {}
+
+
+def _workers() -> int:
+    return PDF_WORKERS or os.cpu_count() or 1
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            workers = _workers()
+            if "forkserver" in multiprocessing.get_all_start_methods():
+                context = multiprocessing.get_context("forkserver")
+                context.set_forkserver_preload([__name__])
+            else:
+                context = multiprocessing.get_context("spawn")
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+            logger.info(f"Started PDF process pool with {workers} workers")
+        return _pool
+
+
+def record_stage(stage: str, ms: float) -> None:
+    with _stats_lock:
+        totals = _stage_totals.setdefault(stage, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+        totals["count"] += 1
+        totals["total_ms"] += ms
+        totals["max_ms"] = max(totals["max_ms"], ms)
+
+
+async def _run(fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(_get_pool(), fn, *args)
+
+
+async def extract_text_async(source: PdfSource) -> Tuple[str, int]:
+    start = time.perf_counter()
+    try:
+        return await _run(extract_text, source)
+    finally:
+        record_stage("extract_text", (time.perf_counter() - start) * 1000)
+
+
+async def render_pages_async(source: PdfSource, page_count: int) -> List[bytes]:
+    """
+    All pages rendered to PNG in parallel across the pool, in page order.
+
+    Pages are split into one contiguous range per worker, so an in-memory PDF
+    is sent to each worker once rather than once per page.
+    """
+    start = time.perf_counter()
+    chunk = max(1, -(-page_count // _workers()))
+    try:
+        ranges = await asyncio.gather(
+            *(
+                _run(render_pages, source, first, min(first + chunk, page_count), PDF_RENDER_ZOOM)
+                for first in range(0, page_count, chunk)
+            )
+        )
+        return [png for pages in ranges for png in pages]
+    finally:
+        record_stage("render_pages", (time.perf_counter() - start) * 1000)
+
+
+def stats() -> Dict:
+    with _stats_lock:
+        return {
+            "workers": _workers(),
+            "started": _pool is not None,
+            "stages": {
+                stage: {
+                    "count": int(t["count"]),
+                    "avg_ms": round(t["total_ms"] / t["count"], 1) if t["count"] else 0.0,
+                    "max_ms": round(t["max_ms"], 1),
+                }
+                for stage, t in _stage_totals.items()
+            },
+        }
+
+
+def shutdown() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
@@ -0,0 +1,68 @@
+import asyncio
+import hashlib
+import io
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import pytest
+from fastapi import UploadFile
+
+from services.llm import documents
+from services.llm.documents import Document, read_upload
+
+PDF = b"%PDF-1.7\n" + b"x" * 100
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 40
+
+
+def _read(data: bytes, filename: str = "cv.pdf") -> Document:
+    return asyncio.run(read_upload(UploadFile(file=io.BytesIO(data), filename=filename)))
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch):
+    # Several reads per upload, so head and digest are built across chunks
+    monkeypatch.setattr(documents, "READ_CHUNK_BYTES", 4)
+    monkeypatch.setattr(documents, "UPLOAD_SPOOL_THRESHOLD_BYTES", 64)
+
+
+def test_small_upload_stays_in_memory():
+    before = documents.stats()["in_memory"]
+
+    document = _read(PDF[:50])
+
+    assert document.data == PDF[:50]
+    assert document.path is None
+    assert document.source is document.data
+    assert document.digest == hashlib.sha256(PDF[:50]).hexdigest()
+    assert document.head == PDF[:16]
+    assert documents.stats()["in_memory"] == before + 1
+
+
+def test_large_upload_is_spooled_and_removed_on_close():
+    before = documents.stats()["spooled"]
+
+    document = _read(PDF)
+
+    assert document.data is None
+    assert os.path.exists(document.path)
+    assert document.read_bytes() == PDF
+    assert document.digest == hashlib.sha256(PDF).hexdigest()
+    assert documents.stats()["spooled"] == before + 1
+    path = document.path
+    document.close()
+    assert not os.path.exists(path)
+
+
+def test_filename_is_stripped_of_directories():
+    assert _read(PDF[:20], filename="../../etc/cv.pdf").filename == "cv.pdf"
+
+
+def test_type_is_detected_from_content():
+    pdf = _read(PDF[:20], filename="upload.bin")
+    png = _read(PNG, filename="scan.pdf.png")
+
+    assert pdf.is_pdf and pdf.image_media_type is None
+    assert not png.is_pdf and png.image_media_type == "image/png"
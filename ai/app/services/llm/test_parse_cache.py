@@ -0,0 +1,99 @@
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from services.llm.documents import Document
+from services.llm.parse_cache import ParseResultCache
+
+RESULT = {"full_name": "Jane Doe", "skills": [{"name": "Python"}]}
+
+
+def _key(*inputs, schema_hash="schema", system_prompt="prompt", model="gemini-2.0-flash"):
+    return ParseResultCache.key(list(inputs), schema_hash, system_prompt, model)
+
+
+def test_key_depends_on_every_part_of_the_request():
+    resume = Document(filename="cv.pdf", digest="abc")
+    base = _key(resume, "extra text")
+
+    assert base == _key(Document(filename="renamed.pdf", digest="abc"), "extra text")
+    assert base != _key(Document(filename="cv.pdf", digest="abd"), "extra text")
+    assert base != _key(resume, "other text")
+    assert base != _key("extra text", resume)
+    assert base != _key(resume, "extra text", schema_hash="other")
+    assert base != _key(resume, "extra text", system_prompt="other")
+    assert base != _key(resume, "extra text", model="gemini-2.5-pro")
+
+
+def test_key_is_none_for_unhashable_inputs():
+    assert _key("text", object()) is None
+
+
+def test_results_are_copies(tmp_path):
+    cache = ParseResultCache(str(tmp_path), max_items=4, max_bytes=1 << 20)
+    key = _key("resume text")
+
+    result = json.loads(json.dumps(RESULT))
+    cache.put(key, result)
+    result["full_name"] = "changed after put"
+    hit = cache.get(key)
+    hit["skills"].append({"name": "changed after get"})
+
+    assert cache.get(key) == RESULT
+
+
+def test_disk_entries_survive_a_restart(tmp_path):
+    key = _key("resume text")
+    ParseResultCache(str(tmp_path), max_items=4, max_bytes=1 << 20).put(key, RESULT, llm_ms=1500)
+
+    cache = ParseResultCache(str(tmp_path), max_items=4, max_bytes=1 << 20)
+
+    assert cache.get(key) == RESULT
+    stats = cache.stats()
+    assert (stats["disk_hits"], stats["memory_hits"], stats["disk_entries"]) == (1, 0, 1)
+    assert stats["llm_seconds_saved"] == 1.5
+
+
+def test_memory_keeps_the_most_recently_used_items(tmp_path):
+    cache = ParseResultCache(str(tmp_path), max_items=2, max_bytes=1 << 20)
+    keys = [_key(f"resume {i}") for i in range(3)]
+
+    cache.put(keys[0], RESULT)
+    cache.put(keys[1], RESULT)
+    cache.get(keys[0])
+    cache.put(keys[2], RESULT)
+
+    assert cache.stats()["memory_entries"] == 2
+    cache.get(keys[0])
+    cache.get(keys[1])
+    stats = cache.stats()
+    assert (stats["memory_hits"], stats["disk_hits"]) == (2, 1)
+
+
+def test_disk_evicts_least_recently_used_files_over_max_bytes(tmp_path):
+    entry_bytes = len(json.dumps({"result": RESULT, "llm_ms": 0.0}))
+    cache = ParseResultCache(str(tmp_path), max_items=1, max_bytes=2 * entry_bytes)
+    keys = [_key(f"resume {i}") for i in range(3)]
+
+    cache.put(keys[0], RESULT)
+    cache.put(keys[1], RESULT)
+    # Read keys[0] back from disk so keys[1] becomes the oldest file
+    cache.get(keys[0])
+    cache.put(keys[2], RESULT)
+
+    assert sorted(p.stem for p in tmp_path.glob("*.json")) == sorted([keys[0], keys[2]])
+    stats = cache.stats()
+    assert stats["disk_entries"] == 2
+    assert stats["disk_bytes"] == sum(p.stat().st_size for p in tmp_path.glob("*.json"))
+
+
+def test_miss_and_bypass_are_counted(tmp_path):
+    cache = ParseResultCache(str(tmp_path), max_items=4, max_bytes=1 << 20)
+
+    assert cache.get(_key("never stored")) is None
+    cache.record_bypass(3)
+
+    stats = cache.stats()
+    assert (stats["misses"], stats["bypassed"], stats["hit_rate"]) == (1, 3, 0.0)
@@ -0,0 +1,63 @@
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import pymupdf as fitz
+import pytest
+
+from services.llm import pdf_worker
+
+PAGES = ["First page: Python developer", "Second page: Docker, Kubernetes", "Third page: references"]
+
+
+@pytest.fixture(scope="module")
+def pdf_bytes() -> bytes:
+    doc = fitz.open()
+    for text in PAGES:
+        doc.new_page().insert_text((72, 72), text)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+@pytest.fixture(scope="module", autouse=True)
+def pool():
+    yield
+    pdf_worker.shutdown()
+
+
+def test_extract_text_from_bytes_and_path(pdf_bytes, tmp_path):
+    path = tmp_path / "cv.pdf"
+    path.write_bytes(pdf_bytes)
+
+    from_bytes = asyncio.run(pdf_worker.extract_text_async(pdf_bytes))
+    from_path = asyncio.run(pdf_worker.extract_text_async(str(path)))
+
+    text, page_count = from_bytes
+    assert from_path == from_bytes
+    assert page_count == len(PAGES)
+    assert [text.index(page) for page in PAGES] == sorted(text.index(page) for page in PAGES)
+
+
+def test_render_pages_keeps_page_order(pdf_bytes, monkeypatch):
+    # More pages than workers, so each worker renders a range
+    monkeypatch.setattr(pdf_worker, "_workers", lambda: 2)
+
+    pages = asyncio.run(pdf_worker.render_pages_async(pdf_bytes, len(PAGES)))
+
+    assert len(pages) == len(PAGES)
+    assert all(png.startswith(b"\x89PNG") for png in pages)
+    zoom = pdf_worker.PDF_RENDER_ZOOM
+    assert pages == [pdf_worker.render_pages(pdf_bytes, n, n + 1, zoom)[0] for n in range(len(PAGES))]
+
+
+def test_stages_are_recorded(pdf_bytes):
+    before = pdf_worker.stats()["stages"].get("extract_text", {}).get("count", 0)
+
+    asyncio.run(pdf_worker.extract_text_async(pdf_bytes))
+
+    stats = pdf_worker.stats()
+    assert stats["started"]
+    assert stats["stages"]["extract_text"]["count"] == before + 1
@@ -0,0 +1,180 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# sha256 digest stored next to each row
+KEY_BYTES = 32
+
+
+class EmbeddingCache:
+    """
+    Disk-backed, content-addressed cache of sentence embeddings.
+
+    Vectors live in a fixed-size memory-mapped float16 file sized from a byte
+    budget. A second memory-mapped file stores, per row, the 32-byte key (hash
+    of model name + normalized text) the row holds, and the index is rebuilt
+    from it on start, so the cache survives process restarts without ever
+    rewriting an index. When the file is full the least recently used row is
+    overwritten: its key is cleared first, then the vector written, then the
+    new key, so a crash mid-write leaves an empty row, never a wrong vector.
+    Recency order is not persisted; after a restart rows age out in row order.
+    """
+
+    def __init__(self, cache_dir: str, model_name: str, dim: int, max_bytes: int):
+        self.model_name = model_name
+        self.dim = dim
+        self.capacity = max(
+            1, max_bytes // (dim * np.dtype(np.float16).itemsize + KEY_BYTES)
+        )
+
+        cache_path = Path(cache_dir)
+        cache_path.mkdir(parents=True, exist_ok=True)
+        slug = model_name.replace("/", "__")
+        self._vectors_path = cache_path / f"{slug}.f16"
+        self._keys_path = cache_path / f"{slug}.keys"
+        self._meta_path = cache_path / f"{slug}.meta.json"
+
+        self._lock = threading.Lock()
+        self._rows: "OrderedDict[str, int]" = OrderedDict()
+        self._free_rows: List[int] = []
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._last_flush = time.monotonic()
+
+        self._vectors, self._keys = self._open()
+
+    # ---------- persistence ----------
+    def _open(self) -> Tuple[np.memmap, np.memmap]:
+        vector_shape = (self.capacity, self.dim)
+        key_shape = (self.capacity, KEY_BYTES)
+        if (
+            self._meta_matches()
+            and self._vectors_path.exists()
+            and self._vectors_path.stat().st_size
+            == self.capacity * self.dim * np.dtype(np.float16).itemsize
+            and self._keys_path.exists()
+            and self._keys_path.stat().st_size == self.capacity * KEY_BYTES
+        ):
+            vectors = np.memmap(self._vectors_path, dtype=np.float16, mode="r+", shape=vector_shape)
+            keys = np.memmap(self._keys_path, dtype=np.uint8, mode="r+", shape=key_shape)
+            used = np.flatnonzero(keys.any(axis=1))
+            for row in used:
+                self._rows[bytes(keys[row]).hex()] = int(row)
+            used_set = set(used.tolist())
+            self._free_rows = [r for r in range(self.capacity - 1, -1, -1) if r not in used_set]
+            logger.info(
+                f"Loaded embedding cache with {len(self._rows)} entries from {self._vectors_path}"
+            )
+            return vectors, keys
+
+        # Missing, corrupt, or built for another model/budget: start fresh.
+        self._free_rows = list(range(self.capacity - 1, -1, -1))
+        vectors = np.memmap(self._vectors_path, dtype=np.float16, mode="w+", shape=vector_shape)
+        keys = np.memmap(self._keys_path, dtype=np.uint8, mode="w+", shape=key_shape)
+        tmp_path = self._meta_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"model_name": self.model_name, "dim": self.dim, "capacity": self.capacity}, f)
+        os.replace(tmp_path, self._meta_path)
+        return vectors, keys
+
+    def _meta_matches(self) -> bool:
+        if not self._meta_path.exists():
+            return False
+        try:
+            with open(self._meta_path, "r") as f:
+                meta = json.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable embedding cache metadata: {e}")
+            return False
+        return (
+            meta.get("model_name") == self.model_name
+            and meta.get("dim") == self.dim
+            and meta.get("capacity") == self.capacity
+        )
+
+    def flush(self) -> None:
+        """Write dirty pages of both memory maps to disk."""
+        self._vectors.flush()
+        self._keys.flush()
+        self._last_flush = time.monotonic()
+
+    def maybe_flush(self, interval_seconds: float) -> None:
+        """flush() if the last one was more than interval_seconds ago."""
+        if time.monotonic() - self._last_flush >= interval_seconds:
+            self.flush()
+
+    # ---------- lookups ----------
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        return " ".join(str(text).split())
+
+    def key(self, text: str) -> str:
+        payload = f"{self.model_name}\x00{self.normalize_text(text)}".encode("utf-8")
+        return hashlib.sha256(payload).hexdigest()
+
+    def get_many(self, texts: List[str]) -> Tuple[Dict[int, np.ndarray], List[int]]:
+        """
+        Look up many texts at once.
+
+        Returns:
+            (found, missing) where found maps input position -> float32 vector and
+            missing lists the input positions that have to be embedded.
+        """
+        found: Dict[int, np.ndarray] = {}
+        missing: List[int] = []
+        with self._lock:
+            for i, text in enumerate(texts):
+                key = self.key(text)
+                row = self._rows.get(key)
+                if row is None:
+                    missing.append(i)
+                    self.misses += 1
+                    continue
+                self._rows.move_to_end(key)
+                found[i] = np.asarray(self._vectors[row], dtype=np.float32)
+                self.hits += 1
+        return found, missing
+
+    def put_many(self, texts: List[str], vectors: np.ndarray) -> None:
+        with self._lock:
+            for text, vector in zip(texts, vectors):
+                key = self.key(text)
+                row = self._rows.get(key)
+                if row is None:
+                    if self._free_rows:
+                        row = self._free_rows.pop()
+                    else:
+                        _, row = self._rows.popitem(last=False)
+                        self.evictions += 1
+                    self._rows[key] = row
+                else:
+                    self._rows.move_to_end(key)
+                # Invalidate the row before rewriting it (see class docstring)
+                self._keys[row] = 0
+                self._vectors[row] = vector.astype(np.float16)
+                self._keys[row] = np.frombuffer(bytes.fromhex(key), dtype=np.uint8)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "model_name": self.model_name,
+                "entries": len(self._rows),
+                "capacity": self.capacity,
+                "bytes": self.capacity * (self.dim * np.dtype(np.float16).itemsize + KEY_BYTES),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
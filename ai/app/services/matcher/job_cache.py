@@ -0,0 +1,125 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_ARRAY_FIELDS = ("skills_embedding", "full_text_embedding")
+
+
+class JobDataCache:
+    """
+    Two-level (memory + disk) cache of prepared job data.
+
+    Entries are keyed by a hash of the canonical job payload together with the
+    model versions that produced them, so editing a job or swapping a model
+    simply yields a new key and the stale entry ages out.
+    """
+
+    def __init__(self, cache_dir: str, max_items: int, max_files: int):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_items = max(1, max_items)
+        self.max_files = max(1, max_files)
+
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, Dict]" = OrderedDict()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(job: Dict, *versions: str) -> str:
+        """Hash of the canonical JSON of the job payload and the model versions."""
+        canonical = json.dumps(job, sort_keys=True, default=str, separators=(",", ":"))
+        payload = "\x00".join([canonical, *versions]).encode("utf-8")
+        return hashlib.sha256(payload).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.npz"
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return self._memory[key]
+
+        job_data = self._load(key)
+        with self._lock:
+            if job_data is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, job_data)
+        return job_data
+
+    def put(self, key: str, job_data: Dict) -> None:
+        with self._lock:
+            self._remember(key, job_data)
+        try:
+            self._save(key, job_data)
+        except Exception as e:
+            logger.error(f"Failed to persist prepared job {key}: {e}")
+
+    def _remember(self, key: str, job_data: Dict) -> None:
+        self._memory[key] = job_data
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    def _load(self, key: str) -> Optional[Dict]:
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                job_data: Dict[str, Any] = json.loads(str(data["meta"]))
+                for field in _ARRAY_FIELDS:
+                    job_data[field] = data[field].astype(np.float32)
+            os.utime(path)  # mark as recently used for disk eviction
+            return job_data
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable prepared job {path}: {e}")
+            return None
+
+    def _save(self, key: str, job_data: Dict) -> None:
+        meta = {k: v for k, v in job_data.items() if k not in _ARRAY_FIELDS}
+        tmp_path = self.cache_dir / f"{key}.tmp.npz"
+        np.savez(
+            tmp_path,
+            meta=np.array(json.dumps(meta)),
+            **{field: np.asarray(job_data[field]) for field in _ARRAY_FIELDS},
+        )
+        os.replace(tmp_path, self._path(key))
+        self._evict_files()
+
+    def _evict_files(self) -> None:
+        files = list(self.cache_dir.glob("*.npz"))
+        if len(files) <= self.max_files:
+            return
+        files.sort(key=lambda p: p.stat().st_mtime)
+        for path in files[: len(files) - self.max_files]:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            hits = self.memory_hits + self.disk_hits
+            return {
+                "memory_entries": len(self._memory),
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            }
@@ -1,5 +1,7 @@
+import asyncio
 import numpy as np
-from typing import List, Dict, Tuple, Optional
+from enum import Enum
+from typing import AsyncIterator, List, Dict, Tuple, Optional
 import sys
 from pathlib import Path
 import traceback
@@ -8,15 +10,59 @@ import traceback
 # sys.path.insert(0, str(project_root))
 
 from services.skills_module.ner_skills import skill_ner
-from sentence_transformers import SentenceTransformer
 import logging
 from utils import render_model
 from services.llm.llm_agent import LLM
 from pydantic import BaseModel, Field
+from services.matcher.embedding_cache import EmbeddingCache
+from services.matcher.job_cache import JobDataCache
+from services.matcher.worker_pool import WorkerPool
+from services.inference import (
+    LazyModel,
+    MicroBatcher,
+    load_embedding_model,
+    model_version,
+    set_torch_threads,
+)
+from services.matcher import scoring
+from config import (
+    EMBEDDING_MODEL_NAME,
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_MAX_WAIT_MS,
+    EMBEDDING_BACKEND,
+    EMBEDDING_CACHE_ENABLED,
+    EMBEDDING_CACHE_DIR,
+    EMBEDDING_CACHE_FLUSH_SECONDS,
+    EMBEDDING_CACHE_MAX_BYTES,
+    GLINER_MODEL_NAME,
+    GLINER_BACKEND,
+    JOB_CACHE_ENABLED,
+    JOB_CACHE_DIR,
+    JOB_CACHE_MAX_ITEMS,
+    JOB_CACHE_MAX_FILES,
+    MATCH_ANALYSIS_CONCURRENCY,
+    MATCH_ANALYSIS_TIMEOUT_SECONDS,
+    MATCH_ANALYSIS_TOP_K,
+    MATCHER_WORKERS,
+    MATCHER_TORCH_THREADS,
+)
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
+# Bump when the structure or content of prepared job data changes so cached
+# entries produced by older code are not reused.
+# 2: chunked GLiNER extraction, batched normalization, dictionary tier.
+JOB_DATA_VERSION = "2"
+
+
+class AnalysisMode(str, Enum):
+    """Which candidates get an LLM-written match analysis."""
+
+    NONE = "none"
+    TOP_K = "top_k"
+    ALL = "all"
+
 
 class MatchAnalysis(BaseModel):
     """Pydantic model for match analysis"""
@@ -27,15 +73,51 @@ class MatchAnalysis(BaseModel):
 
 
 class Matcher:
-    def __init__(self, model_name: str = "TechWolf/JobBERT-v2"):
+    def __init__(
+        self,
+        model_name: str = EMBEDDING_MODEL_NAME,
+        batch_size: int = EMBEDDING_BATCH_SIZE,
+        backend: str = EMBEDDING_BACKEND,
+    ):
         """
-        Initialize the Matcher with a sentence transformer model.
+        Initialize the Matcher. The sentence transformer model (and the embedding
+        cache, which is sized from its dimension) is loaded on first use or by the
+        app's startup warm-up.
 
         Args:
             model_name: Name of the sentence transformer model to use
+            batch_size: Number of texts encoded per forward pass in get_embeddings
+            backend: Inference backend for the embedding model (see services.inference.backends)
         """
-        self.embedding_model = SentenceTransformer(model_name)
-        logger.error(f"Initialized embedding model: {model_name}")
+        self.model_name = model_name
+        self.backend = backend
+        # Identifies the model *and* backend in cache keys, since backends drift slightly
+        self.model_version = model_version(model_name, backend)
+        self.batch_size = batch_size
+        self.embedding_cache = None
+        self._embedding_handle = LazyModel(
+            "embedding",
+            self._load_embedding_model,
+            warmup=lambda model: model.encode(["warm up"], show_progress_bar=False),
+        )
+        # Texts from concurrent requests are encoded together in one forward pass
+        self.embedding_batcher = MicroBatcher(
+            "embedding",
+            self._encode_batch,
+            max_batch_size=batch_size,
+            max_wait_ms=EMBEDDING_MAX_WAIT_MS,
+        )
+
+        self.job_cache = None
+        if JOB_CACHE_ENABLED:
+            try:
+                self.job_cache = JobDataCache(
+                    cache_dir=JOB_CACHE_DIR,
+                    max_items=JOB_CACHE_MAX_ITEMS,
+                    max_files=JOB_CACHE_MAX_FILES,
+                )
+            except Exception as e:
+                logger.error(f"Failed to initialize job cache: {e}")
 
         # Initialize LLM for match analysis
         system_prompt = """You are an expert HR analyst specializing in candidate-job matching. 
@@ -52,7 +134,7 @@ class Matcher:
 
         try:
             self.llm_analyzer = LLM(
-                result_type=MatchAnalysis,
+                output_type=MatchAnalysis,
                 system_prompt=system_prompt,
                 model_settings={"temperature": 0.3, "top_p": 0.9},
             )
@@ -60,6 +142,33 @@ class Matcher:
             logger.error(f"Failed to initialize LLM analyzer: {e}")
             self.llm_analyzer = None
 
+        # Caps how many analyses are in flight against the LLM provider at once
+        self.analysis_semaphore = asyncio.Semaphore(MATCH_ANALYSIS_CONCURRENCY)
+
+        # CPU-bound stages (NER, embeddings, scoring) run here, off the event loop
+        self.worker_pool = WorkerPool(workers=MATCHER_WORKERS)
+        if MATCHER_TORCH_THREADS:
+            set_torch_threads(MATCHER_TORCH_THREADS)
+
+    @property
+    def embedding_model(self):
+        return self._embedding_handle.get()
+
+    def _load_embedding_model(self):
+        embedding_model = load_embedding_model(self.model_name, self.backend)
+        logger.info(f"Initialized embedding model: {self.model_name} ({self.backend})")
+        if EMBEDDING_CACHE_ENABLED:
+            try:
+                self.embedding_cache = EmbeddingCache(
+                    cache_dir=EMBEDDING_CACHE_DIR,
+                    model_name=self.model_version,
+                    dim=embedding_model.get_sentence_embedding_dimension(),
+                    max_bytes=EMBEDDING_CACHE_MAX_BYTES,
+                )
+            except Exception as e:
+                logger.error(f"Failed to initialize embedding cache: {e}")
+        return embedding_model
+
     def get_embedding(self, text: str) -> np.ndarray:
         """
         Generate embedding for a given text.
@@ -68,9 +177,67 @@ class Matcher:
             text: Input text to generate embedding for
 
         Returns:
-            numpy array containing the embedding
+            numpy array containing the (L2-normalized) embedding
         """
-        return self.embedding_model.encode(text)
+        return self.get_embeddings([text])[0]
+
+    def get_embeddings(self, texts: List[str]) -> np.ndarray:
+        """
+        Generate L2-normalized embeddings for many texts in batched encode calls.
+
+        Texts already present in the embedding cache are not re-encoded; only
+        the distinct misses go through the model.
+
+        Args:
+            texts: Input texts to generate embeddings for
+
+        Returns:
+            numpy array of shape (len(texts), dim); rows are unit vectors so a dot
+            product between two rows is their cosine similarity
+        """
+        dim = self.embedding_model.get_sentence_embedding_dimension() or 0
+        if not texts:
+            return np.zeros((0, dim), dtype=np.float32)
+        if self.embedding_cache is None:
+            return self._encode(texts)
+
+        embeddings = np.zeros((len(texts), dim), dtype=np.float32)
+        found, missing = self.embedding_cache.get_many(texts)
+        for i, vector in found.items():
+            embeddings[i] = vector
+
+        if missing:
+            # Deduplicate so repeated texts in one call are encoded once
+            missing_texts = list(dict.fromkeys(texts[i] for i in missing))
+            # Round-trip through float16 so a cache miss returns exactly what a
+            # later hit for the same text will
+            encoded = self._encode(missing_texts).astype(np.float16).astype(np.float32)
+            by_text = dict(zip(missing_texts, encoded))
+            for i in missing:
+                embeddings[i] = by_text[texts[i]]
+            try:
+                self.embedding_cache.put_many(missing_texts, encoded)
+                self.embedding_cache.maybe_flush(EMBEDDING_CACHE_FLUSH_SECONDS)
+            except Exception as e:
+                logger.error(f"Failed to update embedding cache: {e}")
+
+        return embeddings
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """Run the embedding model over texts through the shared micro-batcher."""
+        return np.stack(self.embedding_batcher.run_many(texts))
+
+    def _encode_batch(self, texts: List[str]) -> List[np.ndarray]:
+        """One forward pass over a micro-batch; called on the batcher's thread."""
+        return list(
+            self.embedding_model.encode(
+                texts,
+                batch_size=self.batch_size,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False,
+            )
+        )
 
     def calculate_embedding_similarity(
         self, embedding_one: np.ndarray, embedding_two: np.ndarray
@@ -187,6 +354,27 @@ class Matcher:
         }
 
     def _prepare_job_data(self, job: Dict) -> Dict:
+        """
+        Returns prepared job data, reusing a cached copy when the same job payload
+        was already prepared with the same models and skill extraction settings.
+        """
+        if self.job_cache is None:
+            return self._build_job_data(job)
+
+        key = JobDataCache.key(
+            job,
+            JOB_DATA_VERSION,
+            self.model_version,
+            model_version(GLINER_MODEL_NAME, GLINER_BACKEND),
+            skill_ner.extraction_settings(),
+        )
+        job_data = self.job_cache.get(key)
+        if job_data is None:
+            job_data = self._build_job_data(job)
+            self.job_cache.put(key, job_data)
+        return job_data
+
+    def _build_job_data(self, job: Dict) -> Dict:
         """Pre-processes job data, extracts skills, and generates embeddings."""
         # Extract hard and soft skills from the job data
         hard_skills = [s.lower() for s in job.get("skills", {}).get("hard_skills", [])]
@@ -218,21 +406,42 @@ class Matcher:
         # Create a unified text representation of all unique skills for embedding
         all_skills_text = " ".join(unique_hard + unique_soft + unique_extracted)
 
+        skills_embedding, full_text_embedding = self.get_embeddings(
+            [all_skills_text, job_full_text]
+        )
+
         return {
             "hard_skills": unique_hard,
             "soft_skills": unique_soft,
             "extracted_skills": unique_extracted,
             "all_skills_text": all_skills_text,
             "full_text": job_full_text,
-            "skills_embedding": self.get_embedding(all_skills_text),
-            "full_text_embedding": self.get_embedding(job_full_text),
+            "skills_embedding": skills_embedding,
+            "full_text_embedding": full_text_embedding,
         }
 
-    async def _score_candidate(
-        self, cand: Dict, job_data: Dict, weights: Dict, fuzzy_threshold: float
+    def _prepare_candidates_data(self, cands: List[Dict]) -> List[Dict]:
+        """
+        Pre-processes many candidates: collects skills and renders the texts to embed.
+        NER over all rendered texts runs as one batched extract_skills_batch call.
+        """
+        full_texts = [render_model(cand) for cand in cands]
+        try:
+            extracted = skill_ner.extract_skills_batch(full_texts)
+        except Exception as e:
+            logger.error(
+                f"Error extracting skills from candidates: {e}\n{traceback.format_exc()}"
+            )
+            extracted = [[] for _ in cands]
+        return [
+            self._prepare_candidate_data(cand, full_text, skills)
+            for cand, full_text, skills in zip(cands, full_texts, extracted)
+        ]
+
+    def _prepare_candidate_data(
+        self, cand: Dict, cand_full_text: str, extracted_skills: List[str]
     ) -> Dict:
-        """Scores a single candidate against pre-processed job data."""
-        # Candidate skill extraction
+        """Assembles pre-processed candidate data from its rendered text and extracted skills."""
         cand_hard = [
             s["name"].lower()
             for s in cand.get("skills", [])
@@ -243,100 +452,108 @@ class Matcher:
             for s in cand.get("skills", [])
             if s.get("type") == "Soft" and s.get("name")
         ]
-
-        cand_full_text = render_model(cand)
-        try:
-            cand_extracted = [
-                s.lower() for s in skill_ner.extract_skills(cand_full_text)
-            ]
-        except Exception as e:
-            logger.error(
-                f"Error extracting skills from candidate: {e}\n{traceback.format_exc()}"
-            )
-            cand_extracted = []
+        cand_extracted = [s.lower() for s in extracted_skills]
 
         cand_all_skills_text = " ".join(cand_hard + cand_soft + cand_extracted)
 
-        # Fuzzy skill matching analysis
+        return {
+            "name": cand.get("candidate_name") or cand.get("full_name"),
+            "hard_skills": cand_hard,
+            "soft_skills": cand_soft,
+            "extracted_skills": cand_extracted,
+            "all_skills_text": cand_all_skills_text,
+            "full_text": cand_full_text,
+        }
+
+    def _match_candidate_skills(
+        self, cand_data: Dict, job_data: Dict, fuzzy_threshold: float
+    ) -> Dict:
+        """
+        Fuzzy-matches a pre-processed candidate's skills against pre-processed job data.
+
+        Returns:
+            Dict with the hard / soft / extracted match ratios in [0, 1] (in
+            scoring.SKILL_COMPONENTS order) and the merged matching, missing and
+            extra skill lists
+        """
         hard_analysis = self.fuzzy_match_skills(
-            job_data["hard_skills"], cand_hard, fuzzy_threshold
+            job_data["hard_skills"], cand_data["hard_skills"], fuzzy_threshold
         )
         soft_analysis = self.fuzzy_match_skills(
-            job_data["soft_skills"], cand_soft, fuzzy_threshold
+            job_data["soft_skills"], cand_data["soft_skills"], fuzzy_threshold
         )
         extracted_analysis = self.fuzzy_match_skills(
-            job_data["extracted_skills"], cand_extracted, fuzzy_threshold
-        )
-
-        all_missing = (
-            (hard_analysis.get("missing_skills", []) or [])
-            + (soft_analysis.get("missing_skills", []) or [])
-            + (extracted_analysis.get("missing_skills", []) or [])
-        )
-        all_extra = (
-            (hard_analysis.get("extra_skills", []) or [])
-            + (soft_analysis.get("extra_skills", []) or [])
-            + (extracted_analysis.get("extra_skills", []) or [])
-        )
-        all_matching = (
-            (hard_analysis.get("matching_skills", []) or [])
-            + (soft_analysis.get("matching_skills", []) or [])
-            + (extracted_analysis.get("matching_skills", []) or [])
-        )
-
-        # Calculate component scores
-        hard_score = (hard_analysis.get("match_percentage", 0) or 0) / 100
-        soft_score = (soft_analysis.get("match_percentage", 0) or 0) / 100
-        extracted_score = (extracted_analysis.get("match_percentage", 0) or 0) / 100
-
-        cand_skills_embedding = self.get_embedding(cand_all_skills_text)
-        skills_sim = self.calculate_normalized_embedding_similarity(
-            cand_skills_embedding, job_data["skills_embedding"]
+            job_data["extracted_skills"], cand_data["extracted_skills"], fuzzy_threshold
         )
+        analyses = (hard_analysis, soft_analysis, extracted_analysis)
 
-        cand_full_text_embedding = self.get_embedding(cand_full_text)
-        overall_sim = self.calculate_normalized_embedding_similarity(
-            cand_full_text_embedding, job_data["full_text_embedding"]
-        )
+        def merged(field: str) -> List[str]:
+            return sorted(set(s for a in analyses for s in (a.get(field, []) or [])))
 
-        # Calculate composite skills_score
-        skill_weights = weights["skill_weights"]
-        skills_score_components = {
-            "hard_skills": hard_score,
-            "soft_skills": soft_score,
-            "extracted_skills": extracted_score,
-            "skills_embedding_similarity": skills_sim,
+        return {
+            "ratios": [(a.get("match_percentage", 0) or 0) / 100 for a in analyses],
+            "missing_skills": merged("missing_skills"),
+            "extra_skills": merged("extra_skills"),
+            "matching_skills": merged("matching_skills"),
         }
-        skills_score = sum(
-            skill_weights.get(k, 0) * v
-            for k, v in skills_score_components.items()
-            if k in skill_weights
-        )
 
-        # Calculate final weighted score
-        final_weights = weights["final_weights"]
-        final_score_components = {
-            "skills_score": skills_score,
-            "overall_similarity": overall_sim,
-        }
-        final_score = sum(
-            final_weights.get(k, 0) * v
-            for k, v in final_score_components.items()
-            if k in final_weights
-        )
+    def _select_for_analysis(
+        self,
+        ranked: List[Tuple[Dict, Dict]],
+        analysis_mode: AnalysisMode,
+        analysis_top_k: int,
+    ) -> List[Tuple[Dict, Dict]]:
+        """
+        Picks the ranked (result, candidate data) pairs that should get an LLM analysis.
+        When the analyzer is unavailable the results are annotated and none are picked.
+        """
+        if analysis_mode == AnalysisMode.NONE:
+            return []
+        if not self.llm_analyzer:
+            for result, _ in ranked:
+                result["analysis"] = "Analysis unavailable - LLM not initialized"
+            return []
+        if analysis_mode == AnalysisMode.TOP_K:
+            return ranked[:analysis_top_k]
+        return ranked
 
-        # Generate a reason for the match
-        analysis = await self.analyze_match(cand_full_text, job_data["full_text"])
+    async def _analyze_one(self, result: Dict, cand_data: Dict, job_data: Dict) -> Dict:
+        """
+        Fills in the LLM analysis of one result in place, bounded by
+        self.analysis_semaphore and MATCH_ANALYSIS_TIMEOUT_SECONDS; a timed-out or
+        failed analysis leaves the numeric result untouched with analyzed=False.
+        """
+        async with self.analysis_semaphore:
+            try:
+                result["analysis"] = await asyncio.wait_for(
+                    self._generate_analysis(cand_data["full_text"], job_data["full_text"]),
+                    timeout=MATCH_ANALYSIS_TIMEOUT_SECONDS,
+                )
+                result["analyzed"] = True
+            except asyncio.TimeoutError:
+                logger.warning(
+                    f"Match analysis timed out for candidate {cand_data['name']}"
+                )
+                result["analysis"] = "Analysis timed out"
+            except Exception as e:
+                logger.error(
+                    f"Error generating match analysis: {e}\n{traceback.format_exc()}"
+                )
+                result["analysis"] = f"Analysis error: {str(e)}"
+        return result
 
-        return {
-            "candidate": cand.get("candidate_name") or cand.get("full_name"),
-            "score": round(max(0.0, final_score), 3),
-            "score_breakdown": final_score_components,
-            "missing_skills": sorted(list(set(all_missing))),
-            "extra_skills": sorted(list(set(all_extra))),
-            "matching_skills": sorted(list(set(all_matching))),
-            "analysis": analysis,
-        }
+    async def _analyze_results(
+        self,
+        ranked: List[Tuple[Dict, Dict]],
+        job_data: Dict,
+        analysis_mode: AnalysisMode,
+        analysis_top_k: int,
+    ) -> None:
+        """Fills in the LLM analysis of ranked (result, candidate data) pairs in place, concurrently."""
+        selected = self._select_for_analysis(ranked, analysis_mode, analysis_top_k)
+        await asyncio.gather(
+            *(self._analyze_one(result, cand_data, job_data) for result, cand_data in selected)
+        )
 
     async def analyze_match(self, candidate_text: str, job_text: str) -> str:
         """
@@ -353,7 +570,16 @@ class Matcher:
             return "Analysis unavailable - LLM not initialized"
 
         try:
-            prompt = f"""
+            return await self._generate_analysis(candidate_text, job_text)
+        except Exception as e:
+            logger.error(
+                f"Error generating match analysis: {e}\n{traceback.format_exc()}"
+            )
+            return f"Analysis error: {str(e)}"
+
+    async def _generate_analysis(self, candidate_text: str, job_text: str) -> str:
+        """Runs the analysis prompt through the LLM; errors propagate to the caller."""
+        prompt = f"""
             Please analyze this candidate-job match:
             
             JOB DESCRIPTION:
@@ -366,22 +592,16 @@ class Matcher:
             Include strengths, concerns, overall assessment, and recommendations.
             """
 
-            # Use the LLM to generate analysis
-            analysis_result = await self.llm_analyzer.llm_agent.run([prompt])
+        # Use the LLM to generate analysis
+        analysis_result = await self.llm_analyzer.llm_agent.run([prompt])
 
-            # Extract analysis from the result
-            if isinstance(analysis_result, dict) and "analysis" in analysis_result:
-                return analysis_result["analysis"]
-            elif hasattr(analysis_result, "analysis"):
-                return analysis_result.analysis
-            else:
-                return str(analysis_result)
-
-        except Exception as e:
-            logger.error(
-                f"Error generating match analysis: {e}\n{traceback.format_exc()}"
-            )
-            return f"Analysis error: {str(e)}"
+        # Extract analysis from the result
+        if isinstance(analysis_result, dict) and "analysis" in analysis_result:
+            return analysis_result["analysis"]
+        elif hasattr(analysis_result, "analysis"):
+            return analysis_result.analysis
+        else:
+            return str(analysis_result)
 
     async def match_candidates(
         self,
@@ -389,6 +609,8 @@ class Matcher:
         candidates: List[Dict],
         weights: Optional[Dict] = None,
         fuzzy_threshold: float = 0.60,
+        analysis_mode: AnalysisMode = AnalysisMode.ALL,
+        analysis_top_k: int = MATCH_ANALYSIS_TOP_K,
     ) -> List[Dict]:
         """
         Rank candidates against a job using a two-level scoring model.
@@ -411,6 +633,9 @@ class Matcher:
                          }
                      }
             fuzzy_threshold: Minimum fuzzy match score for skills (0-100)
+            analysis_mode: Which candidates get an LLM analysis: none, the
+                           analysis_top_k best by numeric score, or all
+            analysis_top_k: Number of candidates analyzed in top_k mode
 
         Returns:
             List of candidate matches with detailed analysis
@@ -419,68 +644,330 @@ class Matcher:
         if not candidates:
             return []
         try:
-            # ---------- 1. Weight preparation ----------
-            default_weights = {
-                "final_score_weights": {
-                    "skills_score": 0.5,
-                    "overall_similarity": 0.5,
-                },
-                "skill_score_weights": {
-                    "hard_skills": 0.05,
-                    "soft_skills": 0.05,
-                    "extracted_skills": 0.05,
-                    "skills_embedding_similarity": 0.85,
-                },
-            }
+            results = await self.match_batch(
+                jobs={"job": job},
+                candidates={str(i): cand for i, cand in enumerate(candidates)},
+                pairs=[("job", str(i)) for i in range(len(candidates))],
+                weights=weights,
+                fuzzy_threshold=fuzzy_threshold,
+                analysis_mode=analysis_mode,
+                analysis_top_k=analysis_top_k,
+            )
+            return sorted(results, key=lambda x: x["score"], reverse=True)
+        except Exception as e:
+            logger.error(
+                f"Error during candidate matching: {e}\n{traceback.format_exc()}"
+            )
+            return []
 
-            user_final_weights = (weights or {}).get("final_score_weights", {})
-            final_weights = {
-                **default_weights["final_score_weights"],
-                **user_final_weights,
-            }
+    async def match_candidates_stream(
+        self,
+        job: Dict,
+        candidates: List[Dict],
+        weights: Optional[Dict] = None,
+        fuzzy_threshold: float = 0.60,
+        analysis_mode: AnalysisMode = AnalysisMode.ALL,
+        analysis_top_k: int = MATCH_ANALYSIS_TOP_K,
+    ) -> AsyncIterator[Dict]:
+        """
+        Streaming variant of match_candidates.
 
-            user_skill_weights = (weights or {}).get("skill_score_weights", {})
-            skill_weights = {
-                **default_weights["skill_score_weights"],
-                **user_skill_weights,
+        Yields one {"type": "result", "candidate_index", ...} record per candidate as
+        soon as it is final: candidates that get no LLM analysis right after scoring
+        (best first), analyzed ones in completion order. Ends with a
+        {"type": "summary", "ranking": [candidate_index, ...], ...} record.
+        """
+        if not candidates:
+            yield {
+                "type": "summary",
+                "ranking": [],
+                "total_candidates": 0,
+                "analyzed_candidates": 0,
             }
+            return
+
+        results, ranked_by_job, jobs_data = await self.worker_pool.run(
+            self._score_pairs,
+            {"job": job},
+            {str(i): cand for i, cand in enumerate(candidates)},
+            [("job", str(i)) for i in range(len(candidates))],
+            weights,
+            fuzzy_threshold,
+        )
+        ranked = sorted(
+            ranked_by_job["job"], key=lambda pair: pair[0]["score"], reverse=True
+        )
+        job_data = jobs_data["job"]
 
-            # Strip zero-weight keys & renormalise for final score
-            final_weights = {k: v for k, v in final_weights.items() if v > 0}
-            total_final_w = sum(final_weights.values())
-            if total_final_w > 0:
-                final_weights = {k: v / total_final_w for k, v in final_weights.items()}
-
-            # Strip zero-weight keys & renormalise for skill score
-            skill_weights = {k: v for k, v in skill_weights.items() if v > 0}
-            total_skill_w = sum(skill_weights.values())
-            if total_skill_w > 0:
-                skill_weights = {k: v / total_skill_w for k, v in skill_weights.items()}
-
-            processed_weights = {
-                "final_weights": final_weights,
-                "skill_weights": skill_weights,
+        def record(result: Dict) -> Dict:
+            return {
+                "type": "result",
+                "candidate_index": int(result["candidate_id"]),
+                **result,
             }
 
-            # ---------- 2. Job preprocessing ----------
-            job_data = self._prepare_job_data(job)
+        selected = self._select_for_analysis(
+            ranked, AnalysisMode(analysis_mode), analysis_top_k
+        )
+        selected_ids = {id(result) for result, _ in selected}
+        for result, _ in ranked:
+            if id(result) not in selected_ids:
+                yield record(result)
+
+        tasks = [
+            asyncio.ensure_future(self._analyze_one(result, cand_data, job_data))
+            for result, cand_data in selected
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield record(await next_done)
+        finally:
+            # Client went away mid-stream: don't keep calling the LLM for nobody
+            for task in tasks:
+                task.cancel()
+
+        yield {
+            "type": "summary",
+            "ranking": [int(result["candidate_id"]) for result, _ in ranked],
+            "total_candidates": len(results),
+            "analyzed_candidates": sum(1 for r in results if r["analyzed"]),
+        }
+
+    async def match_batch(
+        self,
+        jobs: Dict[str, Dict],
+        candidates: Dict[str, Dict],
+        pairs: List[Tuple[str, str]],
+        weights: Optional[Dict] = None,
+        fuzzy_threshold: float = 0.60,
+        analysis_mode: AnalysisMode = AnalysisMode.ALL,
+        analysis_top_k: int = MATCH_ANALYSIS_TOP_K,
+    ) -> List[Dict]:
+        """
+        Score many (job, candidate) pairs in one pass.
 
-            # ---------- 3. Score all candidates ----------
-            results = []
-            for cand in candidates:
-                result = await self._score_candidate(
-                    cand, job_data, processed_weights, fuzzy_threshold
+        Each distinct job and candidate referenced by pairs is pre-processed (render,
+        NER, embeddings) exactly once, however many pairs it takes part in; scoring
+        then fans out over the pairs.
+
+        Args:
+            jobs: Job dictionaries keyed by caller-chosen job id
+            candidates: Candidate dictionaries keyed by caller-chosen candidate id
+            pairs: (job_id, candidate_id) pairs to score
+            weights, fuzzy_threshold: As in match_candidates
+            analysis_mode, analysis_top_k: As in match_candidates, applied per job
+
+        Returns:
+            One result per pair, in pair order, carrying job_id and candidate_id
+        """
+        if not pairs:
+            return []
+
+        # Stages 1-5 are CPU-bound; run them on the worker pool so other requests
+        # (parsing, health probes) keep being served meanwhile.
+        results, ranked_by_job, jobs_data = await self.worker_pool.run(
+            self._score_pairs, jobs, candidates, pairs, weights, fuzzy_threshold
+        )
+
+        # ---------- 6. LLM analysis ----------
+        # top_k is applied per job; the semaphore bounds concurrency across all jobs.
+        analysis_tasks = []
+        for job_id, ranked in ranked_by_job.items():
+            ranked.sort(key=lambda pair: pair[0]["score"], reverse=True)
+            analysis_tasks.append(
+                self._analyze_results(
+                    ranked,
+                    jobs_data[job_id],
+                    AnalysisMode(analysis_mode),
+                    analysis_top_k,
                 )
-                result["weights_used"] = processed_weights
-                results.append(result)
+            )
+        await asyncio.gather(*analysis_tasks)
 
-            return sorted(results, key=lambda x: x["score"], reverse=True)
-        except Exception as e:
-            logger.error(
-                f"Error during candidate matching: {e}\n{traceback.format_exc()}"
+        return results
+
+    def _score_pairs(
+        self,
+        jobs: Dict[str, Dict],
+        candidates: Dict[str, Dict],
+        pairs: List[Tuple[str, str]],
+        weights: Optional[Dict],
+        fuzzy_threshold: float,
+    ) -> Tuple[List[Dict], Dict[str, List[Tuple[Dict, Dict]]], Dict[str, Dict]]:
+        """
+        Synchronous, CPU-bound part of match_batch (preprocessing, embeddings, scoring).
+
+        Returns:
+            (results in pair order, per-job (result, candidate data) lists, job data by id)
+        """
+        # ---------- 1. Weight preparation ----------
+        processed_weights = scoring.prepare_weights(weights)
+
+        # ---------- 2. Job & candidate preprocessing (once per distinct id) ----------
+        job_ids = list(dict.fromkeys(job_id for job_id, _ in pairs))
+        cand_ids = list(dict.fromkeys(cand_id for _, cand_id in pairs))
+        jobs_data = {job_id: self._prepare_job_data(jobs[job_id]) for job_id in job_ids}
+        candidates_data = dict(
+            zip(
+                cand_ids,
+                self._prepare_candidates_data([candidates[c] for c in cand_ids]),
+            )
+        )
+
+        # ---------- 3. Batched embeddings ----------
+        # One encode pass over every candidate text
+        cand_skills_embeddings, cand_full_embeddings = self._embed_candidates(
+            [candidates_data[cand_id] for cand_id in cand_ids]
+        )
+        cand_row = {cand_id: i for i, cand_id in enumerate(cand_ids)}
+        job_row = {job_id: i for i, job_id in enumerate(job_ids)}
+        job_skills_embeddings = np.stack(
+            [jobs_data[job_id]["skills_embedding"] for job_id in job_ids]
+        )
+        job_full_embeddings = np.stack(
+            [jobs_data[job_id]["full_text_embedding"] for job_id in job_ids]
+        )
+
+        # ---------- 4. Pairwise similarities ----------
+        # Gather the rows of each pair and take row-wise dot products, so the
+        # cost is linear in the number of pairs rather than jobs x candidates.
+        pair_jobs = np.array([job_row[job_id] for job_id, _ in pairs])
+        pair_cands = np.array([cand_row[cand_id] for _, cand_id in pairs])
+        skills_sims = scoring.pairwise_similarity(
+            job_skills_embeddings[pair_jobs], cand_skills_embeddings[pair_cands]
+        )[None, :]
+        overall_sims = scoring.pairwise_similarity(
+            job_full_embeddings[pair_jobs], cand_full_embeddings[pair_cands]
+        )[None, :]
+
+        # ---------- 5. Score all pairs ----------
+        skill_matches = [
+            self._match_candidate_skills(
+                candidates_data[cand_id], jobs_data[job_id], fuzzy_threshold
             )
+            for job_id, cand_id in pairs
+        ]
+        skill_match_scores = np.array(
+            [[m["ratios"] for m in skill_matches]], dtype=np.float32
+        )
+        skills_scores, final_scores = scoring.score_matrix(
+            skills_sims, overall_sims, processed_weights, skill_match_scores
+        )
+
+        results = []
+        ranked_by_job: Dict[str, List[Tuple[Dict, Dict]]] = {j: [] for j in job_ids}
+        for i, ((job_id, cand_id), skill_match) in enumerate(zip(pairs, skill_matches)):
+            cand_data = candidates_data[cand_id]
+            result = {
+                "job_id": job_id,
+                "candidate_id": cand_id,
+                "candidate": cand_data["name"],
+                "score": round(float(final_scores[0, i]), 3),
+                "score_breakdown": {
+                    "skills_score": float(skills_scores[0, i]),
+                    "overall_similarity": float(overall_sims[0, i]),
+                },
+                "missing_skills": skill_match["missing_skills"],
+                "extra_skills": skill_match["extra_skills"],
+                "matching_skills": skill_match["matching_skills"],
+                "weights_used": processed_weights,
+                "analysis": None,
+                "analyzed": False,
+            }
+            results.append(result)
+            ranked_by_job[job_id].append((result, cand_data))
+
+        return results, ranked_by_job, jobs_data
+
+    def _embed_candidates(
+        self, candidates_data: List[Dict]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Embeds every candidate's skills text and full text in one batched call."""
+        n_cands = len(candidates_data)
+        cand_embeddings = self.get_embeddings(
+            [c["all_skills_text"] for c in candidates_data]
+            + [c["full_text"] for c in candidates_data]
+        )
+        return cand_embeddings[:n_cands], cand_embeddings[n_cands:]
+
+    def rank_candidates_for_jobs(
+        self,
+        jobs: List[Dict],
+        candidates: List[Dict],
+        weights: Optional[Dict] = None,
+        fuzzy_threshold: float = 0.60,
+        top_k: int = 10,
+    ) -> List[Dict]:
+        """
+        Scores every candidate against every job in one vectorized pass and returns
+        the top_k candidates per job. Intended for backfills after a weight change or
+        model upgrade; no LLM analysis is produced.
+
+        Fuzzy skill matching is per (job, candidate) pair, so it is skipped entirely
+        when the hard / soft / extracted skill weights are all zero.
+
+        Returns:
+            One entry per job (input order): {"job_index", "results": [...]}, each
+            result holding candidate_index, candidate, score and score_breakdown
+        """
+        if not jobs or not candidates:
             return []
 
+        processed_weights = scoring.prepare_weights(weights)
+        jobs_data = [self._prepare_job_data(j) for j in jobs]
+        candidates_data = self._prepare_candidates_data(candidates)
+
+        cand_skills_embeddings, cand_full_embeddings = self._embed_candidates(
+            candidates_data
+        )
+        skills_sims = scoring.similarity_matrix(
+            np.stack([j["skills_embedding"] for j in jobs_data]),
+            cand_skills_embeddings,
+        )
+        overall_sims = scoring.similarity_matrix(
+            np.stack([j["full_text_embedding"] for j in jobs_data]),
+            cand_full_embeddings,
+        )
+
+        skill_match_scores = None
+        skill_weights = processed_weights["skill_weights"]
+        if any(skill_weights.get(c, 0) > 0 for c in scoring.SKILL_COMPONENTS[:3]):
+            skill_match_scores = np.array(
+                [
+                    [
+                        self._match_candidate_skills(c, j, fuzzy_threshold)["ratios"]
+                        for c in candidates_data
+                    ]
+                    for j in jobs_data
+                ],
+                dtype=np.float32,
+            )
+
+        skills_scores, final_scores = scoring.score_matrix(
+            skills_sims, overall_sims, processed_weights, skill_match_scores
+        )
+        top_indices, top_scores = scoring.top_k_per_job(final_scores, top_k)
+
+        ranking = []
+        for job_idx in range(len(jobs_data)):
+            results = []
+            for cand_idx, score in zip(top_indices[job_idx], top_scores[job_idx]):
+                results.append(
+                    {
+                        "candidate_index": int(cand_idx),
+                        "candidate": candidates_data[cand_idx]["name"],
+                        "score": round(float(score), 3),
+                        "score_breakdown": {
+                            "skills_score": float(skills_scores[job_idx, cand_idx]),
+                            "overall_similarity": float(
+                                overall_sims[job_idx, cand_idx]
+                            ),
+                        },
+                    }
+                )
+            ranking.append({"job_index": job_idx, "results": results})
+        return ranking
+
 
 # # Exampl    e usage
 # if __name__ == "__main__":
@@ -0,0 +1,164 @@
+"""
+Vectorized scoring engine for the matcher.
+
+Every function works on whole M x N (jobs x candidates) matrices so scoring a
+single job against a sub-batch and re-scoring an entire backlog after a weight
+change go through the same NumPy code path.
+"""
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+# Order of the components in the skill / final weight vectors.
+SKILL_COMPONENTS = (
+    "hard_skills",
+    "soft_skills",
+    "extracted_skills",
+    "skills_embedding_similarity",
+)
+FINAL_COMPONENTS = ("skills_score", "overall_similarity")
+
+DEFAULT_WEIGHTS = {
+    "final_score_weights": {
+        "skills_score": 0.5,
+        "overall_similarity": 0.5,
+    },
+    "skill_score_weights": {
+        "hard_skills": 0.05,
+        "soft_skills": 0.05,
+        "extracted_skills": 0.05,
+        "skills_embedding_similarity": 0.85,
+    },
+}
+
+
+def _normalize_weights(weights: Dict[str, float]) -> Dict[str, float]:
+    """Strips zero-weight keys and renormalises the rest to sum to 1."""
+    weights = {k: v for k, v in weights.items() if v > 0}
+    total = sum(weights.values())
+    if total > 0:
+        weights = {k: v / total for k, v in weights.items()}
+    return weights
+
+
+def prepare_weights(weights: Optional[Dict] = None) -> Dict[str, Dict[str, float]]:
+    """
+    Merges user weights over DEFAULT_WEIGHTS and renormalises each level.
+
+    Returns:
+        {"final_weights": {...}, "skill_weights": {...}}
+    """
+    final_weights = {
+        **DEFAULT_WEIGHTS["final_score_weights"],
+        **(weights or {}).get("final_score_weights", {}),
+    }
+    skill_weights = {
+        **DEFAULT_WEIGHTS["skill_score_weights"],
+        **(weights or {}).get("skill_score_weights", {}),
+    }
+    return {
+        "final_weights": _normalize_weights(final_weights),
+        "skill_weights": _normalize_weights(skill_weights),
+    }
+
+
+def weight_vector(weights: Dict[str, float], components: Tuple[str, ...]) -> np.ndarray:
+    """Lays out a weight dict as a vector in the order of components (missing = 0)."""
+    return np.array([weights.get(c, 0.0) for c in components], dtype=np.float32)
+
+
+def similarity_matrix(
+    job_embeddings: np.ndarray, candidate_embeddings: np.ndarray
+) -> np.ndarray:
+    """
+    Normalized cosine similarity between every job and every candidate.
+
+    Args:
+        job_embeddings: (M, dim) L2-normalized job embeddings
+        candidate_embeddings: (N, dim) L2-normalized candidate embeddings
+
+    Returns:
+        (M, N) matrix of similarities in [0, 1]
+    """
+    job_embeddings = np.atleast_2d(job_embeddings)
+    candidate_embeddings = np.atleast_2d(candidate_embeddings)
+    raw = job_embeddings @ candidate_embeddings.T
+    return np.clip((raw + 1.0) / 2.0, 0.0, 1.0)
+
+
+def pairwise_similarity(
+    job_embeddings: np.ndarray, candidate_embeddings: np.ndarray
+) -> np.ndarray:
+    """
+    Normalized cosine similarity of aligned rows (row i of jobs with row i of candidates).
+
+    Args:
+        job_embeddings: (P, dim) L2-normalized job embeddings
+        candidate_embeddings: (P, dim) L2-normalized candidate embeddings
+
+    Returns:
+        (P,) vector of similarities in [0, 1]
+    """
+    raw = np.einsum("ij,ij->i", job_embeddings, candidate_embeddings)
+    return np.clip((raw + 1.0) / 2.0, 0.0, 1.0)
+
+
+def score_matrix(
+    skills_similarity: np.ndarray,
+    overall_similarity: np.ndarray,
+    processed_weights: Dict[str, Dict[str, float]],
+    skill_match_scores: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Applies the two-level weighting to whole score matrices.
+
+    Args:
+        skills_similarity: (M, N) skills embedding similarity
+        overall_similarity: (M, N) full-text embedding similarity
+        processed_weights: Output of prepare_weights
+        skill_match_scores: Optional (M, N, 3) hard / soft / extracted fuzzy match
+                            ratios in [0, 1]; treated as 0 when omitted
+
+    Returns:
+        (skills_score, final_score), both (M, N)
+    """
+    m, n = skills_similarity.shape
+    if skill_match_scores is None:
+        skill_match_scores = np.zeros((m, n, 3), dtype=np.float32)
+
+    skill_components = np.concatenate(
+        [skill_match_scores, skills_similarity[:, :, None]], axis=2
+    )
+    skills_score = skill_components @ weight_vector(
+        processed_weights["skill_weights"], SKILL_COMPONENTS
+    )
+
+    final_components = np.stack([skills_score, overall_similarity], axis=2)
+    final_score = final_components @ weight_vector(
+        processed_weights["final_weights"], FINAL_COMPONENTS
+    )
+    return skills_score, np.maximum(final_score, 0.0)
+
+
+def top_k_per_job(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Best k candidates per job, highest score first.
+
+    Uses argpartition so only the selected k columns of each row are sorted.
+
+    Returns:
+        (indices, values), both (M, min(k, N))
+    """
+    m, n = scores.shape
+    k = max(0, min(k, n))
+    if k == 0:
+        return np.zeros((m, 0), dtype=np.int64), np.zeros((m, 0), dtype=scores.dtype)
+    if k < n:
+        part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        part = np.tile(np.arange(n), (m, 1))
+    part_scores = np.take_along_axis(scores, part, axis=1)
+    order = np.argsort(-part_scores, axis=1, kind="stable")
+    indices = np.take_along_axis(part, order, axis=1)
+    return indices, np.take_along_axis(scores, indices, axis=1)
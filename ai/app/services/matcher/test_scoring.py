@@ -0,0 +1,82 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import numpy as np
+import pytest
+
+from services.matcher.scoring import prepare_weights, score_matrix, top_k_per_job
+
+
+def test_prepare_weights_renormalises_and_drops_zero_weights():
+    weights = prepare_weights(
+        {"final_score_weights": {"skills_score": 3, "overall_similarity": 1},
+         "skill_score_weights": {"hard_skills": 0, "soft_skills": 0, "extracted_skills": 0}}
+    )
+    assert weights["final_weights"] == pytest.approx({"skills_score": 0.75, "overall_similarity": 0.25})
+    assert weights["skill_weights"] == pytest.approx({"skills_embedding_similarity": 1.0})
+
+
+def test_score_matrix_matches_per_pair_weighting():
+    rng = np.random.default_rng(0)
+    skills_similarity = rng.random((3, 4))
+    overall_similarity = rng.random((3, 4))
+    matches = rng.random((3, 4, 3))
+    weights = prepare_weights()
+
+    skills_score, final_score = score_matrix(skills_similarity, overall_similarity, weights, matches)
+
+    sw, fw = weights["skill_weights"], weights["final_weights"]
+    for i in range(3):
+        for j in range(4):
+            expected_skills = (
+                sw["hard_skills"] * matches[i, j, 0]
+                + sw["soft_skills"] * matches[i, j, 1]
+                + sw["extracted_skills"] * matches[i, j, 2]
+                + sw["skills_embedding_similarity"] * skills_similarity[i, j]
+            )
+            expected_final = (
+                fw["skills_score"] * expected_skills
+                + fw["overall_similarity"] * overall_similarity[i, j]
+            )
+            assert skills_score[i, j] == pytest.approx(expected_skills, rel=1e-5)
+            assert final_score[i, j] == pytest.approx(expected_final, rel=1e-5)
+
+
+def test_score_matrix_without_match_scores_treats_them_as_zero():
+    skills_similarity = np.full((2, 2), 0.8)
+    overall_similarity = np.full((2, 2), 0.4)
+    weights = prepare_weights()
+
+    default = score_matrix(skills_similarity, overall_similarity, weights)
+    zeros = score_matrix(skills_similarity, overall_similarity, weights, np.zeros((2, 2, 3)))
+
+    np.testing.assert_allclose(default[0], zeros[0])
+    np.testing.assert_allclose(default[1], zeros[1])
+
+
+def test_top_k_per_job_returns_best_first():
+    scores = np.array([[0.1, 0.9, 0.5, 0.7], [0.6, 0.2, 0.8, 0.4]])
+
+    indices, values = top_k_per_job(scores, 2)
+
+    np.testing.assert_array_equal(indices, [[1, 3], [2, 0]])
+    np.testing.assert_allclose(values, [[0.9, 0.7], [0.8, 0.6]])
+
+
+@pytest.mark.parametrize("k", [4, 10])
+def test_top_k_per_job_with_k_at_least_n_sorts_every_candidate(k):
+    scores = np.array([[0.3, 0.1, 0.4, 0.2]])
+
+    indices, values = top_k_per_job(scores, k)
+
+    np.testing.assert_array_equal(indices, [[2, 0, 3, 1]])
+    np.testing.assert_allclose(values, [[0.4, 0.3, 0.2, 0.1]])
+
+
+def test_top_k_per_job_with_k_zero_is_empty():
+    indices, values = top_k_per_job(np.ones((3, 5)), 0)
+
+    assert indices.shape == (3, 0)
+    assert values.shape == (3, 0)
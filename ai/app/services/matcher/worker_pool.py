@@ -0,0 +1,96 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerPool:
+    """
+    Dedicated thread pool for the matcher's CPU-bound stages (GLiNER, spaCy,
+    SentenceTransformer, scoring) so they never run on the event loop.
+
+    Model forward passes themselves run on the micro-batcher threads; workers
+    mostly wait on those and do the scoring. Counters expose how many jobs are
+    waiting vs running so saturation is visible.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = max(1, workers)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="matcher-worker"
+        )
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.max_queue_depth = 0
+        self.total_wait_seconds = 0.0
+        self.total_run_seconds = 0.0
+
+    async def run(self, fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        """Runs fn(*args, **kwargs) on the pool and awaits its result."""
+        submitted_at = time.perf_counter()
+        with self._lock:
+            self.queued += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queued)
+
+        def task() -> Any:
+            started_at = time.perf_counter()
+            with self._lock:
+                self.queued -= 1
+                self.running += 1
+                self.total_wait_seconds += started_at - submitted_at
+            ok = False
+            try:
+                result = fn(*args, **kwargs)
+                ok = True
+                return result
+            finally:
+                with self._lock:
+                    self.running -= 1
+                    self.total_run_seconds += time.perf_counter() - started_at
+                    if ok:
+                        self.completed += 1
+                    else:
+                        self.failed += 1
+
+        def on_done(future) -> None:
+            # Cancelled before it started (caller gave up, or shutdown): never dequeued
+            if future.cancelled():
+                with self._lock:
+                    self.queued -= 1
+
+        future = self._executor.submit(task)
+        future.add_done_callback(on_done)
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self, cancel_futures: bool = True) -> None:
+        """Stops accepting work; queued jobs that have not started are cancelled."""
+        self._executor.shutdown(wait=False, cancel_futures=cancel_futures)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            finished = self.completed + self.failed
+            return {
+                "workers": self.workers,
+                "queue_depth": self.queued,
+                "max_queue_depth": self.max_queue_depth,
+                "running": self.running,
+                "completed": self.completed,
+                "failed": self.failed,
+                "avg_wait_ms": (
+                    round(self.total_wait_seconds / finished * 1000, 2)
+                    if finished
+                    else 0.0
+                ),
+                "avg_run_ms": (
+                    round(self.total_run_seconds / finished * 1000, 2)
+                    if finished
+                    else 0.0
+                ),
+            }
@@ -0,0 +1,102 @@
+import re
+from typing import List, Tuple
+
+# Same word/punctuation split GLiNER uses to count its max_len
+_TOKEN_RE = re.compile(r"\w+(?:[-_]\w+)*|\S")
+# List item header emitted by utils.render_model ("  1.")
+_ITEM_RE = re.compile(r"^\s*\d+\.\s*$")
+
+
+def count_tokens(text: str) -> int:
+    return len(_TOKEN_RE.findall(text))
+
+
+def _split_line(line: str, max_tokens: int) -> List[Tuple[str, int]]:
+    """Splits a single line into pieces of at most max_tokens tokens, on whitespace."""
+    pieces, words, tokens = [], [], 0
+    for word in line.split():
+        n = count_tokens(word)
+        if words and tokens + n > max_tokens:
+            pieces.append((" ".join(words), tokens))
+            words, tokens = [], 0
+        words.append(word)
+        tokens += n
+    if words:
+        pieces.append((" ".join(words), tokens))
+    return pieces
+
+
+def _sections(text: str, max_line_tokens: int) -> List[List[Tuple[str, int]]]:
+    """
+    Groups lines into sections: a section starts at every top-level field and every
+    list item of the rendered text. Lines longer than max_line_tokens are split.
+    """
+    sections: List[List[Tuple[str, int]]] = []
+    current: List[Tuple[str, int]] = []
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        if current and (not line[:1].isspace() or _ITEM_RE.match(line)):
+            sections.append(current)
+            current = []
+        n = count_tokens(line)
+        if n > max_line_tokens:
+            current.extend(_split_line(line, max_line_tokens))
+        else:
+            current.append((line, n))
+    if current:
+        sections.append(current)
+    return sections
+
+
+def chunk_text(text: str, max_tokens: int, overlap_tokens: int) -> List[str]:
+    """
+    Splits rendered text into overlapping windows of at most max_tokens tokens.
+
+    Windows are cut at section boundaries when the next section does not fit and the
+    current window is at least half full, otherwise between lines. Each new window
+    repeats up to overlap_tokens of trailing lines from the previous one so entities
+    straddling a cut are still seen whole.
+    """
+    if count_tokens(text) <= max_tokens:
+        return [text]
+    overlap_tokens = max(0, min(overlap_tokens, max_tokens // 2))
+
+    windows: List[str] = []
+    current: List[Tuple[str, int]] = []
+    current_tokens = 0
+    # Tokens in the current window that are not carried over from the previous one
+    fresh_tokens = 0
+
+    def flush() -> None:
+        nonlocal current, current_tokens, fresh_tokens
+        windows.append("\n".join(line for line, _ in current))
+        carry: List[Tuple[str, int]] = []
+        carried = 0
+        for line, n in reversed(current):
+            if carried + n > overlap_tokens:
+                break
+            carry.insert(0, (line, n))
+            carried += n
+        current, current_tokens, fresh_tokens = carry, carried, 0
+
+    # Over-long lines are cut into overlap-sized pieces so the carry-over below
+    # gives them a true sliding window; ordinary lines are never split.
+    for section in _sections(text, overlap_tokens or max_tokens):
+        section_tokens = sum(n for _, n in section)
+        if (
+            current
+            and current_tokens + section_tokens > max_tokens
+            and current_tokens >= max_tokens // 2
+        ):
+            flush()
+        for line, n in section:
+            if current and current_tokens + n > max_tokens:
+                flush()
+            current.append((line, n))
+            current_tokens += n
+            fresh_tokens += n
+
+    if fresh_tokens:
+        windows.append("\n".join(line for line, _ in current))
+    return windows
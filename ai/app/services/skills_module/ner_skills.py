@@ -1,101 +1,513 @@
 import re
+import hashlib
+import os
 import logging
+import threading
+from collections import OrderedDict
 from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 import spacy
-from sklearn.metrics.pairwise import cosine_similarity
-from gliner import GLiNER
+from rapidfuzz import fuzz, process
 import torch
+from config import (
+    GLINER_MODEL_NAME,
+    GLINER_BACKEND,
+    GLINER_MAX_BATCH_SIZE,
+    GLINER_MAX_WAIT_MS,
+    GLINER_CHUNK_MAX_TOKENS,
+    GLINER_CHUNK_OVERLAP_TOKENS,
+    SKILL_EXTRACTION_CACHE_SIZE,
+    SKILL_NORMALIZE_MEMO_SIZE,
+    SKILL_LEXICAL_THRESHOLD,
+    SKILL_VECTOR_CACHE_SIZE,
+    SKILL_VECTOR_SNAPSHOT_PATH,
+    SKILL_TABLE_DIR,
+    SKILL_EXTRACTION_POLICY,
+    SKILL_DICTIONARY_PATH,
+    SKILL_DICTIONARY_MIN_DENSITY,
+)
+from services.skills_module.chunking import chunk_text
+from services.skills_module.skill_dictionary import (
+    SkillExtractionPolicy,
+    load_skill_dictionary,
+    tokenize,
+)
+from services.skills_module.skill_table import SkillTable
+from services.skills_module.vector_store import VectorStore
+from services.inference import LazyModel, MicroBatcher, load_gliner_model
+
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
 
-class skill_ner:
-    # — spaCy + GLiNER setup — #
-    _nlp = None
+SKILL_LABELS = ["soft skills", "technical skills"]
+device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+
+
+def _load_spacy():
     try:
-        _nlp = spacy.load("en_core_web_trf")
+        return spacy.load("en_core_web_trf")
     except OSError:
-        _nlp = spacy.load("en_core_web_lg")
-    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        # Only static vectors are read from the lg model, and they do not depend on
+        # the parser or NER: share the normalizer's pipeline rather than loading
+        # en_core_web_lg a second time
+        nlp = normalizer_model.get()
+        if not nlp.vocab.vectors_length:
+            raise OSError("Neither en_core_web_trf nor en_core_web_lg is installed")
+        return nlp
+
 
-    _gliner_model = GLiNER.from_pretrained("knowledgator/gliner-x-large",device=device)
-    _VEC_CACHE: Dict[str, np.ndarray] = {}
+def spacy_model_name(nlp) -> str:
+    return f"{nlp.meta.get('lang')}_{nlp.meta.get('name')}-{nlp.meta.get('version')}"
+
+
+def spacy_vector_dim(nlp) -> int:
+    # Transformer pipelines have no static vectors; doc.vector then averages the tensor
+    return len(nlp("skill").vector) or nlp.vocab.vectors_length
+
+
+def _load_normalizer():
+    """
+    Small pipeline used only to lemmatize skill phrases. The rule lemmatizer needs
+    POS tags, so tok2vec / tagger / attribute_ruler stay; parser and NER do not load.
+    """
+    try:
+        return spacy.load("en_core_web_lg", exclude=["parser", "ner", "senter"])
+    except OSError:
+        logger.warning("en_core_web_lg not installed; skill phrases will not be lemmatized")
+        return spacy.blank("en")
+
+
+# — spaCy + GLiNER handles — loaded on first use or by the app's startup warm-up — #
+spacy_model = LazyModel("spacy", _load_spacy, warmup=lambda nlp: nlp("warm up"))
+normalizer_model = LazyModel(
+    "normalizer", _load_normalizer, warmup=lambda nlp: nlp("warm up")
+)
+skill_dictionary = (
+    LazyModel(
+        "skill_dictionary",
+        lambda: load_skill_dictionary(SKILL_DICTIONARY_PATH),
+        warmup=lambda dictionary: dictionary and dictionary.extract("Python developer"),
+    )
+    if SKILL_EXTRACTION_POLICY != SkillExtractionPolicy.GLINER
+    else None
+)
+gliner_model = LazyModel(
+    "gliner",
+    lambda: load_gliner_model(GLINER_MODEL_NAME, GLINER_BACKEND, device),
+    warmup=lambda model: model.batch_predict_entities(
+        ["Python developer"], SKILL_LABELS, threshold=0.5
+    ),
+)
+
+
+class skill_ner:
+    device = device
+    policy = SkillExtractionPolicy(SKILL_EXTRACTION_POLICY)
+    # Concurrent extract_skills calls share one batched GLiNER forward pass
+    _gliner_batcher = MicroBatcher(
+        "gliner",
+        lambda texts: gliner_model.get().batch_predict_entities(
+            texts, SKILL_LABELS, threshold=0.5
+        ),
+        max_batch_size=GLINER_MAX_BATCH_SIZE,
+        max_wait_ms=GLINER_MAX_WAIT_MS,
+    )
+    # Normalized phrase -> unit vector: the precomputed table first, then the
+    # runtime LRU store; both are set up once the spaCy model is loaded
+    _skill_table: Optional[SkillTable] = None
+    _vector_store: Optional[VectorStore] = None
+    _vector_store_lock = threading.Lock()
+    # Bounded LRU memo of raw phrase -> normalized form
+    _CLEAN_MEMO: "OrderedDict[str, str]" = OrderedDict()
+    _clean_lock = threading.Lock()
+    # Bounded LRU of sha256(text) -> extracted skills
+    _EXTRACT_CACHE: "OrderedDict[str, List[str]]" = OrderedDict()
+    _extract_lock = threading.Lock()
+    _extract_hits = 0
+    _extract_misses = 0
+    _extraction_settings: Optional[str] = None
+
+    # Chunking instrumentation
+    _stats_lock = threading.Lock()
+    _texts_processed = 0
+    _chunks_processed = 0
+    _max_chunks_per_text = 0
+    # Dictionary tier instrumentation
+    _windows_to_gliner = 0
+    _texts_without_gliner = 0
+    _dictionary_skills = 0
+
+    @staticmethod
+    def _pre_clean(phrase: str) -> str:
+        s = str(phrase).lower()
+        s = re.sub(r"[,&\-\/]", " ", s)
+        return re.sub(r"\s+", " ", s).strip()
 
     @classmethod
     def _clean(cls, phrase: str) -> str:
-        try:
-            if not phrase or phrase is None:
-                return ""
+        return cls._clean_many([phrase])[0]
 
-            s = str(phrase).lower()
-            s = re.sub(r"[,&\-\/]", " ", s)
-            s = re.sub(r"\s+", " ", s).strip()
+    @classmethod
+    def _clean_many(cls, phrases: List[str]) -> List[str]:
+        """
+        Normalizes skill phrases (lowercase, punctuation folding, lemmas).
+
+        Phrases not yet in the memo are lemmatized together with one nlp.pipe call
+        over the lightweight normalizer pipeline.
+        """
+        results: List[Optional[str]] = [None] * len(phrases)
+        missing: Dict[str, List[int]] = {}
+        with cls._clean_lock:
+            for i, phrase in enumerate(phrases):
+                if not phrase:
+                    results[i] = ""
+                    continue
+                key = str(phrase)
+                if key in cls._CLEAN_MEMO:
+                    cls._CLEAN_MEMO.move_to_end(key)
+                    results[i] = cls._CLEAN_MEMO[key]
+                else:
+                    missing.setdefault(key, []).append(i)
 
-            # Process with spaCy safely
-            doc = cls._nlp(s)
-            cleaned_tokens = []
-            for tok in doc:
-                if tok.lemma_ and tok.lemma_.strip():
-                    cleaned_tokens.append(tok.lemma_)
+        if missing:
+            raw = list(missing)
+            pre_cleaned = [cls._pre_clean(p) for p in raw]
+            try:
+                docs = normalizer_model.get().pipe(pre_cleaned, batch_size=256)
+                normalized = []
+                for s, doc in zip(pre_cleaned, docs):
+                    lemmas = [tok.lemma_ for tok in doc if tok.lemma_ and tok.lemma_.strip()]
+                    normalized.append(" ".join(lemmas) if lemmas else s)
+            except Exception as e:
+                logger.warning(f"Error normalizing {len(raw)} skill phrases: {e}")
+                normalized = pre_cleaned
+
+            with cls._clean_lock:
+                for phrase, norm in zip(raw, normalized):
+                    cls._CLEAN_MEMO[phrase] = norm
+                    for i in missing[phrase]:
+                        results[i] = norm
+                while len(cls._CLEAN_MEMO) > SKILL_NORMALIZE_MEMO_SIZE:
+                    cls._CLEAN_MEMO.popitem(last=False)
+        return results
 
-            return " ".join(cleaned_tokens) if cleaned_tokens else s
-        except Exception as e:
-            logger.warning(f"Error cleaning phrase '{phrase}': {e}")
-            return str(phrase).lower().strip() if phrase else ""
+    @classmethod
+    def vector_store(cls) -> VectorStore:
+        if cls._vector_store is None:
+            with cls._vector_store_lock:
+                if cls._vector_store is None:
+                    nlp = spacy_model.get()
+                    dim = spacy_vector_dim(nlp)
+                    cls._skill_table = SkillTable.open(
+                        SKILL_TABLE_DIR, spacy_model_name(nlp), dim
+                    )
+                    cls._vector_store = VectorStore(
+                        dim,
+                        SKILL_VECTOR_CACHE_SIZE,
+                        SKILL_VECTOR_SNAPSHOT_PATH or None,
+                    )
+        return cls._vector_store
+
+    @classmethod
+    def save_vector_snapshot(cls) -> None:
+        if cls._vector_store is not None:
+            try:
+                cls._vector_store.save()
+            except Exception as e:
+                logger.warning(f"Could not save skill vector snapshot: {e}")
 
     @classmethod
     def _vec(cls, phrase: str) -> np.ndarray:
-        try:
-            key = cls._clean(phrase)
-            if not key or not key.strip():
-                # Return a zero vector for empty phrases
-                return np.zeros(cls._nlp.vocab.vectors_length)
+        return cls._vec_matrix([phrase])[0]
 
-            if key in cls._VEC_CACHE:
-                return cls._VEC_CACHE[key]
+    @classmethod
+    def _vec_matrix(cls, phrases: List[str]) -> np.ndarray:
+        """
+        Unit vectors of skill phrases stacked into one (n, dim) matrix.
+
+        Phrases are looked up in the precomputed skill table, then in the vector
+        store; the rest go through one nlp.pipe call. Empty phrases and phrases
+        without a vector get a zero row.
+        """
+        store = cls.vector_store()
+        keys = cls._clean_many(phrases)
+        matrix = np.zeros((len(keys), store.dim), dtype=np.float32)
+        lookup = [i for i, key in enumerate(keys) if key.strip()]
+        for source in (cls._skill_table, store):
+            if source is None or not lookup:
+                continue
+            found, missing = source.get_many([keys[i] for i in lookup])
+            for pos, vec in found.items():
+                matrix[lookup[pos]] = vec
+            lookup = [lookup[pos] for pos in missing]
+        missing = lookup
+
+        if missing:
+            texts = list(dict.fromkeys(keys[i] for i in missing))
+            vectors = np.zeros((len(texts), store.dim), dtype=np.float32)
+            try:
+                docs = spacy_model.get().pipe(texts, batch_size=256)
+                for k, doc in enumerate(docs):
+                    vec = doc.vector
+                    if vec is not None and vec.shape == (store.dim,):
+                        vectors[k] = vec / (np.linalg.norm(vec) + 1e-9)
+            except Exception as e:
+                logger.warning(f"Error creating vectors for {len(texts)} skill phrases: {e}")
+                return matrix
+            store.put_many(texts, vectors)
+            row_of = {text: k for k, text in enumerate(texts)}
+            for i in missing:
+                matrix[i] = vectors[row_of[keys[i]]]
+        return matrix
+
+    @staticmethod
+    def _greedy_assign(
+        scores: np.ndarray, threshold: float
+    ) -> List[Tuple[int, int, float]]:
+        """
+        One-to-one assignment over a (job, candidate) score matrix: repeatedly takes
+        the highest remaining pair at or above threshold.
+
+        Returns:
+            (row, column, score) triples, best first
+        """
+        rows, cols = np.nonzero(scores >= threshold)
+        if not len(rows):
+            return []
+        order = np.argsort(-scores[rows, cols], kind="stable")
+        used_rows, used_cols, pairs = set(), set(), []
+        for k in order:
+            r, c = int(rows[k]), int(cols[k])
+            if r in used_rows or c in used_cols:
+                continue
+            used_rows.add(r)
+            used_cols.add(c)
+            pairs.append((r, c, float(scores[r, c])))
+        return pairs
+
+    @staticmethod
+    def _skills_from_entities(entities: Optional[List[Dict]]) -> List[str]:
+        skills = set()
+        for entity in entities or []:
+            if entity and "text" in entity and entity["text"]:
+                skills.add(entity["text"].strip())
+        return sorted(skills)
 
-            doc = cls._nlp(key)
-            vec = doc.vector
+    @classmethod
+    def extract_skills(cls, text: str) -> List[str]:
+        return cls.extract_skills_batch([text])[0]
 
-            # Handle case where vector is all zeros or invalid
-            if vec is None or not hasattr(vec, "shape") or vec.shape[0] == 0:
-                vec = np.zeros(cls._nlp.vocab.vectors_length)
+    @classmethod
+    def extraction_settings(cls) -> str:
+        """
+        The settings that change what extract_skills returns for a text: the
+        policy, the chunk window, and (when the policy reads it) the content hash
+        of the dictionary file. Part of the key of anything cached downstream.
+        """
+        if cls._extraction_settings is None:
+            parts = [
+                f"policy={cls.policy.value}",
+                f"chunk={GLINER_CHUNK_MAX_TOKENS}/{GLINER_CHUNK_OVERLAP_TOKENS}",
+            ]
+            if cls.policy != SkillExtractionPolicy.GLINER:
+                digest = "missing"
+                if SKILL_DICTIONARY_PATH and os.path.exists(SKILL_DICTIONARY_PATH):
+                    with open(SKILL_DICTIONARY_PATH, "rb") as f:
+                        digest = hashlib.sha256(f.read()).hexdigest()
+                parts.append(f"dictionary={digest}")
+            cls._extraction_settings = ";".join(parts)
+        return cls._extraction_settings
 
-            norm = np.linalg.norm(vec) + 1e-9
-            vec = vec / norm
-            cls._VEC_CACHE[key] = vec
-            return vec
+    @classmethod
+    def _dictionary(cls):
+        """The skill dictionary, or None when the policy does not use it or it failed to load."""
+        if skill_dictionary is None or cls.policy == SkillExtractionPolicy.GLINER:
+            return None
+        try:
+            return skill_dictionary.get()
         except Exception as e:
-            logger.warning(f"Error creating vector for phrase '{phrase}': {e}")
-            # Return a zero vector as fallback
-            try:
-                return np.zeros(cls._nlp.vocab.vectors_length)
-            except:
-                return np.zeros(300)  # Default vector size fallback
+            logger.warning(f"Skill dictionary unavailable, falling back to GLiNER: {e}")
+            return None
 
     @classmethod
-    def extract_skills(cls, text: str) -> List[str]:
-        try:
-            if not text or not isinstance(text, str):
-                return []
+    def _needs_gliner(cls, tokens: List[str], dictionary_skills: List[str]) -> bool:
+        if cls.policy == SkillExtractionPolicy.DICTIONARY:
+            return False
+        if cls.policy == SkillExtractionPolicy.GLINER or not tokens:
+            return True
+        return len(dictionary_skills) * 100 / len(tokens) < SKILL_DICTIONARY_MIN_DENSITY
 
-            labels = ["soft skills", "technical skills"]
-            entities = cls._gliner_model.predict_entities(text, labels, threshold=0.5)
-            
-            if not entities:
-                return []
+    @staticmethod
+    def _text_key(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
-            skills = set()
-            for entity in entities:
-                if entity and "text" in entity and entity["text"]:
-                    skills.add(entity["text"].strip())
+    @classmethod
+    def extract_skills_batch(cls, texts: List[str]) -> List[List[str]]:
+        """
+        Extracts skills from many texts, reusing the results cached for texts seen
+        before (by hash of the text) and extracting the rest in one batch.
+
+        Returns:
+            One sorted, deduplicated skill list per input text, in input order
+        """
+        results: List[Optional[List[str]]] = [None] * len(texts)
+        missing: Dict[str, List[int]] = {}
+        with cls._extract_lock:
+            for i, text in enumerate(texts):
+                if not text or not isinstance(text, str):
+                    results[i] = []
+                    continue
+                key = cls._text_key(text)
+                if key in cls._EXTRACT_CACHE:
+                    cls._EXTRACT_CACHE.move_to_end(key)
+                    results[i] = list(cls._EXTRACT_CACHE[key])
+                    cls._extract_hits += 1
+                elif key in missing:
+                    # Repeated within this batch: extracted once
+                    missing[key].append(i)
+                    cls._extract_hits += 1
+                else:
+                    missing[key] = [i]
+                    cls._extract_misses += 1
+
+        if missing:
+            keys = list(missing)
+            extracted = cls._extract_skills_uncached([texts[missing[key][0]] for key in keys])
+            with cls._extract_lock:
+                for key, skills in zip(keys, extracted):
+                    cls._EXTRACT_CACHE[key] = skills
+                    for i in missing[key]:
+                        results[i] = list(skills)
+                while len(cls._EXTRACT_CACHE) > SKILL_EXTRACTION_CACHE_SIZE:
+                    cls._EXTRACT_CACHE.popitem(last=False)
+        return results
 
-            return sorted(skills)
-        except Exception as e:
-            logger.error(f"Error extracting skills from text: {e}")
-            return []
+    @classmethod
+    def _extract_skills_uncached(cls, texts: List[str]) -> List[List[str]]:
+        """
+        Extracts skills from many texts with a dictionary tier and batched GLiNER passes.
+
+        Long texts are split into overlapping windows (see chunking.chunk_text). Each
+        window is first matched against the skill dictionary; under the hybrid policy
+        only windows with fewer than SKILL_DICTIONARY_MIN_DENSITY dictionary skills
+        per 100 tokens go to GLiNER. Windows of every text are submitted together,
+        shortest first, so each micro-batch groups windows of similar length. A
+        failing batch is retried window by window, so one bad window only loses its
+        own entities.
+
+        Returns:
+            One sorted, deduplicated skill list per input text, in input order
+        """
+        dictionary = cls._dictionary()
+        windows: List[Tuple[int, str]] = []
+        dictionary_skills: List[List[str]] = [[] for _ in texts]
+        chunk_counts = []
+        texts_without_gliner = 0
+        for i, text in enumerate(texts):
+            if not text or not isinstance(text, str):
+                continue
+            chunks = chunk_text(
+                text, GLINER_CHUNK_MAX_TOKENS, GLINER_CHUNK_OVERLAP_TOKENS
+            )
+            chunk_counts.append(len(chunks))
+            if dictionary is None:
+                windows.extend((i, chunk) for chunk in chunks)
+                continue
+            text_windows = []
+            for chunk in chunks:
+                tokens = tokenize(chunk)
+                found = dictionary.extract_tokens(tokens)
+                dictionary_skills[i].extend(found)
+                if cls._needs_gliner(tokens, found):
+                    text_windows.append((i, chunk))
+            windows.extend(text_windows)
+            if not text_windows:
+                texts_without_gliner += 1
+
+        with cls._stats_lock:
+            cls._texts_processed += len(chunk_counts)
+            cls._chunks_processed += sum(chunk_counts)
+            cls._max_chunks_per_text = max([cls._max_chunks_per_text, *chunk_counts])
+            cls._windows_to_gliner += len(windows)
+            cls._texts_without_gliner += texts_without_gliner
+            cls._dictionary_skills += sum(len(set(found)) for found in dictionary_skills)
+
+        windows.sort(key=lambda window: len(window[1]))
+        futures = [(i, chunk, cls._gliner_batcher.submit(chunk)) for i, chunk in windows]
+        entities_by_text: List[List[Dict]] = [[] for _ in texts]
+        for i, chunk, future in futures:
+            try:
+                entities = future.result()
+            except Exception as e:
+                logger.warning(f"Batched skill extraction failed, retrying window of text {i} alone: {e}")
+                try:
+                    entities = gliner_model.get().predict_entities(
+                        chunk, SKILL_LABELS, threshold=0.5
+                    )
+                except Exception as e:
+                    logger.error(f"Error extracting skills from text {i}: {e}")
+                    continue
+            entities_by_text[i].extend(entities or [])
+        return [
+            cls._merge_skills(cls._skills_from_entities(entities), found)
+            for entities, found in zip(entities_by_text, dictionary_skills)
+        ]
+
+    @staticmethod
+    def _merge_skills(model_skills: List[str], dictionary_skills: List[str]) -> List[str]:
+        """GLiNER skills plus dictionary skills not already found (case-insensitively)."""
+        seen = {s.lower() for s in model_skills}
+        merged = set(model_skills)
+        for skill in dictionary_skills:
+            if skill.lower() not in seen:
+                seen.add(skill.lower())
+                merged.add(skill)
+        return sorted(merged)
+
+    @classmethod
+    def _extraction_cache_stats(cls) -> Dict:
+        with cls._extract_lock:
+            lookups = cls._extract_hits + cls._extract_misses
+            return {
+                "entries": len(cls._EXTRACT_CACHE),
+                "capacity": SKILL_EXTRACTION_CACHE_SIZE,
+                "hits": cls._extract_hits,
+                "misses": cls._extract_misses,
+                "hit_rate": round(cls._extract_hits / lookups, 4) if lookups else 0.0,
+            }
+
+    @classmethod
+    def stats(cls) -> Dict:
+        with cls._stats_lock:
+            return {
+                "texts": cls._texts_processed,
+                "chunks": cls._chunks_processed,
+                "avg_chunks_per_text": (
+                    round(cls._chunks_processed / cls._texts_processed, 2)
+                    if cls._texts_processed
+                    else 0.0
+                ),
+                "max_chunks_per_text": cls._max_chunks_per_text,
+                "policy": cls.policy.value,
+                "windows_to_gliner": cls._windows_to_gliner,
+                "texts_without_gliner": cls._texts_without_gliner,
+                "gliner_skip_rate": (
+                    round(cls._texts_without_gliner / cls._texts_processed, 4)
+                    if cls._texts_processed
+                    else 0.0
+                ),
+                "dictionary_skills": cls._dictionary_skills,
+                "extraction_cache": cls._extraction_cache_stats(),
+                "normalize_memo_entries": len(cls._CLEAN_MEMO),
+                "vector_store": (
+                    cls._vector_store.stats() if cls._vector_store is not None else None
+                ),
+                "skill_table": (
+                    cls._skill_table.stats() if cls._skill_table is not None else None
+                ),
+            }
 
     @classmethod
     def match_skills(
@@ -124,73 +536,80 @@ class skill_ner:
                 }
 
             # normalize
-            job_norm = [cls._clean(s) for s in job_skills]
-            cand_norm = [cls._clean(s) for s in candidate_skills]
+            job_norm = cls._clean_many(job_skills)
+            cand_norm = cls._clean_many(candidate_skills)
 
-            matched, missing = [], []
+            matched: List[Dict] = []
+            matched_job_idxs = set()
             used_cand_idxs = set()
 
-            # 1. Exact (cleaned) matches upfront
-            for j_raw, j in zip(job_skills, job_norm):
-                for idx, c in enumerate(cand_norm):
-                    if j == c:
-                        matched.append(
-                            {
-                                "job": j_raw,
-                                "candidate": candidate_skills[idx],
-                                "score": 1.0,
-                            }
-                        )
-                        used_cand_idxs.add(idx)
-                        break
-                else:
-                    missing.append((j_raw, j))  # keep cleaned form for next step
+            def take(pairs: List[Tuple[int, int, float]]) -> None:
+                for i, j, score in pairs:
+                    matched.append(
+                        {
+                            "job": job_skills[job_idxs[i]],
+                            "candidate": candidate_skills[cand_idxs[j]],
+                            "score": round(score, 2),
+                        }
+                    )
+                    matched_job_idxs.add(job_idxs[i])
+                    used_cand_idxs.add(cand_idxs[j])
+
+            def remaining() -> Tuple[List[int], List[int]]:
+                return (
+                    [i for i in range(len(job_skills)) if i not in matched_job_idxs],
+                    [j for j in range(len(candidate_skills)) if j not in used_cand_idxs],
+                )
 
-            # 2. Cosine similarity match for the still-missing ones
-            true_missing = []
-            for j_raw, j in missing:
+            # 1. Exact (cleaned) matches upfront
+            first_cand_idx: Dict[str, int] = {}
+            for idx, c in enumerate(cand_norm):
+                first_cand_idx.setdefault(c, idx)
+            job_idxs, cand_idxs = list(range(len(job_skills))), list(range(len(candidate_skills)))
+            take(
+                [
+                    (i, first_cand_idx[j], 1.0)
+                    for i, j in enumerate(job_norm)
+                    if j in first_cand_idx
+                ]
+            )
+
+            # 2. Lexical match (rapidfuzz, one call for the whole matrix)
+            job_idxs, cand_idxs = remaining()
+            if job_idxs and cand_idxs:
+                scores = process.cdist(
+                    [job_norm[i] for i in job_idxs],
+                    [cand_norm[j] for j in cand_idxs],
+                    scorer=fuzz.token_sort_ratio,
+                    dtype=np.float32,
+                ) / 100.0
+                take(cls._greedy_assign(scores, SKILL_LEXICAL_THRESHOLD))
+
+            # 3. Cosine similarity match for the still-missing ones
+            job_idxs, cand_idxs = remaining()
+            if job_idxs and cand_idxs:
                 try:
-                    v_j = cls._vec(j)
-                    best = {"idx": None, "score": 0.0}
-                    for idx, c in enumerate(cand_norm):
-                        if idx in used_cand_idxs:
-                            continue
-                        try:
-                            v_c = cls._vec(c)
-                            sim = float(
-                                cosine_similarity(
-                                    v_j.reshape(1, -1), v_c.reshape(1, -1)
-                                )[0, 0]
-                            )
-                            if sim > best["score"]:
-                                best = {"idx": idx, "score": sim}
-                        except Exception as e:
-                            logger.warning(
-                                f"Error computing similarity for '{j}' and '{c}': {e}"
-                            )
-                            continue
-
-                    if best["idx"] is not None and best["score"] >= threshold:
-                        matched.append(
-                            {
-                                "job": j_raw,
-                                "candidate": candidate_skills[best["idx"]],
-                                "score": round(best["score"], 2),
-                            }
-                        )
-                        used_cand_idxs.add(best["idx"])
-                    else:
-                        true_missing.append(j_raw)
+                    job_vecs = cls._vec_matrix([job_norm[i] for i in job_idxs])
+                    cand_vecs = cls._vec_matrix([cand_norm[j] for j in cand_idxs])
+                    # Rows are unit length, so the dot product is the cosine
+                    sims = job_vecs @ cand_vecs.T
+                    # Zero vectors (out-of-vocabulary phrases) score 0 against every
+                    # skill; a cosine match needs similarity > 0 whatever the threshold
+                    sims[sims <= 0] = -np.inf
+                    take(cls._greedy_assign(sims, threshold))
                 except Exception as e:
-                    logger.warning(f"Error processing skill '{j_raw}': {e}")
-                    true_missing.append(j_raw)
+                    logger.warning(f"Error computing skill similarity matrix: {e}")
 
-            # 3. Extras = candidate skills NOT used and NOT required
+            true_missing = [
+                js for idx, js in enumerate(job_skills) if idx not in matched_job_idxs
+            ]
+
+            # 4. Extras = candidate skills NOT used and NOT required
             req_set = set(job_norm)
             extra = [
                 cs
                 for idx, cs in enumerate(candidate_skills)
-                if idx not in used_cand_idxs and cls._clean(cs) not in req_set
+                if idx not in used_cand_idxs and cand_norm[idx] not in req_set
             ]
 
             return {
@@ -213,9 +632,11 @@ class skill_ner:
         candidate_text: str,
         candidate_skills: Optional[List[str]] = None,
     ) -> Dict:
-        job = cls.extract_skills(job_text)
-        resum = cls.extract_skills(candidate_text)
-        all_cand = (candidate_skills or []) + resum
+        job, resum = cls.extract_skills_batch([job_text, candidate_text])
+        return cls._analysis(job, (candidate_skills or []) + resum)
+
+    @classmethod
+    def _analysis(cls, job: List[str], all_cand: List[str]) -> Dict:
         res = cls.match_skills(job, all_cand)
         return {
             "matching_skills": res["matching_skills"],
@@ -258,6 +679,28 @@ class skill_ner:
         candidate_skills: Optional[List[str]] = None,
     ) -> Dict:
         analysis = cls.analyze_skills(job_text, candidate_text, candidate_skills)
+        return cls._match_details(analysis)
+
+    @classmethod
+    def get_skill_match_details_batch(
+        cls,
+        job_text: str,
+        candidate_texts: List[str],
+        candidate_skills: Optional[List[Optional[List[str]]]] = None,
+    ) -> List[Dict]:
+        """
+        get_skill_match_details for one job against many candidates; skills of the
+        job and of every candidate are extracted in a single batch.
+        """
+        job, *extracted = cls.extract_skills_batch([job_text, *candidate_texts])
+        candidate_skills = candidate_skills or [None] * len(candidate_texts)
+        return [
+            cls._match_details(cls._analysis(job, (given or []) + resum))
+            for resum, given in zip(extracted, candidate_skills)
+        ]
+
+    @staticmethod
+    def _match_details(analysis: Dict) -> Dict:
         total = analysis["total_job_skills"]
         pct = (analysis["matching_skills_count"] / total * 100) if total else 0.0
         return {
@@ -0,0 +1,150 @@
+import json
+import logging
+import os
+import re
+from enum import Enum
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Word tokens; keeps "c++", "c#" and "node.js" whole
+_TOKEN_RE = re.compile(r"[A-Za-z0-9+#][A-Za-z0-9+#.]*")
+# Qualifier skillNer appends to ambiguous names, e.g. "Python (Programming Language)"
+_QUALIFIER_RE = re.compile(r"\s*\([^)]*\)\s*$")
+# Trie node key marking the end of a phrase; holds the canonical skill name
+_END = ""
+
+
+class SkillExtractionPolicy(str, Enum):
+    GLINER = "gliner"
+    DICTIONARY = "dictionary"
+    HYBRID = "hybrid"
+
+
+def tokenize(text: str) -> List[str]:
+    """Word tokens with their original case (matching lowercases them as needed)."""
+    return [token.rstrip(".") for token in _TOKEN_RE.findall(text)]
+
+
+class SkillDictionary:
+    """
+    Token trie over a curated skill dictionary.
+
+    extract() scans the text once and at every position follows the trie as far
+    as it goes, keeping the longest phrase that ends on a skill, so a document is
+    matched in time linear in its length (times the longest phrase).
+
+    Names and full forms match case-insensitively. Abbreviations live in a
+    separate case-sensitive trie, so "IT" matches "IT support" but not "It was".
+    """
+
+    def __init__(self, phrases: Iterable[Tuple[str, str, bool]]):
+        """phrases: (surface form, canonical skill name, case-sensitive) triples."""
+        self._root: Dict = {}
+        self._cased_root: Dict = {}
+        # Canonical skill names
+        self.skills: Set[str] = set()
+        self.size = 0
+        self.max_phrase_tokens = 0
+        for surface, name, cased in phrases:
+            tokens = tokenize(surface)
+            if not tokens or (len(tokens) == 1 and len(tokens[0]) < 2):
+                continue
+            node = self._cased_root if cased else self._root
+            for token in tokens:
+                node = node.setdefault(token if cased else token.lower(), {})
+            if _END not in node:
+                self.size += 1
+            node.setdefault(_END, name)
+            self.skills.add(name)
+            self.max_phrase_tokens = max(self.max_phrase_tokens, len(tokens))
+
+    @staticmethod
+    def _longest(root: Dict, tokens: List[str], start: int) -> Tuple[Optional[str], int]:
+        """(skill, end) of the longest phrase in root starting at tokens[start]."""
+        node, match, match_end = root, None, start
+        for j in range(start, len(tokens)):
+            node = node.get(tokens[j])
+            if node is None:
+                break
+            if _END in node:
+                match, match_end = node[_END], j + 1
+        return match, match_end
+
+    def extract_tokens(self, tokens: List[str]) -> List[str]:
+        lowered = [token.lower() for token in tokens]
+        skills: Dict[str, None] = {}
+        i = 0
+        while i < len(tokens):
+            match, match_end = self._longest(self._root, lowered, i)
+            cased_match, cased_end = self._longest(self._cased_root, tokens, i)
+            if cased_match is not None and cased_end > match_end:
+                match, match_end = cased_match, cased_end
+            if match is None:
+                i += 1
+            else:
+                skills[match] = None
+                i = match_end
+        return list(skills)
+
+    def extract(self, text: str) -> List[str]:
+        """Canonical names of the dictionary skills in text, in order of first appearance."""
+        return self.extract_tokens(tokenize(text))
+
+    # ---------- construction ----------
+    @staticmethod
+    def _canonical(name: str) -> str:
+        return _QUALIFIER_RE.sub("", name).strip()
+
+    @classmethod
+    def from_skillner_db(cls, skill_db: Dict) -> "SkillDictionary":
+        """
+        Builds from skillNer's SKILL_DB: skill names and full forms, plus
+        abbreviations matched case-sensitively.
+        """
+
+        def phrases():
+            for entry in skill_db.values():
+                name = cls._canonical(entry.get("skill_name", ""))
+                if not name:
+                    continue
+                yield name, name, False
+                forms = entry.get("high_surfce_forms") or {}
+                if forms.get("full"):
+                    yield forms["full"], name, False
+                if forms.get("abv"):
+                    yield forms["abv"], name, True
+
+        return cls(phrases())
+
+    @classmethod
+    def from_file(cls, path: str) -> "SkillDictionary":
+        """
+        Builds from a JSON file holding either a list of skill names or a
+        skillNer-style {id: {"skill_name": ..., "high_surfce_forms": ...}} mapping.
+        """
+        with open(path, "r") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            return cls.from_skillner_db(data)
+        names = (cls._canonical(str(s)) for s in data if s)
+        return cls((name, name, False) for name in names if name)
+
+
+def load_skill_dictionary(path: str) -> Optional[SkillDictionary]:
+    """
+    Loads the dictionary file built into the image by scripts.build_skill_dictionary;
+    nothing is downloaded at run time. None (with a warning) when the file is missing,
+    so extraction falls back to GLiNER.
+    """
+    if not path or not os.path.exists(path):
+        logger.warning(
+            f"Skill dictionary {path!r} not found (build it with "
+            f"`python -m scripts.build_skill_dictionary`); using GLiNER only"
+        )
+        return None
+    dictionary = SkillDictionary.from_file(path)
+    logger.info(
+        f"Skill dictionary: {dictionary.size} phrases, up to {dictionary.max_phrase_tokens} tokens"
+    )
+    return dictionary
@@ -0,0 +1,111 @@
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+VECTORS_FILE = "vectors.f16"
+INDEX_FILE = "index.json"
+
+
+class SkillTable:
+    """
+    Read-only table of precomputed skill-phrase vectors.
+
+    Built offline by scripts.build_skill_table: a float16 (rows, dim) matrix in
+    a raw file that is memory-mapped read-only, so every worker process shares
+    the same pages through the OS page cache, plus a JSON index mapping each
+    normalized phrase to its row.
+    """
+
+    def __init__(self, table_dir: str):
+        path = Path(table_dir)
+        with open(path / INDEX_FILE, "r") as f:
+            index = json.load(f)
+        self.model_name: str = index["model_name"]
+        self.dim: int = index["dim"]
+        self._rows: Dict[str, int] = {key: row for row, key in enumerate(index["keys"])}
+        self._vectors = np.memmap(
+            path / VECTORS_FILE,
+            dtype=np.float16,
+            mode="r",
+            shape=(len(self._rows), self.dim),
+        )
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        logger.info(f"Loaded skill table with {len(self._rows)} phrases from {path}")
+
+    @classmethod
+    def open(cls, table_dir: str, model_name: str, dim: int) -> Optional["SkillTable"]:
+        """The table in table_dir, or None if it was not built or built with another model."""
+        if not (Path(table_dir) / INDEX_FILE).exists():
+            return None
+        try:
+            table = cls(table_dir)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable skill table in {table_dir}: {e}")
+            return None
+        if table.model_name != model_name or table.dim != dim:
+            logger.warning(
+                f"Skill table in {table_dir} was built with {table.model_name} ({table.dim}d), "
+                f"running {model_name} ({dim}d); ignoring it"
+            )
+            return None
+        return table
+
+    def get_many(self, keys: List[str]) -> Tuple[Dict[int, np.ndarray], List[int]]:
+        """
+        Returns:
+            (found, missing) where found maps input position -> float32 vector and
+            missing lists the input positions that are not in the table.
+        """
+        found: Dict[int, np.ndarray] = {}
+        missing: List[int] = []
+        for i, key in enumerate(keys):
+            row = self._rows.get(key)
+            if row is None:
+                missing.append(i)
+            else:
+                found[i] = np.asarray(self._vectors[row], dtype=np.float32)
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(missing)
+        return found, missing
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "model_name": self.model_name,
+                "entries": len(self._rows),
+                "dim": self.dim,
+                "bytes": int(self._vectors.nbytes),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+def write_skill_table(
+    table_dir: str, model_name: str, keys: List[str], vectors: np.ndarray
+) -> None:
+    """Writes vectors (rows aligned with keys) as float16 plus the index, replacing any old table."""
+    path = Path(table_dir)
+    path.mkdir(parents=True, exist_ok=True)
+    tmp_vectors = path / (VECTORS_FILE + ".tmp")
+    out = np.memmap(tmp_vectors, dtype=np.float16, mode="w+", shape=vectors.shape)
+    out[:] = vectors.astype(np.float16)
+    out.flush()
+    del out
+    tmp_index = path / (INDEX_FILE + ".tmp")
+    with open(tmp_index, "w") as f:
+        json.dump({"model_name": model_name, "dim": int(vectors.shape[1]), "keys": keys}, f)
+    # Vectors first: a reader that sees the new index must also see the new rows
+    os.replace(tmp_vectors, path / VECTORS_FILE)
+    os.replace(tmp_index, path / INDEX_FILE)
@@ -0,0 +1,66 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from services.skills_module.chunking import chunk_text, count_tokens
+
+
+def _rendered(items: int, words_per_item: int) -> str:
+    """Text shaped like utils.render_model output: a field with numbered list items."""
+    lines = ["work_history:"]
+    for i in range(items):
+        lines.append(f"  {i + 1}.")
+        lines.append("    summary: " + " ".join(f"item{i}word{w}" for w in range(words_per_item)))
+    return "\n".join(lines)
+
+
+def test_count_tokens_splits_words_and_punctuation():
+    assert count_tokens("Python, C++ and scikit-learn.") == 8
+
+
+def test_short_text_is_a_single_window():
+    text = _rendered(2, 5)
+
+    assert chunk_text(text, max_tokens=384, overlap_tokens=64) == [text]
+
+
+def test_windows_respect_max_tokens_and_cover_every_word():
+    text = _rendered(20, 30)
+
+    windows = chunk_text(text, max_tokens=100, overlap_tokens=20)
+
+    assert len(windows) > 1
+    assert all(count_tokens(window) <= 100 for window in windows)
+    assert {w for window in windows for w in window.split()} == set(text.split())
+
+
+def test_windows_overlap_with_the_previous_one():
+    text = _rendered(20, 30)
+
+    windows = chunk_text(text, max_tokens=100, overlap_tokens=40)
+
+    for previous, current in zip(windows, windows[1:]):
+        assert current.splitlines()[0] in previous.splitlines()
+
+
+def test_windows_start_at_list_items():
+    text = _rendered(20, 30)
+
+    windows = chunk_text(text, max_tokens=100, overlap_tokens=0)
+
+    for window in windows[1:]:
+        assert window.splitlines()[0].strip().rstrip(".").isdigit()
+
+
+def test_over_long_line_is_split_into_a_sliding_window():
+    words = [f"w{i}" for i in range(300)]
+    text = " ".join(words)
+
+    windows = chunk_text(text, max_tokens=100, overlap_tokens=25)
+
+    assert all(count_tokens(window) <= 100 for window in windows)
+    assert [w for w in " ".join(windows).split() if w not in words] == []
+    assert windows[-1].split()[-1] == words[-1]
+    for previous, current in zip(windows, windows[1:]):
+        assert current.split()[0] in previous.split()
@@ -0,0 +1,256 @@
+import sys
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import numpy as np
+import pytest
+
+from services.skills_module import ner_skills
+from services.skills_module.ner_skills import skill_ner
+from services.skills_module.skill_dictionary import SkillExtractionPolicy
+from services.skills_module.vector_store import VectorStore
+
+KNOWN_SKILLS = ["Python", "Docker", "Kubernetes", "SQL", "Teamwork"]
+
+
+def _entities(text: str) -> List[Dict]:
+    return [{"text": skill, "label": "technical skills"} for skill in KNOWN_SKILLS if skill in text]
+
+
+class FakeBatcher:
+    """Stands in for the GLiNER micro-batcher: answers every window at once."""
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.windows: List[str] = []
+
+    def submit(self, text: str) -> Future:
+        self.windows.append(text)
+        future = Future()
+        if self.fail:
+            future.set_exception(RuntimeError("batch failed"))
+        else:
+            future.set_result(_entities(text))
+        return future
+
+
+class FakeModelHandle:
+    def __init__(self, model):
+        self.model = model
+
+    def get(self):
+        return self.model
+
+
+class FakeToken:
+    def __init__(self, word: str):
+        self.lemma_ = word[:-1] if word.endswith("s") else word
+
+
+class FakeNormalizer:
+    """spaCy-like pipeline whose lemma of a word is the word without a trailing "s"."""
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.calls: List[List[str]] = []
+
+    def pipe(self, texts, batch_size=None):
+        texts = list(texts)
+        self.calls.append(texts)
+        if self.fail:
+            raise RuntimeError("normalizer crashed")
+        return [[FakeToken(word) for word in text.split()] for text in texts]
+
+
+@pytest.fixture
+def normalizer(monkeypatch):
+    normalizer = FakeNormalizer()
+    monkeypatch.setattr(ner_skills, "normalizer_model", FakeModelHandle(normalizer))
+    monkeypatch.setattr(skill_ner, "_CLEAN_MEMO", OrderedDict())
+    return normalizer
+
+
+class FakeSpacy:
+    """Knows no phrase: every vector it returns is zero."""
+
+    def pipe(self, texts, batch_size=None):
+        return [type("Doc", (), {"vector": np.zeros(3, dtype=np.float32)}) for _ in texts]
+
+
+@pytest.fixture
+def vectors(monkeypatch, normalizer):
+    """Skill vectors keyed by normalized phrase; other phrases are out of vocabulary."""
+    store = VectorStore(dim=3, capacity=16)
+    store.put_many(
+        ["deep learning", "neural network", "cooking"],
+        np.array([[1.0, 0.0, 0.0], [0.96, 0.28, 0.0], [0.0, 0.0, 1.0]], dtype=np.float32),
+    )
+    monkeypatch.setattr(skill_ner, "_vector_store", store)
+    monkeypatch.setattr(skill_ner, "_skill_table", None)
+    monkeypatch.setattr(ner_skills, "spacy_model", FakeModelHandle(FakeSpacy()))
+    monkeypatch.setattr(ner_skills, "SKILL_LEXICAL_THRESHOLD", 0.9)
+    return store
+
+
+@pytest.fixture
+def batcher(monkeypatch):
+    batcher = FakeBatcher()
+    monkeypatch.setattr(skill_ner, "_gliner_batcher", batcher)
+    monkeypatch.setattr(skill_ner, "policy", SkillExtractionPolicy.GLINER)
+    monkeypatch.setattr(skill_ner, "_EXTRACT_CACHE", OrderedDict())
+    monkeypatch.setattr(skill_ner, "_extract_hits", 0)
+    monkeypatch.setattr(skill_ner, "_extract_misses", 0)
+    return batcher
+
+
+# ---------- batched extraction ----------
+def test_batch_returns_sorted_skills_per_text_in_input_order(batcher):
+    results = skill_ner.extract_skills_batch(
+        ["Docker and Python, Python again", "", "SQL and Teamwork", None]
+    )
+
+    assert results == [["Docker", "Python"], [], ["SQL", "Teamwork"], []]
+    assert len(batcher.windows) == 2
+
+
+def test_long_text_is_extracted_window_by_window(batcher, monkeypatch):
+    monkeypatch.setattr(ner_skills, "GLINER_CHUNK_MAX_TOKENS", 20)
+    monkeypatch.setattr(ner_skills, "GLINER_CHUNK_OVERLAP_TOKENS", 5)
+    text = "\n".join(["Python " + "filler " * 15, "Docker " + "filler " * 15, "Kubernetes"])
+
+    assert skill_ner.extract_skills(text) == ["Docker", "Kubernetes", "Python"]
+    assert len(batcher.windows) > 1
+    # Windows of similar length are batched together: shortest first
+    assert [len(w) for w in batcher.windows] == sorted(len(w) for w in batcher.windows)
+
+
+def test_failed_batch_is_retried_window_by_window(batcher, monkeypatch):
+    batcher.fail = True
+
+    class Model:
+        def predict_entities(self, text, labels, threshold):
+            if "Docker" in text:
+                raise RuntimeError("bad window")
+            return _entities(text)
+
+    monkeypatch.setattr(ner_skills, "gliner_model", FakeModelHandle(Model()))
+
+    assert skill_ner.extract_skills_batch(["Python and SQL", "Docker"]) == [["Python", "SQL"], []]
+
+
+# ---------- normalization ----------
+def test_pre_clean_folds_case_and_punctuation():
+    assert skill_ner._pre_clean("  CI/CD, Docker-Compose & AWS ") == "ci cd docker compose aws"
+
+
+def test_clean_many_lemmatizes_new_phrases_in_one_pass(normalizer):
+    phrases = ["Unit-Tests", "APIs", "unit-tests", "Unit-Tests", ""]
+
+    assert skill_ner._clean_many(phrases) == ["unit test", "api", "unit test", "unit test", ""]
+    # Each distinct raw phrase is lemmatized once, all in one pipe call
+    assert normalizer.calls == [["unit tests", "apis", "unit tests"]]
+
+
+def test_clean_many_answers_seen_phrases_from_the_memo(normalizer, monkeypatch):
+    monkeypatch.setattr(ner_skills, "SKILL_NORMALIZE_MEMO_SIZE", 2)
+    skill_ner._clean_many(["Docs", "Tests"])
+
+    assert skill_ner._clean_many(["Tests", "Docs"]) == ["test", "doc"]
+    assert len(normalizer.calls) == 1
+
+    skill_ner._clean_many(["Specs"])
+    assert list(skill_ner._CLEAN_MEMO) == ["Docs", "Specs"]
+
+
+def test_clean_many_falls_back_to_pre_cleaned_text(normalizer):
+    normalizer.fail = True
+
+    assert skill_ner._clean_many(["Machine-Learning Models"]) == ["machine learning models"]
+
+
+# ---------- skill matching ----------
+def test_greedy_assign_takes_the_best_pair_first_one_to_one():
+    scores = np.array([[0.9, 0.8], [0.85, 0.6], [0.2, 0.3]])
+
+    assert skill_ner._greedy_assign(scores, 0.5) == [(0, 0, 0.9), (1, 1, 0.6)]
+    assert skill_ner._greedy_assign(scores, 0.95) == []
+
+
+def test_match_skills_exact_then_lexical_then_cosine(vectors):
+    result = skill_ner.match_skills(
+        ["Python", "PostgreSQL", "Deep Learning", "Cooking"],
+        ["python", "Postgre SQL", "Neural Networks", "Go"],
+    )
+
+    assert result["matching_skills"] == [
+        {"job": "Python", "candidate": "python", "score": 1.0},
+        {"job": "PostgreSQL", "candidate": "Postgre SQL", "score": 0.95},
+        {"job": "Deep Learning", "candidate": "Neural Networks", "score": 0.96},
+    ]
+    assert result["missing_skills"] == ["Cooking"]
+    assert result["extra_skills"] == ["Go"]
+
+
+def test_cosine_tier_gives_each_candidate_skill_to_its_best_job_skill(vectors):
+    vectors.put_many(["machine learning"], np.array([[0.8, 0.6, 0.0]], dtype=np.float32))
+
+    result = skill_ner.match_skills(["Machine Learning", "Deep Learning"], ["Neural Networks"])
+
+    assert result["matching_skills"] == [
+        {"job": "Deep Learning", "candidate": "Neural Networks", "score": 0.96}
+    ]
+    assert result["missing_skills"] == ["Machine Learning"]
+
+
+def test_out_of_vocabulary_skills_never_match_on_cosine(vectors):
+    result = skill_ner.match_skills(["Foo"], ["Bar"], threshold=0.0)
+
+    assert result == {"matching_skills": [], "missing_skills": ["Foo"], "extra_skills": ["Bar"]}
+
+
+def test_match_skills_without_job_skills(vectors):
+    assert skill_ner.match_skills([], ["Python", None]) == {
+        "matching_skills": [],
+        "missing_skills": [],
+        "extra_skills": ["Python"],
+    }
+
+
+# ---------- extraction cache ----------
+def test_seen_texts_are_answered_from_the_cache(batcher):
+    skill_ner.extract_skills_batch(["Python and SQL", "Docker"])
+
+    results = skill_ner.extract_skills_batch(["Docker", "Python and SQL", "Kubernetes"])
+
+    assert results == [["Docker"], ["Python", "SQL"], ["Kubernetes"]]
+    assert batcher.windows == ["Docker", "Python and SQL", "Kubernetes"]
+    stats = skill_ner._extraction_cache_stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (2, 3, 3)
+
+
+def test_repeated_text_in_one_batch_is_extracted_once(batcher):
+    results = skill_ner.extract_skills_batch(["Python", "Python", "Python"])
+
+    assert results == [["Python"]] * 3
+    assert batcher.windows == ["Python"]
+
+
+def test_cached_results_are_copies(batcher):
+    skill_ner.extract_skills("Python and SQL").append("changed by the caller")
+
+    assert skill_ner.extract_skills("Python and SQL") == ["Python", "SQL"]
+
+
+def test_cache_drops_the_least_recently_used_text(batcher, monkeypatch):
+    monkeypatch.setattr(ner_skills, "SKILL_EXTRACTION_CACHE_SIZE", 2)
+    skill_ner.extract_skills_batch(["Python", "Docker"])
+    skill_ner.extract_skills("Python")
+
+    skill_ner.extract_skills("SQL")
+    skill_ner.extract_skills_batch(["Python", "Docker"])
+
+    assert batcher.windows == ["Python", "Docker", "SQL", "Docker"]
@@ -0,0 +1,69 @@
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from services.skills_module.skill_dictionary import (
+    SkillDictionary,
+    load_skill_dictionary,
+    tokenize,
+)
+
+SKILL_DB = {
+    "KS1": {"skill_name": "Python (Programming Language)", "high_surfce_forms": {"full": "python"}},
+    "KS2": {"skill_name": "Machine Learning", "high_surfce_forms": {"abv": "ML"}},
+    "KS3": {"skill_name": "Machine Learning Operations", "high_surfce_forms": {"abv": "MLOps"}},
+    "KS4": {"skill_name": "Information Technology", "high_surfce_forms": {"abv": "IT"}},
+    "KS5": {"skill_name": "C++", "high_surfce_forms": {}},
+    "KS6": {"skill_name": "Node.js", "high_surfce_forms": {}},
+    "KS7": {"skill_name": "Learning", "high_surfce_forms": {}},
+}
+
+
+def test_tokenize_keeps_symbols_and_case():
+    assert tokenize("Used C++, C# and Node.js.") == ["Used", "C++", "C#", "and", "Node.js"]
+
+
+def test_extract_strips_qualifiers_and_ignores_case():
+    dictionary = SkillDictionary.from_skillner_db(SKILL_DB)
+
+    assert dictionary.extract("PYTHON and c++ on node.js") == ["Python", "C++", "Node.js"]
+
+
+def test_extract_prefers_the_longest_phrase():
+    dictionary = SkillDictionary.from_skillner_db(SKILL_DB)
+
+    assert dictionary.extract("machine learning operations") == ["Machine Learning Operations"]
+    assert dictionary.extract("machine learning and learning") == ["Machine Learning", "Learning"]
+
+
+def test_abbreviations_match_case_sensitively():
+    dictionary = SkillDictionary.from_skillner_db(SKILL_DB)
+
+    assert dictionary.extract("Led IT support and ML projects") == [
+        "Information Technology",
+        "Machine Learning",
+    ]
+    assert dictionary.extract("It was fun, ml aside") == []
+
+
+def test_extract_returns_each_skill_once_in_order_of_first_appearance():
+    dictionary = SkillDictionary.from_skillner_db(SKILL_DB)
+
+    assert dictionary.extract("C++ then Python then C++ again") == ["C++", "Python"]
+
+
+def test_from_file_accepts_a_list_of_names(tmp_path):
+    path = tmp_path / "skills.json"
+    path.write_text(json.dumps(["Docker", "Kubernetes (Container Orchestration)", "R"]))
+
+    dictionary = load_skill_dictionary(str(path))
+
+    # Single-character names are too ambiguous to match
+    assert dictionary.size == 2
+    assert dictionary.extract("docker on kubernetes, in R") == ["Docker", "Kubernetes"]
+
+
+def test_missing_file_loads_as_none(tmp_path):
+    assert load_skill_dictionary(str(tmp_path / "missing.json")) is None
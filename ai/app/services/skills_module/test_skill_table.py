@@ -0,0 +1,53 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import numpy as np
+
+from services.skills_module.skill_table import SkillTable, write_skill_table
+
+KEYS = ["python", "machine learning", "docker"]
+VECTORS = np.array([[0.5, 0.25], [-1.0, 0.125], [0.0, 2.0]], dtype=np.float32)
+
+
+def test_round_trip_returns_float32_vectors(tmp_path):
+    write_skill_table(str(tmp_path), "en_core_web_lg", KEYS, VECTORS)
+
+    table = SkillTable.open(str(tmp_path), "en_core_web_lg", 2)
+    found, missing = table.get_many(["docker", "rust", "python"])
+
+    assert missing == [1]
+    assert found[0].dtype == np.float32
+    np.testing.assert_array_equal(found[0], VECTORS[2])
+    np.testing.assert_array_equal(found[2], VECTORS[0])
+    stats = table.stats()
+    assert (stats["entries"], stats["hits"], stats["misses"]) == (3, 2, 1)
+    assert stats["bytes"] == VECTORS.size * 2
+
+
+def test_rewrite_replaces_the_old_table(tmp_path):
+    write_skill_table(str(tmp_path), "en_core_web_lg", KEYS, VECTORS)
+    write_skill_table(str(tmp_path), "en_core_web_lg", ["rust"], VECTORS[:1])
+
+    table = SkillTable.open(str(tmp_path), "en_core_web_lg", 2)
+
+    assert table.get_many(["python", "rust"])[1] == [0]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["index.json", "vectors.f16"]
+
+
+def test_missing_table_opens_as_none(tmp_path):
+    assert SkillTable.open(str(tmp_path), "en_core_web_lg", 2) is None
+
+
+def test_table_of_another_model_is_ignored(tmp_path):
+    write_skill_table(str(tmp_path), "en_core_web_lg", KEYS, VECTORS)
+
+    assert SkillTable.open(str(tmp_path), "en_core_web_trf", 2) is None
+    assert SkillTable.open(str(tmp_path), "en_core_web_lg", 300) is None
+
+
+def test_unreadable_table_opens_as_none(tmp_path):
+    (tmp_path / "index.json").write_text("{not json")
+
+    assert SkillTable.open(str(tmp_path), "en_core_web_lg", 2) is None
@@ -0,0 +1,84 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import numpy as np
+
+from services.skills_module.vector_store import VectorStore
+
+
+def _vectors(*values: float) -> np.ndarray:
+    return np.array([[v, -v, 2 * v] for v in values], dtype=np.float32)
+
+
+def test_get_many_splits_found_and_missing_positions():
+    store = VectorStore(dim=3, capacity=4)
+    store.put_many(["python", "docker"], _vectors(1, 2))
+
+    found, missing = store.get_many(["docker", "rust", "python"])
+
+    assert sorted(found) == [0, 2]
+    np.testing.assert_array_equal(found[0], _vectors(2)[0])
+    np.testing.assert_array_equal(found[2], _vectors(1)[0])
+    assert missing == [1]
+    stats = store.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (2, 1, round(2 / 3, 4))
+
+
+def test_returned_vectors_are_copies():
+    store = VectorStore(dim=3, capacity=2)
+    store.put_many(["python"], _vectors(1))
+
+    store.get_many(["python"])[0][0][:] = 0
+
+    np.testing.assert_array_equal(store.get_many(["python"])[0][0], _vectors(1)[0])
+
+
+def test_full_store_overwrites_the_least_recently_used_row():
+    store = VectorStore(dim=3, capacity=2)
+    store.put_many(["a", "b"], _vectors(1, 2))
+    store.get_many(["a"])
+
+    store.put_many(["c"], _vectors(3))
+
+    found, missing = store.get_many(["a", "b", "c"])
+    assert missing == [1]
+    np.testing.assert_array_equal(found[2], _vectors(3)[0])
+    stats = store.stats()
+    assert (stats["entries"], stats["evictions"]) == (2, 1)
+    assert stats["bytes"] == 2 * 3 * 4
+
+
+def test_putting_an_existing_key_updates_it_in_place():
+    store = VectorStore(dim=3, capacity=2)
+    store.put_many(["a", "b"], _vectors(1, 2))
+
+    store.put_many(["a"], _vectors(5))
+
+    found, _ = store.get_many(["a", "b"])
+    np.testing.assert_array_equal(found[0], _vectors(5)[0])
+    assert store.stats()["evictions"] == 0
+
+
+def test_snapshot_round_trip_keeps_the_most_recent_rows(tmp_path):
+    path = tmp_path / "vectors.npz"
+    store = VectorStore(dim=3, capacity=3, snapshot_path=str(path))
+    store.put_many(["a", "b", "c"], _vectors(1, 2, 3))
+    store.get_many(["a"])
+    store.save()
+
+    reloaded = VectorStore(dim=3, capacity=2, snapshot_path=str(path))
+
+    found, missing = reloaded.get_many(["a", "b", "c"])
+    assert missing == [1]
+    np.testing.assert_array_equal(found[0], _vectors(1)[0])
+
+
+def test_snapshot_of_another_dimension_is_ignored(tmp_path):
+    path = tmp_path / "vectors.npz"
+    store = VectorStore(dim=3, capacity=2, snapshot_path=str(path))
+    store.put_many(["a"], _vectors(1))
+    store.save()
+
+    assert VectorStore(dim=4, capacity=2, snapshot_path=str(path)).stats()["entries"] == 0
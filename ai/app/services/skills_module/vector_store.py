@@ -0,0 +1,121 @@
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class VectorStore:
+    """
+    Size-bounded LRU store of skill-phrase vectors.
+
+    Vectors live in one preallocated (capacity, dim) float32 array; an ordered
+    dict maps each key to its row and records LRU order. When full, the least
+    recently used row is overwritten. With a snapshot path, save() writes the
+    live rows to an .npz file that the next process loads on start.
+    """
+
+    def __init__(self, dim: int, capacity: int, snapshot_path: Optional[str] = None):
+        self.dim = dim
+        self.capacity = max(1, capacity)
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else None
+
+        self._lock = threading.Lock()
+        self._vectors = np.zeros((self.capacity, dim), dtype=np.float32)
+        self._rows: "OrderedDict[str, int]" = OrderedDict()
+        self._free_rows: List[int] = list(range(self.capacity - 1, -1, -1))
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if self.snapshot_path is not None:
+            self._load_snapshot()
+
+    # ---------- persistence ----------
+    def _load_snapshot(self) -> None:
+        if not self.snapshot_path.exists():
+            return
+        try:
+            with np.load(self.snapshot_path, allow_pickle=False) as snapshot:
+                keys = [str(k) for k in snapshot["keys"]]
+                vectors = snapshot["vectors"]
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable skill vector snapshot: {e}")
+            return
+        if vectors.ndim != 2 or vectors.shape[1] != self.dim:
+            logger.info("Skill vector snapshot was built with another model; starting cold")
+            return
+        # Snapshot rows are stored oldest first; keep the most recent ones that fit.
+        keys, vectors = keys[-self.capacity :], vectors[-self.capacity :]
+        self.put_many(keys, vectors)
+        logger.info(f"Loaded {len(keys)} skill vectors from {self.snapshot_path}")
+
+    def save(self) -> None:
+        """Atomically writes the live rows, in LRU order, to the snapshot file."""
+        if self.snapshot_path is None:
+            return
+        with self._lock:
+            keys = list(self._rows)
+            vectors = self._vectors[list(self._rows.values())]
+        self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.snapshot_path.with_suffix(".tmp.npz")
+        np.savez(tmp_path, keys=np.array(keys, dtype=str), vectors=vectors)
+        os.replace(tmp_path, self.snapshot_path)
+
+    # ---------- lookups ----------
+    def get_many(self, keys: List[str]) -> Tuple[Dict[int, np.ndarray], List[int]]:
+        """
+        Look up many keys at once.
+
+        Returns:
+            (found, missing) where found maps input position -> vector (a copy) and
+            missing lists the input positions that have to be computed.
+        """
+        found: Dict[int, np.ndarray] = {}
+        missing: List[int] = []
+        with self._lock:
+            for i, key in enumerate(keys):
+                row = self._rows.get(key)
+                if row is None:
+                    missing.append(i)
+                    self.misses += 1
+                    continue
+                self._rows.move_to_end(key)
+                found[i] = self._vectors[row].copy()
+                self.hits += 1
+        return found, missing
+
+    def put_many(self, keys: List[str], vectors: np.ndarray) -> None:
+        with self._lock:
+            for key, vector in zip(keys, vectors):
+                row = self._rows.get(key)
+                if row is None:
+                    if self._free_rows:
+                        row = self._free_rows.pop()
+                    else:
+                        _, row = self._rows.popitem(last=False)
+                        self.evictions += 1
+                    self._rows[key] = row
+                else:
+                    self._rows.move_to_end(key)
+                self._vectors[row] = vector
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._rows),
+                "capacity": self.capacity,
+                "dim": self.dim,
+                "bytes": self._vectors.nbytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "snapshot_path": str(self.snapshot_path) if self.snapshot_path else None,
+            }
@@ -0,0 +1,72 @@
+import sys
+from collections import OrderedDict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import pytest
+
+import utils
+from utils import compile_schema, schema_cache_stats, schema_hash
+
+SCHEMA = {
+    "title": "Resume",
+    "type": "object",
+    "properties": {
+        "full_name": {"type": "string"},
+        "years": {"type": "integer", "minimum": 0},
+        "level": {"type": "string", "enum": ["junior", "senior"]},
+    },
+    "required": ["full_name"],
+}
+
+
+def _schema(n: int) -> dict:
+    return {"title": f"Schema{n}", "type": "object", "properties": {f"field_{n}": {"type": "string"}}}
+
+
+@pytest.fixture
+def empty_cache(monkeypatch):
+    monkeypatch.setattr(utils, "_schema_cache", OrderedDict())
+    monkeypatch.setattr(utils, "SCHEMA_CACHE_MAX_ITEMS", 2)
+
+
+def test_schema_hash_ignores_key_order():
+    reordered = {key: SCHEMA[key] for key in reversed(list(SCHEMA))}
+
+    assert schema_hash(reordered) == schema_hash(SCHEMA)
+    assert schema_hash(_schema(1)) != schema_hash(_schema(2))
+
+
+def test_identical_schemas_return_the_same_model(empty_cache):
+    model = compile_schema(SCHEMA)
+    reordered = {key: SCHEMA[key] for key in reversed(list(SCHEMA))}
+
+    assert compile_schema(reordered) is model
+    assert model(full_name="Jane", years=3, level="senior").years == 3
+
+
+def test_compiled_models_do_not_leak_into_module_globals(empty_cache):
+    before = set(vars(utils))
+
+    compile_schema(SCHEMA)
+
+    assert set(vars(utils)) == before
+
+
+def test_least_recently_used_schema_is_evicted(empty_cache):
+    first = compile_schema(_schema(1))
+    compile_schema(_schema(2))
+    # Touch schema 1 so schema 2 is the least recently used
+    assert compile_schema(_schema(1)) is first
+    before = schema_cache_stats()
+
+    compile_schema(_schema(3))
+
+    after = schema_cache_stats()
+    assert after["entries"] == 2
+    assert after["evictions"] == before["evictions"] + 1
+    assert compile_schema(_schema(1)) is first
+    assert schema_cache_stats()["hits"] == after["hits"] + 1
+    compile_schema(_schema(2))
+    assert schema_cache_stats()["misses"] == after["misses"] + 1
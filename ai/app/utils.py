@@ -1,7 +1,14 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
 from pydantic import BaseModel, create_model
 from typing import Optional, List, Dict, Any, Type
 from enum import Enum
 
+from config import SCHEMA_CACHE_MAX_ITEMS
+
 from typing import Any, Optional
 
 from pydantic import BaseModel, Field, create_model
@@ -273,7 +280,7 @@ def create_model_from_schema(schema: dict, globals_dict: dict) -> type[BaseModel
     # in globals_dict.
     for p_model_class in all_pydantic_model_classes_to_rebuild:
         try:
-            p_model_class.model_rebuild()
+            p_model_class.model_rebuild(_types_namespace=globals_dict)
         except Exception as e:
             # Log a warning if a model fails to rebuild, as this might indicate
             # an unresolvable type or a deeper schema issue.
@@ -285,6 +292,64 @@ def create_model_from_schema(schema: dict, globals_dict: dict) -> type[BaseModel
     return main_model
 
 
+# --- Compiled schema cache ---
+_schema_cache: "OrderedDict[str, type[BaseModel]]" = OrderedDict()
+_schema_cache_lock = threading.Lock()
+_schema_cache_counters = {"hits": 0, "misses": 0, "evictions": 0, "compile_ms_total": 0.0}
+
+
+def schema_hash(schema: dict) -> str:
+    """Hash of the canonical JSON form of a schema (key order and whitespace do not matter)."""
+    canonical = json.dumps(schema, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def compile_schema(schema: dict) -> type[BaseModel]:
+    """
+    Cached create_model_from_schema: identical schemas return the same model class.
+
+    Each schema is compiled into its own namespace, so generated models and enums
+    never leak into (or collide with) a module's globals. The least recently used
+    schema is dropped past SCHEMA_CACHE_MAX_ITEMS.
+    """
+    key = schema_hash(schema)
+    with _schema_cache_lock:
+        model = _schema_cache.get(key)
+        if model is not None:
+            _schema_cache.move_to_end(key)
+            _schema_cache_counters["hits"] += 1
+            return model
+
+    start = time.perf_counter()
+    model = create_model_from_schema(schema, {"__name__": f"dynamic_schema_{key[:12]}"})
+    compile_ms = (time.perf_counter() - start) * 1000
+
+    with _schema_cache_lock:
+        _schema_cache_counters["misses"] += 1
+        _schema_cache_counters["compile_ms_total"] += compile_ms
+        # A concurrent request may have compiled it too; keep the first one
+        model = _schema_cache.setdefault(key, model)
+        while len(_schema_cache) > SCHEMA_CACHE_MAX_ITEMS:
+            _schema_cache.popitem(last=False)
+            _schema_cache_counters["evictions"] += 1
+    return model
+
+
+def schema_cache_stats() -> Dict[str, Any]:
+    with _schema_cache_lock:
+        c = _schema_cache_counters
+        lookups = c["hits"] + c["misses"]
+        return {
+            "entries": len(_schema_cache),
+            "capacity": SCHEMA_CACHE_MAX_ITEMS,
+            "hits": c["hits"],
+            "misses": c["misses"],
+            "evictions": c["evictions"],
+            "hit_rate": round(c["hits"] / lookups, 4) if lookups else 0.0,
+            "avg_compile_ms": round(c["compile_ms_total"] / c["misses"], 2) if c["misses"] else 0.0,
+        }
+
+
 def render_model(model: Any, indent: int = 0) -> str:
     spacer = "  " * indent
 
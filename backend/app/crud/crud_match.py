@@ -30,7 +30,11 @@ from models.models import (
 )
 from models.candidate_pydantic import CandidateResume
 from schemas import MatchCreate, MatchUpdate
-from services.matching import match_candidates_client
+from services.matching import (
+    match_batch_client,
+    match_candidates_client,
+    stream_match_candidates_client,
+)
 
 
 def validate_form_constraints(
@@ -270,12 +274,96 @@ def create_match(db: Session, *, match_in: MatchCreate) -> Optional[Match]:
     return db_match
 
 
-def create_matches_for_job_and_applicants(
-    db: Session, job: Job, applications: List[Application]
+def _candidate_ai_data(candidate: Optional[Candidate]) -> Optional[Dict[str, Any]]:
+    """
+    Builds the candidate payload for the AI matcher from the parsed resume.
+    Returns None when the candidate has no usable parsed_resume.
+    """
+    if (
+        not candidate
+        or not candidate.parsed_resume
+        or not isinstance(candidate.parsed_resume, dict)
+    ):
+        return None
+
+    candidate_ai_data = candidate.parsed_resume.copy()
+    # Ensure 'candidate_name' or 'full_name' is present for AI Matcher service
+    if "candidate_name" not in candidate_ai_data and "full_name" in candidate_ai_data:
+        candidate_ai_data["candidate_name"] = candidate_ai_data["full_name"]
+    elif "candidate_name" not in candidate_ai_data and candidate.full_name:
+        # Fallback to Candidate.full_name if available
+        candidate_ai_data["candidate_name"] = candidate.full_name
+    # If neither is available, the AI service might have issues, but we proceed.
+    return candidate_ai_data
+
+
+def _get_job_constraints(db: Session, job_id: int) -> List[JobFormKeyConstraint]:
+    return db.exec(
+        select(JobFormKeyConstraint)
+        .options(selectinload(JobFormKeyConstraint.form_key))
+        .where(JobFormKeyConstraint.job_id == job_id)
+    ).all()
+
+
+def _replace_match(
+    db: Session,
+    application: Application,
+    match_result_from_ai: Dict[str, Any],
+    job_constraints: List[JobFormKeyConstraint],
+) -> Match:
+    """
+    Builds the Match row for an application from one AI result, replacing any
+    existing match. Adds it to the session without committing.
+    """
+    match_db_data = {
+        "application_id": application.id,
+        "score": match_result_from_ai.get("score", 0.0),
+        "score_breakdown": match_result_from_ai.get("score_breakdown", {}),
+        "matching_skills": match_result_from_ai.get("matching_skills", []),
+        "missing_skills": match_result_from_ai.get("missing_skills", []),
+        "extra_skills": match_result_from_ai.get("extra_skills", []),
+        "weights_used": match_result_from_ai.get("weights_used", {}),
+        "analysis": match_result_from_ai.get("analysis", ""),
+    }
+
+    flags = {}
+    if application.form_responses and job_constraints:
+        constraint_violations = validate_form_constraints(
+            application.form_responses, job_constraints
+        )
+        if constraint_violations:
+            flags["constraint_violations"] = constraint_violations
+    match_db_data["flags"] = flags if flags else None
+
+    # Remove any existing match for this application before adding new one
+    # This handles retries or re-processing scenarios.
+    existing_match = db.exec(
+        select(Match).where(Match.application_id == application.id)
+    ).first()
+    if existing_match:
+        logger.info(
+            f"Deleting existing match for application {application.id} (job {application.job_id}) before creating new one."
+        )
+        db.delete(existing_match)
+        db.flush()  # Ensure delete is processed before add, especially if application_id has unique constraint or similar.
+
+    db_match = Match.model_validate(match_db_data)
+    db.add(db_match)
+    return db_match
+
+
+def create_matches_for_applications(
+    db: Session,
+    applications: List[Application],
+    analysis_mode: Optional[str] = None,
+    analysis_top_k: Optional[int] = None,
 ) -> Tuple[int, int]:
     """
-    Creates match records for a given job and a list of its applications.
-    Calls the AI matcher once for all candidates of these applications.
+    Creates match records for applications that may span several jobs.
+    Sends every distinct job and candidate once in a single /matcher/match_batch call,
+    with one (job, candidate) pair per application, and maps results back by pair ids.
+    analysis_mode / analysis_top_k select which pairs get an LLM analysis (AI service
+    default when omitted).
     Adds Match objects to the session but does NOT commit. Commit should be handled by the caller.
     Returns (number_of_successes, number_of_failures).
     """
@@ -285,144 +373,211 @@ def create_matches_for_job_and_applicants(
     if not applications:
         return 0, 0
 
-    job_data_for_ai = job.model_dump(mode="json")
-    candidates_data_for_ai: List[Dict[str, Any]] = []
-    # Keep applications in the same order as candidates_data_for_ai for result mapping
-    ordered_applications_for_results: List[Application] = []
+    jobs_for_ai: Dict[str, Dict[str, Any]] = {}
+    candidates_for_ai: Dict[str, Dict[str, Any]] = {}
+    pairs: List[Dict[str, str]] = []
+    applications_by_pair: Dict[Tuple[str, str], List[Application]] = {}
 
     for app in applications:
-        if (
-            not app.candidate
-            or not app.candidate.parsed_resume
-            or not isinstance(app.candidate.parsed_resume, dict)
-            or not app.candidate.parsed_resume
-        ):
-            logger.warning(
-                f"App {app.id} for job {job.id}: Candidate {app.candidate_id} has invalid parsed_resume. Skipping."
-            )
+        if not app.job:
+            logger.warning(f"App {app.id}: Job {app.job_id} not found. Skipping.")
             failed += 1
             continue
 
-        candidate_ai_data = app.candidate.parsed_resume.copy()
-        # Ensure 'candidate_name' or 'full_name' is present for AI Matcher service
-        if (
-            "candidate_name" not in candidate_ai_data
-            and "full_name" in candidate_ai_data
-        ):  # Check if full_name exists before assigning
-            candidate_ai_data["candidate_name"] = candidate_ai_data["full_name"]
-        elif (
-            "candidate_name" not in candidate_ai_data and app.candidate.full_name
-        ):  # Fallback to Candidate.full_name if available
-            candidate_ai_data["candidate_name"] = app.candidate.full_name
-        # If neither is available, the AI service might have issues, but we proceed.
-
-        candidates_data_for_ai.append(candidate_ai_data)
-        ordered_applications_for_results.append(app)
-
-    if not candidates_data_for_ai:
+        job_id = str(app.job.id)
+        candidate_id = str(app.candidate_id)
+        if candidate_id not in candidates_for_ai:
+            candidate_ai_data = _candidate_ai_data(app.candidate)
+            if candidate_ai_data is None:
+                logger.warning(
+                    f"App {app.id} for job {app.job_id}: Candidate {app.candidate_id} has invalid parsed_resume. Skipping."
+                )
+                failed += 1
+                continue
+            candidates_for_ai[candidate_id] = candidate_ai_data
+        if job_id not in jobs_for_ai:
+            jobs_for_ai[job_id] = app.job.model_dump(mode="json")
+
+        pair_key = (job_id, candidate_id)
+        if pair_key not in applications_by_pair:
+            pairs.append({"job_id": job_id, "candidate_id": candidate_id})
+            applications_by_pair[pair_key] = []
+        applications_by_pair[pair_key].append(app)
+
+    if not pairs:
         logger.warning(
-            f"Job {job.id}: No valid candidate data prepared for AI from {len(applications)} applications."
+            f"No valid candidate data prepared for AI from {len(applications)} applications."
         )
-        return 0, len(applications)  # All considered failed if no data could be sent
+        return 0, failed
 
+    pending = sum(len(apps) for apps in applications_by_pair.values())
     try:
         logger.info(
-            f"Calling AI for job {job.id} ('{job.title}') with {len(candidates_data_for_ai)} candidates."
+            f"Calling AI batch matcher with {len(pairs)} pairs across {len(jobs_for_ai)} jobs and {len(candidates_for_ai)} candidates."
         )
-        ai_batch_response = match_candidates_client(
-            job=job_data_for_ai,
-            candidates=candidates_data_for_ai,
-            # weights and fuzzy_threshold can be passed if needed, using defaults for now
+        ai_batch_response = match_batch_client(
+            jobs=jobs_for_ai,
+            candidates=candidates_for_ai,
+            pairs=pairs,
+            analysis_mode=analysis_mode,
+            analysis_top_k=analysis_top_k,
         )
     except Exception as e:
         logger.error(
-            f"Error calling AI matching service for job {job.id} with {len(candidates_data_for_ai)} candidates: {e}",
+            f"Error calling AI batch matching service with {len(pairs)} pairs: {e}",
             exc_info=True,
         )
-        return 0, len(ordered_applications_for_results)  # All failed for this AI call
+        return 0, failed + pending  # All failed for this AI call
 
     if not ai_batch_response or not ai_batch_response.get("results"):
         logger.warning(
-            f"No 'results' field in AI response for job {job.id}. AI Response: {ai_batch_response}"
+            f"No 'results' field in AI batch response. AI Response: {ai_batch_response}"
         )
-        return 0, len(ordered_applications_for_results)
+        return 0, failed + pending
+
+    results_by_pair: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for match_result_from_ai in ai_batch_response["results"]:
+        if isinstance(match_result_from_ai, dict):
+            pair_key = (
+                str(match_result_from_ai.get("job_id")),
+                str(match_result_from_ai.get("candidate_id")),
+            )
+            results_by_pair[pair_key] = match_result_from_ai
 
-    ai_match_results = ai_batch_response["results"]
+    # Get job constraints once per job
+    constraints_by_job = {
+        job_id: _get_job_constraints(db, int(job_id)) for job_id in jobs_for_ai
+    }
 
-    if len(ai_match_results) != len(ordered_applications_for_results):
-        logger.error(
-            f"Mismatch in AI result count for job {job.id}. Expected {len(ordered_applications_for_results)}, got {len(ai_match_results)}. Marking all as failed for this batch."
-        )
-        logger.debug(f"AI Response for job {job.id} (mismatch): {ai_batch_response}")
-        return 0, len(ordered_applications_for_results)
+    for pair_key, pair_applications in applications_by_pair.items():
+        match_result_from_ai = results_by_pair.get(pair_key)
+        for app in pair_applications:
+            if not match_result_from_ai:
+                logger.warning(
+                    f"No AI result for app {app.id} (job {app.job_id}, candidate {app.candidate_id}). Skipping."
+                )
+                failed += 1
+                continue
+            try:
+                db_match = _replace_match(
+                    db, app, match_result_from_ai, constraints_by_job[pair_key[0]]
+                )
+                succeeded += 1
+                logger.info(
+                    f"Prepared Match for app {app.id} (job {app.job_id}), score: {db_match.score:.3f}"
+                )
+            except Exception as e:
+                logger.error(
+                    f"Error validating/creating Match object for app {app.id} (job {app.job_id}): {e}",
+                    exc_info=True,
+                )
+                failed += 1
 
-    # Get job constraints once for all applications of this job
-    job_constraints = db.exec(
-        select(JobFormKeyConstraint)
-        .options(selectinload(JobFormKeyConstraint.form_key))
-        .where(JobFormKeyConstraint.job_id == job.id)
-    ).all()
+    # Caller (application_matcher_batch.py) is responsible for db.commit() or db.rollback() for the session.
+    logger.info(
+        f"Batch of {len(applications)} applications: {succeeded} matches prepared for DB, {failed} failed."
+    )
+    return succeeded, failed
 
-    for idx, match_result_from_ai in enumerate(ai_match_results):
-        application_for_this_match = ordered_applications_for_results[idx]
 
-        if not match_result_from_ai or not isinstance(match_result_from_ai, dict):
+def create_matches_for_job_and_applicants(
+    db: Session, job: Job, applications: List[Application]
+) -> Tuple[int, int]:
+    """
+    Creates match records for a given job and a list of its applications.
+    Thin wrapper over create_matches_for_applications, which matches results back
+    by (job, candidate) ids rather than by position.
+    Adds Match objects to the session but does NOT commit. Commit should be handled by the caller.
+    Returns (number_of_successes, number_of_failures).
+    """
+    for app in applications:
+        if not app.job:
+            app.job = job
+    return create_matches_for_applications(db, applications)
+
+
+def stream_matches_for_job_and_applicants(
+    db: Session,
+    job: Job,
+    applications: List[Application],
+    analysis_mode: Optional[str] = None,
+    analysis_top_k: Optional[int] = None,
+) -> Tuple[int, int]:
+    """
+    Creates match records for a job's applications from the AI matcher's NDJSON stream.
+    Each Match is committed as soon as its record arrives, so the first scores are
+    visible within seconds and a mid-stream failure keeps every match already saved.
+    Unlike the other create_* functions this DOES commit.
+    Returns (number_of_successes, number_of_failures).
+    """
+    succeeded = 0
+    failed = 0
+
+    candidates_data_for_ai: List[Dict[str, Any]] = []
+    # Indexed like candidates_data_for_ai; stream records carry candidate_index
+    ordered_applications: List[Application] = []
+    for app in applications:
+        candidate_ai_data = _candidate_ai_data(app.candidate)
+        if candidate_ai_data is None:
             logger.warning(
-                f"Invalid AI result item for app {application_for_this_match.id} (job {job.id}). Skipping. AI item: {match_result_from_ai}"
+                f"App {app.id} for job {job.id}: Candidate {app.candidate_id} has invalid parsed_resume. Skipping."
             )
             failed += 1
             continue
+        candidates_data_for_ai.append(candidate_ai_data)
+        ordered_applications.append(app)
 
-        match_db_data = {
-            "application_id": application_for_this_match.id,
-            "score": match_result_from_ai.get("score", 0.0),
-            "score_breakdown": match_result_from_ai.get("score_breakdown", {}),
-            "matching_skills": match_result_from_ai.get("matching_skills", []),
-            "missing_skills": match_result_from_ai.get("missing_skills", []),
-            "extra_skills": match_result_from_ai.get("extra_skills", []),
-            "weights_used": match_result_from_ai.get("weights_used", {}),
-            "analysis": match_result_from_ai.get("analysis", ""),
-        }
-
-        flags = {}
-        if application_for_this_match.form_responses and job_constraints:
-            constraint_violations = validate_form_constraints(
-                application_for_this_match.form_responses, job_constraints
-            )
-            if constraint_violations:
-                flags["constraint_violations"] = constraint_violations
-        match_db_data["flags"] = flags if flags else None
-
-        # Remove any existing match for this application before adding new one
-        # This handles retries or re-processing scenarios.
-        existing_match = db.exec(
-            select(Match).where(Match.application_id == application_for_this_match.id)
-        ).first()
-        if existing_match:
-            logger.info(
-                f"Deleting existing match for application {application_for_this_match.id} (job {job.id}) before creating new one."
-            )
-            db.delete(existing_match)
-            db.flush()  # Ensure delete is processed before add, especially if application_id has unique constraint or similar.
-
-        try:
-            db_match = Match.model_validate(match_db_data)
-            db.add(db_match)
-            succeeded += 1
-            logger.info(
-                f"Prepared Match for app {application_for_this_match.id} (job {job.id}), score: {db_match.score:.3f}"
-            )
-        except Exception as e:
-            logger.error(
-                f"Error validating/creating Match object for app {application_for_this_match.id} (job {job.id}): {e}",
-                exc_info=True,
-            )
-            failed += 1
-            # If model_validate fails, the object isn't added to session, so no specific rollback needed here for this item.
+    if not candidates_data_for_ai:
+        return 0, failed
 
-    # Caller (application_matcher_batch.py) is responsible for db.commit() or db.rollback() for the session.
+    job_constraints = _get_job_constraints(db, job.id)
+    persisted = set()
+    try:
+        logger.info(
+            f"Streaming AI matches for job {job.id} ('{job.title}') with {len(candidates_data_for_ai)} candidates."
+        )
+        for record in stream_match_candidates_client(
+            job=job.model_dump(mode="json"),
+            candidates=candidates_data_for_ai,
+            analysis_mode=analysis_mode,
+            analysis_top_k=analysis_top_k,
+        ):
+            record_type = record.get("type")
+            if record_type == "error":
+                logger.error(
+                    f"AI matcher failed mid-stream for job {job.id}: {record.get('detail')}"
+                )
+                break
+            if record_type != "result":
+                continue
+
+            index = record.get("candidate_index")
+            if not isinstance(index, int) or not 0 <= index < len(ordered_applications):
+                logger.warning(f"Invalid candidate_index in AI record for job {job.id}: {index}")
+                continue
+            app = ordered_applications[index]
+            try:
+                db_match = _replace_match(db, app, record, job_constraints)
+                db.commit()
+                persisted.add(index)
+                succeeded += 1
+                logger.info(
+                    f"Saved Match for app {app.id} (job {job.id}), score: {db_match.score:.3f}"
+                )
+            except Exception as e:
+                db.rollback()
+                logger.error(
+                    f"Error saving streamed Match for app {app.id} (job {job.id}): {e}",
+                    exc_info=True,
+                )
+    except Exception as e:
+        logger.error(
+            f"Error streaming AI matches for job {job.id}: {e}", exc_info=True
+        )
+
+    failed += len(ordered_applications) - len(persisted)
     logger.info(
-        f"For job {job.id} ('{job.title}'): {succeeded} matches prepared for DB, {failed} failed."
+        f"For job {job.id} ('{job.title}'): {succeeded} matches streamed to DB, {failed} failed."
     )
     return succeeded, failed
 
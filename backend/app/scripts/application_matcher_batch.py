@@ -39,10 +39,17 @@ from models.candidate_pydantic import (
 MAX_RETRIES_PER_JOB_BATCH = int(os.getenv("MATCHER_MAX_RETRIES_JOB", "3"))
 RETRY_DELAY_SECONDS_JOB = int(os.getenv("MATCHER_RETRY_DELAY_JOB", "10"))
 INTER_JOB_BATCH_DELAY_SECONDS = int(os.getenv("MATCHER_INTER_JOB_DELAY", "2"))
-# Max candidates to send to AI per job in one call.
-# The AI can handle many, but extremely large lists might hit request size limits or timeouts.
-# Set to a high number if no immediate issues are known.
-MAX_CANDIDATES_PER_AI_CALL = int(os.getenv("MATCHER_MAX_CANDIDATES_PER_AI_CALL", "100"))
+# Max (job, candidate) pairs to send to the AI batch endpoint in one call.
+# Pairs from different jobs share a call, so each job and candidate is preprocessed once per call.
+# Kept conservative: analyzed pairs each cost an LLM call, which the AI service rate-limits.
+MAX_PAIRS_PER_AI_CALL = int(os.getenv("MATCHER_MAX_PAIRS_PER_AI_CALL", "100"))
+# Which pairs get an LLM analysis ("none", "top_k" or "all"); sent explicitly so batch
+# rescoring never analyzes every pair just because the AI service default changed.
+ANALYSIS_MODE = os.getenv("MATCHER_ANALYSIS_MODE", "top_k")
+# Best-scoring candidates per job analyzed in "top_k" mode.
+ANALYSIS_TOP_K = int(os.getenv("MATCHER_ANALYSIS_TOP_K", "10"))
+# Stream results per job and commit each match as it arrives instead of one commit per batch.
+STREAM_RESULTS = os.getenv("MATCHER_STREAM_RESULTS", "false").lower() == "true"
 
 # --- Logger Setup ---
 LOG_LEVEL_STR = os.getenv("LOG_LEVEL", "INFO").upper()
@@ -121,62 +128,50 @@ def get_applications_needing_match_grouped_by_job() -> Dict[int, List[Applicatio
     return applications_by_job
 
 
-def process_matches_for_job_batch(
-    db: Session, job: Job, applications_for_job: List[Application]
+def applications_without_match(applications: List[Application]) -> List[Application]:
+    """The applications that still have no Match row (e.g. after a partly failed batch)."""
+    if not applications:
+        return []
+    with Session(admin_engine) as db:
+        matched = set(
+            db.exec(
+                select(Match.application_id).where(
+                    Match.application_id.in_([app.id for app in applications])
+                )
+            ).all()
+        )
+    return [app for app in applications if app.id not in matched]
+
+
+def process_matches_batch(
+    db: Session, applications: List[Application]
 ) -> Tuple[int, int]:
     """
-    Processes a batch of applications for a single job.
-    Calls AI matcher and creates Match records via crud_match.
+    Processes a batch of applications, possibly spanning several jobs.
+    Calls the AI batch matcher once and creates Match records via crud_match.
     """
-    successful_matches_for_job = 0
-    failed_matches_for_job = 0
-
-    # candidates_payload_for_ai and app_id_to_candidate_id_map are now internal to crud_match.create_matches_for_job_and_applicants
-    # This function's role is simplified to mainly call the CRUD function.
-
-    # The main logic of preparing AI data, calling AI, and creating DB objects is now in crud_match.
-    # This function just orchestrates the call for a given job and its applications.
-    if not applications_for_job:
-        logger.info(f"Job {job.id}: No applications to process in this batch.")
+    if not applications:
+        logger.info("No applications to process in this batch.")
         return 0, 0
 
+    job_ids = {app.job_id for app in applications}
     logger.info(
-        f"Job {job.id}: Preparing to match {len(applications_for_job)} applications."
+        f"Preparing to match {len(applications)} applications across {len(job_ids)} jobs."
     )
 
+    if STREAM_RESULTS:
+        return process_matches_streaming(db, applications)
+
     try:
-        num_succeeded, num_failed = crud_match.create_matches_for_job_and_applicants(
+        num_succeeded, num_failed = crud_match.create_matches_for_applications(
             db=db,
-            job=job,
-            applications=applications_for_job,
+            applications=applications,
+            analysis_mode=ANALYSIS_MODE,
+            analysis_top_k=ANALYSIS_TOP_K,
         )
-
-        # Commit the match results to the database
-        if num_succeeded > 0:
-            try:
-                db.commit()
-                logger.info(
-                    f"Job {job.id}: Successfully committed {num_succeeded} matches to database."
-                )
-                successful_matches_for_job += num_succeeded
-                failed_matches_for_job += num_failed
-            except Exception as commit_error:
-                logger.error(
-                    f"Job {job.id}: Error committing {num_succeeded} matches to database: {commit_error}",
-                    exc_info=True,
-                )
-                db.rollback()
-                # All matches in this batch are now considered failed due to commit error
-                failed_matches_for_job += len(applications_for_job)
-                successful_matches_for_job += 0
-        else:
-            # No successful matches to commit, just record the failures
-            successful_matches_for_job += num_succeeded  # This is 0
-            failed_matches_for_job += num_failed
-
     except Exception as e:
         logger.error(
-            f"Job {job.id}: Unhandled exception in create_matches_for_job_and_applicants for {len(applications_for_job)} applications: {e}",
+            f"Unhandled exception in create_matches_for_applications for {len(applications)} applications: {e}",
             exc_info=True,
         )
         # Rollback any partial changes
@@ -186,17 +181,70 @@ def process_matches_for_job_batch(
             pass  # Rollback might fail if session is already in bad state
         # If the CRUD function itself throws a major error not caught internally,
         # all applications in this specific call are considered failed.
-        failed_matches_for_job += len(applications_for_job)
+        return 0, len(applications)
+
+    # Commit the match results to the database
+    if num_succeeded > 0:
+        try:
+            db.commit()
+            logger.info(f"Successfully committed {num_succeeded} matches to database.")
+        except Exception as commit_error:
+            logger.error(
+                f"Error committing {num_succeeded} matches to database: {commit_error}",
+                exc_info=True,
+            )
+            db.rollback()
+            # All matches in this batch are now considered failed due to commit error
+            return 0, len(applications)
 
     logger.info(
-        f"Job {job.id}: Processed batch of {len(applications_for_job)} applications. Succeeded: {successful_matches_for_job}, Failed: {failed_matches_for_job}"
+        f"Processed batch of {len(applications)} applications. Succeeded: {num_succeeded}, Failed: {num_failed}"
     )
-    return successful_matches_for_job, failed_matches_for_job
+    return num_succeeded, num_failed
+
+
+def process_matches_streaming(
+    db: Session, applications: List[Application]
+) -> Tuple[int, int]:
+    """
+    Streams matches job by job; each match is committed as it arrives, so a failure
+    part-way through keeps everything persisted before it.
+    """
+    applications_by_job: Dict[int, List[Application]] = defaultdict(list)
+    for app in applications:
+        applications_by_job[app.job_id].append(app)
+
+    succeeded, failed = 0, 0
+    for job_apps in applications_by_job.values():
+        try:
+            job_succeeded, job_failed = (
+                crud_match.stream_matches_for_job_and_applicants(
+                    db=db,
+                    job=job_apps[0].job,
+                    applications=job_apps,
+                    analysis_mode=ANALYSIS_MODE,
+                    analysis_top_k=ANALYSIS_TOP_K,
+                )
+            )
+        except Exception as e:
+            logger.error(
+                f"Job {job_apps[0].job_id}: Unhandled exception while streaming matches: {e}",
+                exc_info=True,
+            )
+            try:
+                db.rollback()
+            except Exception:
+                pass
+            job_succeeded, job_failed = 0, len(job_apps)
+        succeeded += job_succeeded
+        failed += job_failed
+    return succeeded, failed
 
 
 def process_all_applications():
     """
-    Process all applications that need matching, grouped by job.
+    Process all applications that need matching.
+    Applications from all jobs are submitted together, in chunks of MAX_PAIRS_PER_AI_CALL pairs.
     """
     logger.info(f"Starting batch application matching.")
 
@@ -211,104 +259,76 @@ def process_all_applications():
             "jobs_processed": 0,
         }
 
-    total_applications_to_match = sum(
-        len(apps) for apps in applications_by_job.values()
-    )
+    # Keep each job's applications contiguous so a job rarely straddles two calls.
+    all_applications = [
+        app for apps_for_job in applications_by_job.values() for app in apps_for_job
+    ]
+    total_applications_to_match = len(all_applications)
     logger.info(
         f"Found {total_applications_to_match} applications across {len(applications_by_job)} jobs needing matches."
     )
 
     overall_successful_matches = 0
     overall_failed_matches = 0
-    jobs_processed_count = 0
-
-    for job_id, apps_for_this_job in applications_by_job.items():
-        jobs_processed_count += 1
-        job_object = apps_for_this_job[0].job
+    total_batches = (
+        total_applications_to_match + MAX_PAIRS_PER_AI_CALL - 1
+    ) // MAX_PAIRS_PER_AI_CALL
 
+    for i in range(0, total_applications_to_match, MAX_PAIRS_PER_AI_CALL):
+        application_batch = all_applications[i : i + MAX_PAIRS_PER_AI_CALL]
+        batch_num = i // MAX_PAIRS_PER_AI_CALL + 1
         logger.info(
-            f"Processing job {job_id} ('{job_object.title}') with {len(apps_for_this_job)} applications. ({jobs_processed_count}/{len(applications_by_job)} jobs)"
+            f"Batch {batch_num}/{total_batches} with {len(application_batch)} applications."
         )
 
-        for i in range(0, len(apps_for_this_job), MAX_CANDIDATES_PER_AI_CALL):
-            application_sub_batch = apps_for_this_job[
-                i : i + MAX_CANDIDATES_PER_AI_CALL
-            ]
-            sub_batch_num = i // MAX_CANDIDATES_PER_AI_CALL + 1
-            if not application_sub_batch:
-                continue
+        # Only applications still without a match are sent again on retry, so
+        # analyses that already succeeded are neither repeated nor re-written.
+        pending = application_batch
+        for attempt in range(MAX_RETRIES_PER_JOB_BATCH):
+            try:
+                with Session(admin_engine) as db:
+                    succeeded_in_batch, failed_in_batch = process_matches_batch(
+                        db, pending
+                    )
+            except Exception as e:  # Catch errors from process_matches_batch or session handling
+                logger.error(
+                    f"  - Critical error processing batch {batch_num} (attempt {attempt + 1}): {e}",
+                    exc_info=True,
+                )
+                failed_in_batch = len(pending)
 
-            logger.info(
-                f"  - Sub-batch {sub_batch_num} with {len(application_sub_batch)} applications for job {job_id}."
+            if failed_in_batch == 0:
+                logger.info(
+                    f"  - Batch {batch_num} processed successfully on attempt {attempt + 1} ({succeeded_in_batch} matches)."
+                )
+                pending = []
+                break
+
+            try:
+                pending = applications_without_match(pending)
+            except Exception as e:
+                logger.error(f"  - Could not check which applications were matched: {e}")
+            logger.warning(
+                f"  - Batch {batch_num}: {len(pending)} application(s) still without a match after attempt {attempt + 1}."
+            )
+            if not pending:
+                break
+            if attempt < MAX_RETRIES_PER_JOB_BATCH - 1:
+                logger.info(
+                    f"  - Retrying {len(pending)} application(s) of batch {batch_num} in {RETRY_DELAY_SECONDS_JOB}s..."
+                )
+                time.sleep(RETRY_DELAY_SECONDS_JOB)
+
+        if pending:
+            logger.error(
+                f"  - Max retries reached for batch {batch_num}. {len(pending)} app(s) failed: {[app.id for app in pending]}"
             )
+        overall_successful_matches += len(application_batch) - len(pending)
+        overall_failed_matches += len(pending)
 
-            for attempt in range(MAX_RETRIES_PER_JOB_BATCH):
-                succeeded_in_sub_batch = 0
-                failed_in_sub_batch = 0
-                try:
-                    with Session(admin_engine) as db:
-                        succeeded_in_sub_batch, failed_in_sub_batch = (
-                            process_matches_for_job_batch(
-                                db, job_object, application_sub_batch
-                            )
-                        )
-                    # Accumulate results from this attempt
-                    # Note: If retrying, ensure not to double-count successes from previous attempts of the same sub-batch.
-                    # The current structure re-processes the whole sub-batch. If process_matches_for_job_batch
-                    # is idempotent (deletes existing before creating), this is fine.
-                    # For now, we sum up results from the latest attempt for this sub-batch.
-                    # A more complex state management would be needed if only failed items from a sub-batch are retried.
-
-                    if failed_in_sub_batch == 0:
-                        logger.info(
-                            f"  - Sub-batch {sub_batch_num} for job {job_id} processed successfully on attempt {attempt + 1} ({succeeded_in_sub_batch} matches)."
-                        )
-                        overall_successful_matches += succeeded_in_sub_batch
-                        # overall_failed_matches += failed_in_sub_batch # This is 0 here
-                        break
-                    else:
-                        logger.warning(
-                            f"  - Sub-batch {sub_batch_num} for job {job_id} had {failed_in_sub_batch} failures (and {succeeded_in_sub_batch} successes) on attempt {attempt + 1}."
-                        )
-                        if attempt < MAX_RETRIES_PER_JOB_BATCH - 1:
-                            logger.info(
-                                f"  - Retrying sub-batch {sub_batch_num} for job {job_id} in {RETRY_DELAY_SECONDS_JOB}s..."
-                            )
-                            time.sleep(RETRY_DELAY_SECONDS_JOB)
-                        else:
-                            logger.error(
-                                f"  - Max retries reached for sub-batch {sub_batch_num} of job {job_id}. {failed_in_sub_batch} app(s) failed, {succeeded_in_sub_batch} app(s) succeeded in this final attempt."
-                            )
-                            overall_successful_matches += succeeded_in_sub_batch
-                            overall_failed_matches += failed_in_sub_batch
-
-                except Exception as e:  # Catch errors from process_matches_for_job_batch or session handling
-                    logger.error(
-                        f"  - Critical error processing sub-batch {sub_batch_num} for job {job_id} (attempt {attempt + 1}): {e}",
-                        exc_info=True,
-                    )
-                    if attempt < MAX_RETRIES_PER_JOB_BATCH - 1:
-                        logger.info(
-                            f"  - Retrying sub-batch {sub_batch_num} for job {job_id} due to critical error in {RETRY_DELAY_SECONDS_JOB}s..."
-                        )
-                        time.sleep(RETRY_DELAY_SECONDS_JOB)
-                    else:
-                        logger.error(
-                            f"  - Max retries reached for sub-batch {sub_batch_num} of job {job_id} due to critical error. Marking all {len(application_sub_batch)} apps in this sub-batch as failed for this attempt."
-                        )
-                        overall_failed_matches += len(
-                            application_sub_batch
-                        )  # Assume all failed if critical error on last attempt
-
-                if (
-                    failed_in_sub_batch == 0 and attempt < MAX_RETRIES_PER_JOB_BATCH
-                ):  # Broke from successful attempt
-                    break
-            # End of retry loop for a sub-batch
-
-        if jobs_processed_count < len(applications_by_job):
+        if batch_num < total_batches:
             logger.info(
-                f"Waiting {INTER_JOB_BATCH_DELAY_SECONDS}s before processing next job..."
+                f"Waiting {INTER_JOB_BATCH_DELAY_SECONDS}s before processing next batch..."
             )
             time.sleep(INTER_JOB_BATCH_DELAY_SECONDS)
 
@@ -317,13 +337,13 @@ def process_all_applications():
         f"Results: {overall_successful_matches} successful matches created, {overall_failed_matches} failed matches."
     )
     logger.info(
-        f"Total applications considered for matching: {total_applications_to_match} across {jobs_processed_count} jobs."
+        f"Total applications considered for matching: {total_applications_to_match} across {len(applications_by_job)} jobs."
     )
     return {
         "successful_matches": overall_successful_matches,
         "failed_matches": overall_failed_matches,
         "total_applications_considered": total_applications_to_match,
-        "jobs_processed": jobs_processed_count,
+        "jobs_processed": len(applications_by_job),
     }
 
 
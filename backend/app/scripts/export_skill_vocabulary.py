@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Skill Vocabulary Export Script
+
+Writes every distinct skill name found in candidate.parsed_resume and job.skills
+to a JSON list. The AI service's scripts.build_skill_table embeds this list
+(plus its skill dictionary) into the precomputed skill vector table.
+
+Usage:
+    python scripts/export_skill_vocabulary.py [output.json]
+"""
+
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Set
+
+# Add the parent directory to the path so we can import from the app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlmodel import Session, select
+from core.database import get_admin_engine
+from models.models import Candidate, Job
+
+DEFAULT_OUTPUT = "skill_vocabulary.json"
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler(sys.stdout)],
+)
+logger = logging.getLogger(Path(__file__).stem)
+
+# Use admin engine to bypass RLS
+admin_engine = get_admin_engine()
+
+
+def _add(skills: Set[str], name) -> None:
+    if isinstance(name, str) and name.strip():
+        skills.add(" ".join(name.split()))
+
+
+def collect_skills() -> Set[str]:
+    skills: Set[str] = set()
+    with Session(admin_engine) as db:
+        # JSON columns are read as plain dicts; no need to validate whole resumes
+        for parsed_resume in db.exec(
+            select(Candidate.parsed_resume).where(Candidate.parsed_resume.is_not(None))
+        ):
+            for item in (parsed_resume or {}).get("skills") or []:
+                _add(skills, item.get("name") if isinstance(item, dict) else item)
+
+        for job_skills in db.exec(select(Job.skills).where(Job.skills.is_not(None))):
+            for key in ("hard_skills", "soft_skills"):
+                for name in (job_skills or {}).get(key) or []:
+                    _add(skills, name)
+    return skills
+
+
+def export_skill_vocabulary(output_path: str = DEFAULT_OUTPUT) -> int:
+    skills = sorted(collect_skills(), key=str.lower)
+    with open(output_path, "w") as f:
+        json.dump(skills, f, ensure_ascii=False, indent=0)
+    logger.info(f"Wrote {len(skills)} distinct skills to {output_path}")
+    return len(skills)
+
+
+if __name__ == "__main__":
+    export_skill_vocabulary(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_OUTPUT)
@@ -1,5 +1,6 @@
 import httpx
-from typing import List, Optional
+import json
+from typing import Dict, Iterator, List, Optional
 import requests
 import os
 import time
@@ -57,6 +58,8 @@ def match_candidates_client(
     weights: Optional[dict] = None,
     fuzzy_threshold: Optional[float] = 80.0,
     matcher_url: str = MATCHER_URL,
+    analysis_mode: Optional[str] = None,
+    analysis_top_k: Optional[int] = None,
 ):
     """
     Call the AI matcher service with structured job and candidate data.
@@ -67,6 +70,9 @@ def match_candidates_client(
         weights: Optional weights for different scoring components
         fuzzy_threshold: Minimum fuzzy match score for skills (0-100)
         matcher_url: URL of the matcher service
+        analysis_mode: Which candidates get an LLM analysis ("none", "top_k", "all");
+                       the AI service default applies when omitted
+        analysis_top_k: Number of best-scoring candidates analyzed in "top_k" mode
 
     Returns:
         dict: Matching results from the AI service
@@ -77,12 +83,100 @@ def match_candidates_client(
         "weights": weights,
         "fuzzy_threshold": fuzzy_threshold,
     }
+    if analysis_mode is not None:
+        payload["analysis_mode"] = analysis_mode
+    if analysis_top_k is not None:
+        payload["analysis_top_k"] = analysis_top_k
     with httpx.Client() as client:
         response = client.post(matcher_url, json=payload, timeout=None)
         response.raise_for_status()
         return response.json()
 
 
+def stream_match_candidates_client(
+    job: dict,
+    candidates: List[dict],
+    weights: Optional[dict] = None,
+    fuzzy_threshold: Optional[float] = 80.0,
+    matcher_url: str = MATCHER_URL,
+    analysis_mode: Optional[str] = None,
+    analysis_top_k: Optional[int] = None,
+) -> Iterator[dict]:
+    """
+    Call the AI matcher's streaming endpoint and yield its NDJSON records as they arrive.
+
+    Yields {"type": "result", "candidate_index", ...} per candidate as soon as it is
+    final, then a closing {"type": "summary", "ranking", ...} record, or an
+    {"type": "error", "detail"} record if the AI service failed mid-stream.
+    Arguments are the same as match_candidates_client.
+    """
+    payload = {
+        "job": job,
+        "candidates": candidates,
+        "weights": weights,
+        "fuzzy_threshold": fuzzy_threshold,
+    }
+    if analysis_mode is not None:
+        payload["analysis_mode"] = analysis_mode
+    if analysis_top_k is not None:
+        payload["analysis_top_k"] = analysis_top_k
+    with httpx.Client() as client:
+        with client.stream(
+            "POST", f"{matcher_url}/stream", json=payload, timeout=None
+        ) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if line.strip():
+                    yield json.loads(line)
+
+
+def match_batch_client(
+    jobs: Dict[str, dict],
+    candidates: Dict[str, dict],
+    pairs: List[Dict[str, str]],
+    weights: Optional[dict] = None,
+    fuzzy_threshold: Optional[float] = 80.0,
+    matcher_url: str = MATCHER_URL,
+    analysis_mode: Optional[str] = None,
+    analysis_top_k: Optional[int] = None,
+):
+    """
+    Call the AI matcher's batch endpoint for many (job, candidate) pairs at once.
+
+    Each job and candidate is sent (and pre-processed by the AI service) once, however
+    many pairs reference it.
+
+    Args:
+        jobs: Job dictionaries keyed by id
+        candidates: Candidate dictionaries keyed by id
+        pairs: List of {"job_id": ..., "candidate_id": ...} to score
+        weights: Optional weights for different scoring components
+        fuzzy_threshold: Minimum fuzzy match score for skills (0-100)
+        matcher_url: URL of the match_candidates endpoint; the batch URL is derived from it
+        analysis_mode: Which candidates get an LLM analysis ("none", "top_k", "all")
+        analysis_top_k: Number of best-scoring candidates per job analyzed in "top_k" mode
+
+    Returns:
+        dict: Batch matching results from the AI service, one result per pair
+    """
+    batch_url = matcher_url.rsplit("/match_candidates", 1)[0] + "/match_batch"
+    payload = {
+        "jobs": jobs,
+        "candidates": candidates,
+        "pairs": pairs,
+        "weights": weights,
+        "fuzzy_threshold": fuzzy_threshold,
+    }
+    if analysis_mode is not None:
+        payload["analysis_mode"] = analysis_mode
+    if analysis_top_k is not None:
+        payload["analysis_top_k"] = analysis_top_k
+    with httpx.Client() as client:
+        response = client.post(batch_url, json=payload, timeout=None)
+        response.raise_for_status()
+        return response.json()
+
+
 def create_match(db: Session, match_in: MatchCreate):
     """
     Creates a match for an application, calling the AI service if available.
@@ -131,6 +225,5 @@ if __name__ == "__main__":
         }
     ]
     result = match_candidates_client(job_data, candidates_data)
-    import json
 
     logger.info(json.dumps(result, indent=2))